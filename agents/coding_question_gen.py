@@ -1,18 +1,99 @@
-from typing import List, Dict
-import requests
+from typing import TYPE_CHECKING, List, Dict, Optional
+import asyncio
 import os
 from dotenv import load_dotenv
 import re
-import streamlit as st
+import random
+import threading
+import time
+import weakref
+from collections import deque
 import logging
+import json
+from utils.api_keys import get_api_key
+from utils.async_runtime import add_shutdown_hook
+from utils.metrics import traced
+from utils.problem_catalog import get_problem_catalog
+from utils.quiz_cache import get_search_cache
+from utils.rate_limiter import PRIORITY_BACKGROUND, RateLimitTimeout, get_rate_limiter
+
+# The HTTP clients are imported with the first Tavily search rather than with the app
+if TYPE_CHECKING:
+    import aiohttp
+    import requests
 
 load_dotenv()
 
-def fetch_tavily_search(query: str, api_key: str, max_results: int = 25) -> List[Dict]:
-    """Fetch search results from Tavily API"""
-    url = "https://api.tavily.com/search"
-    headers = {"Content-Type": "application/json"}
-    payload = {
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+TAVILY_CONNECT_TIMEOUT = float(os.getenv("TAVILY_CONNECT_TIMEOUT", 3.05))
+TAVILY_READ_TIMEOUT = float(os.getenv("TAVILY_READ_TIMEOUT", 20))
+TAVILY_MAX_RETRIES = int(os.getenv("TAVILY_MAX_RETRIES", 2))
+TAVILY_DEADLINE = float(os.getenv("TAVILY_DEADLINE", 45))
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Tavily bills an advanced search as two API credits
+TAVILY_SEARCH_CREDITS = 2
+
+_http_session = None
+_http_session_lock = threading.Lock()
+_tavily_latencies = deque(maxlen=200)
+
+def _get_http_session() -> "requests.Session":
+    """Shared keep-alive session so repeated searches reuse pooled TLS connections"""
+    global _http_session
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=int(os.getenv("TAVILY_POOL_SIZE", 16)))
+            session.mount("https://", adapter)
+            session.headers.update({"Content-Type": "application/json"})
+            _http_session = session
+        return _http_session
+
+_aio_sessions = weakref.WeakKeyDictionary()
+
+def _get_aio_session() -> "aiohttp.ClientSession":
+    """Keep-alive aiohttp session shared by all searches on the running event loop"""
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    session = _aio_sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=int(os.getenv("TAVILY_POOL_SIZE", 16))),
+            headers={"Content-Type": "application/json"}
+        )
+        _aio_sessions[loop] = session
+    return session
+
+async def _close_aio_session():
+    session = _aio_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+add_shutdown_hook(_close_aio_session)
+
+def _record_tavily_latency(elapsed: float, outcome: str):
+    _tavily_latencies.append(elapsed)
+    logging.info(f"Tavily call latency={elapsed:.3f}s outcome={outcome}")
+
+def get_tavily_latency_stats() -> Dict:
+    """Summarise recent per-call Tavily latencies (seconds)"""
+    samples = sorted(_tavily_latencies)
+    if not samples:
+        return {"calls": 0}
+    return {
+        "calls": len(samples),
+        "p50": round(samples[len(samples) // 2], 3),
+        "p95": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "max": round(samples[-1], 3),
+        "last": round(_tavily_latencies[-1], 3)
+    }
+
+def _tavily_payload(query: str, api_key: str, max_results: int) -> Dict:
+    return {
         "api_key": api_key,
         "query": query,
         "search_depth": "advanced",
@@ -20,16 +101,223 @@ def fetch_tavily_search(query: str, api_key: str, max_results: int = 25) -> List
         "include_raw_content": True,
         "max_results": max_results
     }
+
+def _retry_backoff(attempt: int, expires: float) -> float:
+    """Exponential backoff with full jitter, never sleeping past the deadline"""
+    backoff = random.uniform(0, min(8.0, 0.5 * 2 ** attempt))
+    return min(backoff, max(0.0, expires - time.monotonic()))
+
+@traced("tavily_search")
+def fetch_tavily_search(query: str, api_key: str, max_results: int = 25,
+                        deadline: Optional[float] = None, priority: Optional[int] = None) -> List[Dict]:
+    """Fetch search results from Tavily API, retrying transient failures within an overall deadline"""
+    import requests
+
+    payload = _tavily_payload(query, api_key, max_results)
+    session = _get_http_session()
+    limiter = get_rate_limiter("tavily", api_key)
+    expires = time.monotonic() + (deadline or TAVILY_DEADLINE)
+    for attempt in range(TAVILY_MAX_RETRIES + 1):
+        remaining = expires - time.monotonic()
+        if remaining <= 0:
+            logging.error("Tavily API error: deadline exceeded")
+            return []
+        try:
+            limiter.acquire(TAVILY_SEARCH_CREDITS, priority=priority, timeout=remaining)
+        except RateLimitTimeout as e:
+            logging.error(f"Tavily API error: {str(e)}")
+            return []
+        start = time.perf_counter()
+        try:
+            response = session.post(
+                TAVILY_SEARCH_URL,
+                json=payload,
+                timeout=(min(TAVILY_CONNECT_TIMEOUT, remaining), min(TAVILY_READ_TIMEOUT, remaining))
+            )
+            _record_tavily_latency(time.perf_counter() - start, str(response.status_code))
+            if response.status_code in _RETRY_STATUSES:
+                raise requests.HTTPError(f"{response.status_code} from Tavily", response=response)
+            response.raise_for_status()
+            data = response.json()
+            logging.info(f"Tavily API raw response: {data}")
+            return data.get("results", [])
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+            status = e.response.status_code if getattr(e, "response", None) is not None else None
+            if status is None:
+                _record_tavily_latency(time.perf_counter() - start, type(e).__name__)
+            if (status is not None and status not in _RETRY_STATUSES) or attempt == TAVILY_MAX_RETRIES:
+                logging.error(f"Tavily API error: {str(e)}")
+                return []
+            backoff = _retry_backoff(attempt, expires)
+            logging.warning(f"Tavily API attempt {attempt + 1} failed ({str(e)}), retrying in {backoff:.2f}s")
+            time.sleep(backoff)
+        except Exception as e:
+            logging.error(f"Tavily API error: {str(e)}")
+            return []
+    return []
+
+@traced("tavily_search")
+async def afetch_tavily_search(query: str, api_key: str, max_results: int = 25,
+                               deadline: Optional[float] = None, priority: Optional[int] = None) -> List[Dict]:
+    """
+    Async fetch_tavily_search on a pooled aiohttp session.
+
+    Same retry and deadline policy; cancelling the awaiting task aborts the
+    request in flight instead of leaving a thread blocked on the socket.
+    """
+    import aiohttp
+
+    payload = _tavily_payload(query, api_key, max_results)
+    session = _get_aio_session()
+    limiter = get_rate_limiter("tavily", api_key)
+    expires = time.monotonic() + (deadline or TAVILY_DEADLINE)
+    for attempt in range(TAVILY_MAX_RETRIES + 1):
+        remaining = expires - time.monotonic()
+        if remaining <= 0:
+            logging.error("Tavily API error: deadline exceeded")
+            return []
+        try:
+            await limiter.aacquire(TAVILY_SEARCH_CREDITS, priority=priority, timeout=remaining)
+        except RateLimitTimeout as e:
+            logging.error(f"Tavily API error: {str(e)}")
+            return []
+        start = time.perf_counter()
+        timeout = aiohttp.ClientTimeout(
+            total=remaining,
+            connect=min(TAVILY_CONNECT_TIMEOUT, remaining),
+            sock_read=min(TAVILY_READ_TIMEOUT, remaining)
+        )
+        try:
+            async with session.post(TAVILY_SEARCH_URL, json=payload, timeout=timeout) as response:
+                _record_tavily_latency(time.perf_counter() - start, str(response.status))
+                response.raise_for_status()
+                data = await response.json(content_type=None)
+            logging.info(f"Tavily API raw response: {data}")
+            return data.get("results", [])
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            status = e.status if isinstance(e, aiohttp.ClientResponseError) else None
+            if status is None:
+                _record_tavily_latency(time.perf_counter() - start, type(e).__name__)
+            if (status is not None and status not in _RETRY_STATUSES) or attempt == TAVILY_MAX_RETRIES:
+                logging.error(f"Tavily API error: {str(e) or type(e).__name__}")
+                return []
+            backoff = _retry_backoff(attempt, expires)
+            logging.warning(f"Tavily API attempt {attempt + 1} failed ({str(e) or type(e).__name__}), retrying in {backoff:.2f}s")
+            await asyncio.sleep(backoff)
+        except Exception as e:
+            logging.error(f"Tavily API error: {str(e)}")
+            return []
+    return []
+
+TAVILY_FRESHNESS = float(os.getenv("TAVILY_FRESHNESS", 24 * 60 * 60))
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+def _search_cache_key(query: str, max_results: int) -> str:
+    """Normalise case, punctuation and whitespace so equivalent queries share an entry"""
+    normalized = " ".join(re.findall(r"\w+", query.lower()))
+    return json.dumps({"query": normalized, "search_depth": "advanced", "max_results": max_results},
+                      sort_keys=True)
+
+def _slim_results(results: List[Dict]) -> List[Dict]:
+    """Keep only the fields extract_leetcode_problems reads; raw page content is not cached"""
+    return [{k: r[k] for k in ("url", "title", "content") if k in r} for r in results]
+
+def _read_search_cache(key: str):
+    try:
+        return get_search_cache().get_entry(key)
+    except Exception as e:
+        logging.warning(f"Search cache read failed: {str(e)}")
+        return None
+
+def _write_search_cache(key: str, results: List[Dict]):
     try:
-        response = requests.post(url, json=payload, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        logging.info(f"Tavily API raw response: {data}")
-        return data.get("results", [])
+        get_search_cache().set(key, _slim_results(results))
     except Exception as e:
-        logging.error(f"Tavily API error: {str(e)}")
-        return []
+        logging.warning(f"Search cache write failed: {str(e)}")
+
+def _claim_refresh(key: str) -> bool:
+    """True for the one caller that should refresh a stale entry"""
+    with _refreshing_lock:
+        start_refresh = key not in _refreshing
+        _refreshing.add(key)
+    return start_refresh
 
+def _release_refresh(key: str):
+    with _refreshing_lock:
+        _refreshing.discard(key)
+
+def _refresh_search(key: str, query: str, api_key: str, max_results: int):
+    try:
+        results = fetch_tavily_search(query, api_key, max_results=max_results, priority=PRIORITY_BACKGROUND)
+        if results:
+            get_search_cache().set(key, _slim_results(results))
+            logging.info(f"Refreshed cached Tavily results for: {query}")
+    except Exception as e:
+        logging.warning(f"Background Tavily refresh failed: {str(e)}")
+    finally:
+        _release_refresh(key)
+
+async def _arefresh_search(key: str, query: str, api_key: str, max_results: int):
+    try:
+        results = await afetch_tavily_search(query, api_key, max_results=max_results,
+                                             priority=PRIORITY_BACKGROUND)
+        if results:
+            get_search_cache().set(key, _slim_results(results))
+            logging.info(f"Refreshed cached Tavily results for: {query}")
+    except Exception as e:
+        logging.warning(f"Background Tavily refresh failed: {str(e)}")
+    finally:
+        _release_refresh(key)
+
+# Strong references to background refresh tasks until they finish
+_refresh_tasks = set()
+
+def cached_tavily_search(query: str, api_key: str, max_results: int = 25) -> List[Dict]:
+    """
+    Serve Tavily results from the persistent search cache (stale-while-revalidate).
+
+    Cached results are returned immediately; once older than TAVILY_FRESHNESS
+    a single background refresh per query replaces them.
+    """
+    key = _search_cache_key(query, max_results)
+    entry = _read_search_cache(key)
+
+    if entry is not None:
+        results, age = entry
+        if age > TAVILY_FRESHNESS and _claim_refresh(key):
+            threading.Thread(
+                target=_refresh_search,
+                args=(key, query, api_key, max_results),
+                name="tavily-refresh",
+                daemon=True
+            ).start()
+        return results
+
+    results = fetch_tavily_search(query, api_key, max_results=max_results)
+    if results:
+        _write_search_cache(key, results)
+    return results
+
+async def acached_tavily_search(query: str, api_key: str, max_results: int = 25) -> List[Dict]:
+    """Async cached_tavily_search; stale entries are refreshed by a background task on the same loop"""
+    key = _search_cache_key(query, max_results)
+    entry = _read_search_cache(key)
+
+    if entry is not None:
+        results, age = entry
+        if age > TAVILY_FRESHNESS and _claim_refresh(key):
+            task = asyncio.create_task(_arefresh_search(key, query, api_key, max_results))
+            _refresh_tasks.add(task)
+            task.add_done_callback(_refresh_tasks.discard)
+        return results
+
+    results = await afetch_tavily_search(query, api_key, max_results=max_results)
+    if results:
+        _write_search_cache(key, results)
+    return results
+
+@traced("extract_leetcode_problems")
 def extract_leetcode_problems(results: List[Dict], max_count: int = 20) -> List[Dict]:
     """Extract individual LeetCode problems from Tavily results."""
     problems = []
@@ -69,197 +357,35 @@ def extract_leetcode_problems(results: List[Dict], max_count: int = 20) -> List[
                     break
     return problems
 
-STATIC_COMPANY_QUESTIONS = {
-    "Amazon": [
-        {"title": "Two Sum", "url": "https://leetcode.com/problems/two-sum/"},
-        {"title": "Longest Substring Without Repeating Characters", "url": "https://leetcode.com/problems/longest-substring-without-repeating-characters/"},
-        {"title": "Median of Two Sorted Arrays", "url": "https://leetcode.com/problems/median-of-two-sorted-arrays/"},
-        {"title": "Merge Intervals", "url": "https://leetcode.com/problems/merge-intervals/"},
-        {"title": "Valid Parentheses", "url": "https://leetcode.com/problems/valid-parentheses/"},
-        {"title": "Search in Rotated Sorted Array", "url": "https://leetcode.com/problems/search-in-rotated-sorted-array/"},
-        {"title": "Trapping Rain Water", "url": "https://leetcode.com/problems/trapping-rain-water/"},
-        {"title": "Word Ladder", "url": "https://leetcode.com/problems/word-ladder/"},
-        {"title": "Minimum Window Substring", "url": "https://leetcode.com/problems/minimum-window-substring/"},
-        {"title": "LRU Cache", "url": "https://leetcode.com/problems/lru-cache/"},
-        {"title": "Course Schedule", "url": "https://leetcode.com/problems/course-schedule/"},
-        {"title": "Clone Graph", "url": "https://leetcode.com/problems/clone-graph/"},
-        {"title": "Number of Islands", "url": "https://leetcode.com/problems/number-of-islands/"},
-        {"title": "Kth Largest Element in an Array", "url": "https://leetcode.com/problems/kth-largest-element-in-an-array/"},
-        {"title": "Product of Array Except Self", "url": "https://leetcode.com/problems/product-of-array-except-self/"},
-        {"title": "Find Minimum in Rotated Sorted Array", "url": "https://leetcode.com/problems/find-minimum-in-rotated-sorted-array/"},
-        {"title": "Maximum Subarray", "url": "https://leetcode.com/problems/maximum-subarray/"},
-        {"title": "Binary Tree Maximum Path Sum", "url": "https://leetcode.com/problems/binary-tree-maximum-path-sum/"},
-        {"title": "Serialize and Deserialize Binary Tree", "url": "https://leetcode.com/problems/serialize-and-deserialize-binary-tree/"},
-        {"title": "Subsets", "url": "https://leetcode.com/problems/subsets/"}
-    ],
-    "Google": [
-        {"title": "Add Two Numbers", "url": "https://leetcode.com/problems/add-two-numbers/"},
-        {"title": "Word Search", "url": "https://leetcode.com/problems/word-search/"},
-        {"title": "Longest Palindromic Substring", "url": "https://leetcode.com/problems/longest-palindromic-substring/"},
-        {"title": "Regular Expression Matching", "url": "https://leetcode.com/problems/regular-expression-matching/"},
-        {"title": "Jump Game", "url": "https://leetcode.com/problems/jump-game/"},
-        {"title": "Insert Interval", "url": "https://leetcode.com/problems/insert-interval/"},
-        {"title": "Minimum Window Substring", "url": "https://leetcode.com/problems/minimum-window-substring/"},
-        {"title": "Word Break", "url": "https://leetcode.com/problems/word-break/"},
-        {"title": "Find Median from Data Stream", "url": "https://leetcode.com/problems/find-median-from-data-stream/"},
-        {"title": "Alien Dictionary", "url": "https://leetcode.com/problems/alien-dictionary/"},
-        {"title": "Course Schedule II", "url": "https://leetcode.com/problems/course-schedule-ii/"},
-        {"title": "Meeting Rooms II", "url": "https://leetcode.com/problems/meeting-rooms-ii/"},
-        {"title": "Sliding Window Maximum", "url": "https://leetcode.com/problems/sliding-window-maximum/"},
-        {"title": "Find All Anagrams in a String", "url": "https://leetcode.com/problems/find-all-anagrams-in-a-string/"},
-        {"title": "Longest Consecutive Sequence", "url": "https://leetcode.com/problems/longest-consecutive-sequence/"},
-        {"title": "Merge k Sorted Lists", "url": "https://leetcode.com/problems/merge-k-sorted-lists/"},
-        {"title": "Median of Two Sorted Arrays", "url": "https://leetcode.com/problems/median-of-two-sorted-arrays/"},
-        {"title": "Binary Tree Right Side View", "url": "https://leetcode.com/problems/binary-tree-right-side-view/"},
-        {"title": "Unique Paths", "url": "https://leetcode.com/problems/unique-paths/"},
-        {"title": "Search a 2D Matrix", "url": "https://leetcode.com/problems/search-a-2d-matrix/"}
-    ],
-    "Microsoft": [
-        {"title": "Set Matrix Zeroes", "url": "https://leetcode.com/problems/set-matrix-zeroes/"},
-        {"title": "Spiral Matrix", "url": "https://leetcode.com/problems/spiral-matrix/"},
-        {"title": "Rotate Image", "url": "https://leetcode.com/problems/rotate-image/"},
-        {"title": "Group Anagrams", "url": "https://leetcode.com/problems/group-anagrams/"},
-        {"title": "Pow(x, n)", "url": "https://leetcode.com/problems/powx-n/"},
-        {"title": "Search a 2D Matrix II", "url": "https://leetcode.com/problems/search-a-2d-matrix-ii/"},
-        {"title": "Word Ladder II", "url": "https://leetcode.com/problems/word-ladder-ii/"},
-        {"title": "Binary Tree Level Order Traversal", "url": "https://leetcode.com/problems/binary-tree-level-order-traversal/"},
-        {"title": "Validate Binary Search Tree", "url": "https://leetcode.com/problems/validate-binary-search-tree/"},
-        {"title": "Lowest Common Ancestor of a Binary Tree", "url": "https://leetcode.com/problems/lowest-common-ancestor-of-a-binary-tree/"},
-        {"title": "House Robber", "url": "https://leetcode.com/problems/house-robber/"},
-        {"title": "House Robber II", "url": "https://leetcode.com/problems/house-robber-ii/"},
-        {"title": "Number of Islands", "url": "https://leetcode.com/problems/number-of-islands/"},
-        {"title": "Reverse Linked List", "url": "https://leetcode.com/problems/reverse-linked-list/"},
-        {"title": "Merge Two Sorted Lists", "url": "https://leetcode.com/problems/merge-two-sorted-lists/"},
-        {"title": "Intersection of Two Linked Lists", "url": "https://leetcode.com/problems/intersection-of-two-linked-lists/"},
-        {"title": "Linked List Cycle", "url": "https://leetcode.com/problems/linked-list-cycle/"},
-        {"title": "Copy List with Random Pointer", "url": "https://leetcode.com/problems/copy-list-with-random-pointer/"},
-        {"title": "LRU Cache", "url": "https://leetcode.com/problems/lru-cache/"},
-        {"title": "Find Minimum in Rotated Sorted Array", "url": "https://leetcode.com/problems/find-minimum-in-rotated-sorted-array/"}
-    ],
-    "TCS": [
-        {"title": "Remove Duplicates from Sorted Array", "url": "https://leetcode.com/problems/remove-duplicates-from-sorted-array/"},
-        {"title": "Best Time to Buy and Sell Stock", "url": "https://leetcode.com/problems/best-time-to-buy-and-sell-stock/"},
-        {"title": "Valid Anagram", "url": "https://leetcode.com/problems/valid-anagram/"},
-        {"title": "Intersection of Two Arrays II", "url": "https://leetcode.com/problems/intersection-of-two-arrays-ii/"},
-        {"title": "Majority Element", "url": "https://leetcode.com/problems/majority-element/"},
-        {"title": "Move Zeroes", "url": "https://leetcode.com/problems/move-zeroes/"},
-        {"title": "Contains Duplicate", "url": "https://leetcode.com/problems/contains-duplicate/"},
-        {"title": "Single Number", "url": "https://leetcode.com/problems/single-number/"},
-        {"title": "Maximum Subarray", "url": "https://leetcode.com/problems/maximum-subarray/"},
-        {"title": "Merge Sorted Array", "url": "https://leetcode.com/problems/merge-sorted-array/"},
-        {"title": "Reverse String", "url": "https://leetcode.com/problems/reverse-string/"},
-        {"title": "First Unique Character in a String", "url": "https://leetcode.com/problems/first-unique-character-in-a-string/"},
-        {"title": "Valid Palindrome", "url": "https://leetcode.com/problems/valid-palindrome/"},
-        {"title": "Palindrome Number", "url": "https://leetcode.com/problems/palindrome-number/"},
-        {"title": "Roman to Integer", "url": "https://leetcode.com/problems/roman-to-integer/"},
-        {"title": "Implement strStr()", "url": "https://leetcode.com/problems/implement-strstr/"},
-        {"title": "Count and Say", "url": "https://leetcode.com/problems/count-and-say/"},
-        {"title": "Maximum Depth of Binary Tree", "url": "https://leetcode.com/problems/maximum-depth-of-binary-tree/"},
-        {"title": "Symmetric Tree", "url": "https://leetcode.com/problems/symmetric-tree/"},
-        {"title": "Path Sum", "url": "https://leetcode.com/problems/path-sum/"}
-    ],
-    "Infosys": [
-        {"title": "Reverse Linked List", "url": "https://leetcode.com/problems/reverse-linked-list/"},
-        {"title": "Merge Two Sorted Lists", "url": "https://leetcode.com/problems/merge-two-sorted-lists/"},
-        {"title": "Remove Nth Node From End of List", "url": "https://leetcode.com/problems/remove-nth-node-from-end-of-list/"},
-        {"title": "Linked List Cycle", "url": "https://leetcode.com/problems/linked-list-cycle/"},
-        {"title": "Intersection of Two Linked Lists", "url": "https://leetcode.com/problems/intersection-of-two-linked-lists/"},
-        {"title": "Palindrome Linked List", "url": "https://leetcode.com/problems/palindrome-linked-list/"},
-        {"title": "Add Two Numbers", "url": "https://leetcode.com/problems/add-two-numbers/"},
-        {"title": "Remove Duplicates from Sorted List", "url": "https://leetcode.com/problems/remove-duplicates-from-sorted-list/"},
-        {"title": "Reverse String", "url": "https://leetcode.com/problems/reverse-string/"},
-        {"title": "Valid Parentheses", "url": "https://leetcode.com/problems/valid-parentheses/"},
-        {"title": "Valid Palindrome", "url": "https://leetcode.com/problems/valid-palindrome/"},
-        {"title": "Best Time to Buy and Sell Stock", "url": "https://leetcode.com/problems/best-time-to-buy-and-sell-stock/"},
-        {"title": "Maximum Subarray", "url": "https://leetcode.com/problems/maximum-subarray/"},
-        {"title": "Contains Duplicate", "url": "https://leetcode.com/problems/contains-duplicate/"},
-        {"title": "Single Number", "url": "https://leetcode.com/problems/single-number/"},
-        {"title": "Majority Element", "url": "https://leetcode.com/problems/majority-element/"},
-        {"title": "Move Zeroes", "url": "https://leetcode.com/problems/move-zeroes/"},
-        {"title": "Intersection of Two Arrays II", "url": "https://leetcode.com/problems/intersection-of-two-arrays-ii/"},
-        {"title": "First Unique Character in a String", "url": "https://leetcode.com/problems/first-unique-character-in-a-string/"},
-        {"title": "Roman to Integer", "url": "https://leetcode.com/problems/roman-to-integer/"}
-    ],
-    "Wipro": [
-        {"title": "Valid Parentheses", "url": "https://leetcode.com/problems/valid-parentheses/"},
-        {"title": "Merge Two Sorted Lists", "url": "https://leetcode.com/problems/merge-two-sorted-lists/"},
-        {"title": "Remove Duplicates from Sorted Array", "url": "https://leetcode.com/problems/remove-duplicates-from-sorted-array/"},
-        {"title": "Best Time to Buy and Sell Stock", "url": "https://leetcode.com/problems/best-time-to-buy-and-sell-stock/"},
-        {"title": "Valid Anagram", "url": "https://leetcode.com/problems/valid-anagram/"},
-        {"title": "Intersection of Two Arrays II", "url": "https://leetcode.com/problems/intersection-of-two-arrays-ii/"},
-        {"title": "Majority Element", "url": "https://leetcode.com/problems/majority-element/"},
-        {"title": "Move Zeroes", "url": "https://leetcode.com/problems/move-zeroes/"},
-        {"title": "Contains Duplicate", "url": "https://leetcode.com/problems/contains-duplicate/"},
-        {"title": "Single Number", "url": "https://leetcode.com/problems/single-number/"},
-        {"title": "Maximum Subarray", "url": "https://leetcode.com/problems/maximum-subarray/"},
-        {"title": "Merge Sorted Array", "url": "https://leetcode.com/problems/merge-sorted-array/"},
-        {"title": "Reverse String", "url": "https://leetcode.com/problems/reverse-string/"},
-        {"title": "First Unique Character in a String", "url": "https://leetcode.com/problems/first-unique-character-in-a-string/"},
-        {"title": "Valid Palindrome", "url": "https://leetcode.com/problems/valid-palindrome/"},
-        {"title": "Palindrome Number", "url": "https://leetcode.com/problems/palindrome-number/"},
-        {"title": "Roman to Integer", "url": "https://leetcode.com/problems/roman-to-integer/"},
-        {"title": "Implement strStr()", "url": "https://leetcode.com/problems/implement-strstr/"},
-        {"title": "Count and Say", "url": "https://leetcode.com/problems/count-and-say/"},
-        {"title": "Maximum Depth of Binary Tree", "url": "https://leetcode.com/problems/maximum-depth-of-binary-tree/"}
-    ],
-    "Accenture": [
-        {"title": "Valid Parentheses", "url": "https://leetcode.com/problems/valid-parentheses/"},
-        {"title": "Merge Two Sorted Lists", "url": "https://leetcode.com/problems/merge-two-sorted-lists/"},
-        {"title": "Remove Duplicates from Sorted Array", "url": "https://leetcode.com/problems/remove-duplicates-from-sorted-array/"},
-        {"title": "Best Time to Buy and Sell Stock", "url": "https://leetcode.com/problems/best-time-to-buy-and-sell-stock/"},
-        {"title": "Valid Anagram", "url": "https://leetcode.com/problems/valid-anagram/"},
-        {"title": "Intersection of Two Arrays II", "url": "https://leetcode.com/problems/intersection-of-two-arrays-ii/"},
-        {"title": "Majority Element", "url": "https://leetcode.com/problems/majority-element/"},
-        {"title": "Move Zeroes", "url": "https://leetcode.com/problems/move-zeroes/"},
-        {"title": "Contains Duplicate", "url": "https://leetcode.com/problems/contains-duplicate/"},
-        {"title": "Single Number", "url": "https://leetcode.com/problems/single-number/"},
-        {"title": "Maximum Subarray", "url": "https://leetcode.com/problems/maximum-subarray/"},
-        {"title": "Merge Sorted Array", "url": "https://leetcode.com/problems/merge-sorted-array/"},
-        {"title": "Reverse String", "url": "https://leetcode.com/problems/reverse-string/"},
-        {"title": "First Unique Character in a String", "url": "https://leetcode.com/problems/first-unique-character-in-a-string/"},
-        {"title": "Valid Palindrome", "url": "https://leetcode.com/problems/valid-palindrome/"},
-        {"title": "Palindrome Number", "url": "https://leetcode.com/problems/palindrome-number/"},
-        {"title": "Roman to Integer", "url": "https://leetcode.com/problems/roman-to-integer/"},
-        {"title": "Implement strStr()", "url": "https://leetcode.com/problems/implement-strstr/"},
-        {"title": "Count and Say", "url": "https://leetcode.com/problems/count-and-say/"},
-        {"title": "Maximum Depth of Binary Tree", "url": "https://leetcode.com/problems/maximum-depth-of-binary-tree/"}
-    ],
-    "Cognizant": [
-        {"title": "Valid Parentheses", "url": "https://leetcode.com/problems/valid-parentheses/"},
-        {"title": "Merge Two Sorted Lists", "url": "https://leetcode.com/problems/merge-two-sorted-lists/"},
-        {"title": "Remove Duplicates from Sorted Array", "url": "https://leetcode.com/problems/remove-duplicates-from-sorted-array/"},
-        {"title": "Best Time to Buy and Sell Stock", "url": "https://leetcode.com/problems/best-time-to-buy-and-sell-stock/"},
-        {"title": "Valid Anagram", "url": "https://leetcode.com/problems/valid-anagram/"},
-        {"title": "Intersection of Two Arrays II", "url": "https://leetcode.com/problems/intersection-of-two-arrays-ii/"},
-        {"title": "Majority Element", "url": "https://leetcode.com/problems/majority-element/"},
-        {"title": "Move Zeroes", "url": "https://leetcode.com/problems/move-zeroes/"},
-        {"title": "Contains Duplicate", "url": "https://leetcode.com/problems/contains-duplicate/"},
-        {"title": "Single Number", "url": "https://leetcode.com/problems/single-number/"},
-        {"title": "Maximum Subarray", "url": "https://leetcode.com/problems/maximum-subarray/"},
-        {"title": "Merge Sorted Array", "url": "https://leetcode.com/problems/merge-sorted-array/"},
-        {"title": "Reverse String", "url": "https://leetcode.com/problems/reverse-string/"},
-        {"title": "First Unique Character in a String", "url": "https://leetcode.com/problems/first-unique-character-in-a-string/"},
-        {"title": "Valid Palindrome", "url": "https://leetcode.com/problems/valid-palindrome/"},
-        {"title": "Palindrome Number", "url": "https://leetcode.com/problems/palindrome-number/"},
-        {"title": "Roman to Integer", "url": "https://leetcode.com/problems/roman-to-integer/"},
-        {"title": "Implement strStr()", "url": "https://leetcode.com/problems/implement-strstr/"},
-        {"title": "Count and Say", "url": "https://leetcode.com/problems/count-and-say/"},
-        {"title": "Maximum Depth of Binary Tree", "url": "https://leetcode.com/problems/maximum-depth-of-binary-tree/"}
-    ]
-}
+def _coding_query(company: str) -> str:
+    return f"20 most frequently asked LeetCode problems in {company} interviews with direct LeetCode links"
 
-def generate_coding(company: str, experience: str) -> List[Dict]:
-    """Generate company-specific coding questions using Tavily API, returning a list of dicts."""
-    tavily_api_key = os.getenv("TAVILY_API_KEY") or st.session_state.get("tavily_api_key")
-    if not tavily_api_key:
-        return [{"error": "Please provide a Tavily API key in the sidebar to fetch coding questions."}]
-    query = f"20 most frequently asked LeetCode problems in {company} interviews with direct LeetCode links"
-    results = fetch_tavily_search(query, tavily_api_key, max_results=30)
+_MISSING_TAVILY_KEY = "Please provide a Tavily API key in the sidebar to fetch coding questions."
+
+def _coding_problems(company: str, results: List[Dict]) -> List[Dict]:
     problems = extract_leetcode_problems(results, max_count=20)
     if not problems:
-        # Use static fallback if available
-        static = STATIC_COMPANY_QUESTIONS.get(company)
+        # Use the curated catalog list if the company has one
+        static = get_problem_catalog().company_questions(company)
         if static:
             return static
         return [{"error": "Failed to fetch LeetCode problems. Please check your API key or try again later."}]
-    return problems
\ No newline at end of file
+    return problems
+
+@traced("generate_coding")
+def generate_coding(company: str, experience: str) -> List[Dict]:
+    """Generate company-specific coding questions using Tavily API, returning a list of dicts."""
+    tavily_api_key = get_api_key("tavily")
+    if not tavily_api_key:
+        return [{"error": _MISSING_TAVILY_KEY}]
+    results = cached_tavily_search(_coding_query(company), tavily_api_key, max_results=30)
+    return _coding_problems(company, results)
+
+@traced("generate_coding")
+async def agenerate_coding(company: str, experience: str) -> List[Dict]:
+    """Async generate_coding"""
+    tavily_api_key = get_api_key("tavily")
+    if not tavily_api_key:
+        return [{"error": _MISSING_TAVILY_KEY}]
+    results = await acached_tavily_search(_coding_query(company), tavily_api_key, max_results=30)
+    return _coding_problems(company, results)
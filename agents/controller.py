@@ -1,13 +1,30 @@
-from agents.vqar_search import vqar_search
-from agents.vqar_quiz_formatter import format_quiz
-from agents.coding_question_gen import generate_coding
+from agents.vqar_search import (VQAR_SECTIONS, avqar_search, avqar_search_section,
+                                vqar_search_stream, avqar_generate_structured)
+from agents.vqar_quiz_formatter import aformat_quiz, iter_raw_questions
+from agents.coding_question_gen import agenerate_coding
+from utils.api_keys import capture_api_keys, get_api_key, with_api_keys
+from utils.async_runtime import run_sync
+from utils.hedging import Hedger
+from utils.metrics import STAGE_SECONDS, record_request, span, traced
+from utils.question_similarity import (NEAR_DUPLICATES, MinHashIndex, dedupe_questions, get_question_bank,
+                                       question_text)
+from utils.quiz_cache import QuizCache, get_quiz_cache
+from utils.quiz_store import get_quiz_store
+from utils.rate_limiter import PRIORITY_BACKGROUND, get_rate_limiter, get_rate_limit_stats, with_priority
+from utils.usage import (RequestUsage, current_session_id, iter_with_usage, usage_summary,
+                         with_request_usage, with_session)
+from utils.single_flight import FlightCancelled, SingleFlight
+from utils.warm_pool import QuizWarmPool
+import asyncio
+import functools
 import json
 import logging
 import os
 import re
+import threading
+import time
 from dotenv import load_dotenv
-from typing import Dict, List, Union, Optional
-import streamlit as st
+from typing import Dict, Iterator, List, Union, Optional
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -16,13 +33,81 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+VALID_COMPANIES = ["Amazon", "Google", "Microsoft", "TCS", 
+                   "Infosys", "Wipro", "Accenture", "Cognizant"]
+VALID_EXPERIENCE = ["fresher", "mid", "senior"]
+
+# Identical generations in flight anywhere in this process share one execution
+_generation_flight = SingleFlight()
+
+# Latency history and hedge budget for model calls, shared by all controllers
+_hedger = Hedger(
+    percentile=float(os.getenv("HEDGE_PERCENTILE", 0.95)),
+    max_rate=float(os.getenv("HEDGE_MAX_RATE", 0.1)),
+    min_samples=int(os.getenv("HEDGE_MIN_SAMPLES", 20)),
+    min_delay=float(os.getenv("HEDGE_MIN_DELAY", 1.0))
+)
+
+_warm_pool: Optional[QuizWarmPool] = None
+_warm_pool_lock = threading.Lock()
+
+def _warm_generate(company: str, experience: str) -> Optional[List]:
+    """Generate one VQAR quiz for the warm pool, queued behind interactive requests"""
+    usage = RequestUsage(company, "VQAR", session="warm_pool")
+    result = run_sync(with_priority(
+        PRIORITY_BACKGROUND,
+        with_request_usage(usage, QuestionController(company=company)._agenerate_vqar_questions(company, experience))
+    ))
+    usage.finish('warm_pool_fill' if result['status'] == 'success' else 'fallback')
+    return result['questions'] if result['status'] == 'success' else None
+
+def get_warm_pool() -> Optional[QuizWarmPool]:
+    """
+    Return the process-wide VQAR warm pool, starting it on first use.
+    
+    Disabled unless WARM_POOL_DEPTH > 0. Background refills cannot see a
+    session's sidebar key, so the pool also needs GOOGLE_API_KEY in the environment.
+    """
+    global _warm_pool
+    with _warm_pool_lock:
+        if _warm_pool is None:
+            depth = int(os.getenv("WARM_POOL_DEPTH", 0))
+            if depth <= 0 or not os.getenv("GOOGLE_API_KEY"):
+                return None
+            _warm_pool = QuizWarmPool(
+                _warm_generate,
+                keys=[(company, experience) for company in VALID_COMPANIES for experience in VALID_EXPERIENCE],
+                target_depth=depth,
+                low_water=int(os.getenv("WARM_POOL_LOW_WATER", 1)),
+                max_age=float(os.getenv("WARM_POOL_MAX_AGE", 6 * 60 * 60)),
+                rate_per_minute=float(os.getenv("WARM_POOL_RATE_PER_MINUTE", 6))
+            ).start()
+        return _warm_pool
+
+_controllers: Dict[Optional[str], "QuestionController"] = {}
+_controllers_lock = threading.Lock()
+
+def get_controller(company: Optional[str] = None) -> "QuestionController":
+    """
+    Return the process-wide controller for a company.
+
+    Controllers keep configuration and references to process-wide pools;
+    API keys come from the calling session's context, so every session of
+    a company can share one instead of building its own.
+    """
+    with _controllers_lock:
+        controller = _controllers.get(company)
+        if controller is None:
+            controller = _controllers[company] = QuestionController(company=company)
+        return controller
+
 class QuestionController:
     """
     Central controller for managing question generation workflows.
     Handles both aptitude (VQAR) and coding questions with proper validation and fallbacks.
     """
     
-    def __init__(self, company=None):
+    def __init__(self, company=None, cache: Optional[QuizCache] = None):
         """Initialize with default fallback questions and configuration"""
         # print(f"Initializing QuestionController with company: {company}")
         self.company = company
@@ -30,33 +115,114 @@ class QuestionController:
         self.fallback_coding = self._create_fallback_coding_questions(company or "default")
         self.min_vqar_questions = 5
         self.min_coding_length = 200
+        self.cache = cache or get_quiz_cache()
+        # "sectioned" fans out one call per quiz section, "structured" makes one JSON call;
+        # both fall back to "two_step" (vqar_search + format_quiz)
+        self.vqar_mode = os.getenv("VQAR_MODE", "sectioned")
+        self.section_timeout = float(os.getenv("VQAR_SECTION_TIMEOUT", 60))
+        self.section_retries = int(os.getenv("VQAR_SECTION_RETRIES", 1))
+        self.request_timeout = float(os.getenv("REQUEST_TIMEOUT", 240))
+        # Duplicate model calls that run past the recent latency percentile
+        self.hedging = os.getenv("HEDGE_REQUESTS", "").lower() in ("1", "true", "yes")
+        self.last_generation = {}
+        self.warm_pool = get_warm_pool()
         
         
     def generate_questions(self, 
                          company: str, 
                          experience: str, 
                          category: str,
-                         num_questions: int = 15) -> Dict[str, Union[str, List]]:
+                         num_questions: int = 15,
+                         force_refresh: bool = False,
+                         timeout: Optional[float] = None) -> Dict[str, Union[str, List]]:
         """
         Main entry point for question generation
         
+        Blocking wrapper around agenerate_questions, run on the shared event loop
+        with this session's API keys.
+        
         Args:
             company: Target company name (e.g., "Google", "Amazon")
             experience: Experience level ("fresher", "mid", "senior")
             category: Question type ("VQAR" or "Coding")
             num_questions: Number of questions to generate (for VQAR)
+            force_refresh: Skip the cache lookup and regenerate from the APIs
+            timeout: Overall generation budget in seconds (default REQUEST_TIMEOUT)
             
         Returns:
             Dictionary containing:
             - 'status': 'success' or 'error'
             - 'message': Additional information
             - 'questions': Generated questions
-            - 'source': 'api' or 'fallback'
+            - 'source': 'api', 'warm_pool', 'cache' or 'fallback'
+            - 'path', 'elapsed': VQAR generation path that ran and its duration
+            - 'usage': Model calls, tokens and estimated cost spent on this request
+        """
+        return run_sync(with_api_keys(
+            capture_api_keys(),
+            with_session(
+                current_session_id(),
+                self.agenerate_questions(company, experience, category, num_questions, force_refresh, timeout)
+            )
+        ))
+
+    async def agenerate_questions(self,
+                                  company: str,
+                                  experience: str,
+                                  category: str,
+                                  num_questions: int = 15,
+                                  force_refresh: bool = False,
+                                  timeout: Optional[float] = None) -> Dict[str, Union[str, List]]:
+        """
+        Async entry point for question generation; same arguments and result as generate_questions.
+        
+        Network calls are awaited rather than blocking a thread. Exceeding the
+        timeout, or cancelling the calling task, ends this request's wait and
+        returns the fallback set; the generation itself is cancelled once no
+        request coalesced onto it is still waiting.
         """
+        usage = RequestUsage(company, category)
+        with span("generate_questions"):
+            result = await with_request_usage(
+                usage,
+                self._agenerate_questions(company, experience, category, num_questions, force_refresh, timeout)
+            )
+        result['usage'] = self._finish_request(usage, result.get('source', 'unknown'))
+        return result
+
+    async def _agenerate_questions(self,
+                                   company: str,
+                                   experience: str,
+                                   category: str,
+                                   num_questions: int,
+                                   force_refresh: bool,
+                                   timeout: Optional[float]) -> Dict[str, Union[str, List]]:
+        """Serve from the warm pool or cache, else run (or join) a generation"""
         try:
             # Validate inputs
             self._validate_inputs(company, experience, category)
             
+            # Serve a pre-generated quiz, then a previously generated set, when available
+            cache_key = QuizCache.make_key(company, experience, category)
+            if not force_refresh and category == "VQAR":
+                warm = self._pop_warm(company, experience)
+                if warm:
+                    return {
+                        'status': 'success',
+                        'message': '',
+                        'questions': self._limit(warm, category, num_questions),
+                        'source': 'warm_pool'
+                    }
+            if not force_refresh:
+                cached = self._get_cached(cache_key)
+                if cached:
+                    return {
+                        'status': 'success',
+                        'message': '',
+                        'questions': self._limit(cached, category, num_questions),
+                        'source': 'cache'
+                    }
+            
             # Check API keys
             if not self._check_required_keys(category):
                 return {
@@ -66,14 +232,20 @@ class QuestionController:
                     'source': 'fallback'
                 }
             
-            # Generate questions
-            if category == "VQAR":
-                result = self._generate_vqar_questions(company, experience, num_questions)
-            else:
-                result = self._generate_coding_questions(company, experience)
+            # Generate questions; identical concurrent requests wait on one execution, which
+            # keeps running while any of them waits, whoever started it
+            result, shared = await _generation_flight.async_do(
+                cache_key,
+                lambda: self._agenerate_and_cache(cache_key, company, experience, category),
+                timeout=timeout or self.request_timeout
+            )
+            result = dict(result)
+            if shared:
+                logger.info(f"Coalesced with in-flight generation: {cache_key}")
             
             # Validate and return
             if result['status'] == 'success':
+                result['questions'] = self._limit(result['questions'], category, num_questions)
                 return result
             return {
                 'status': 'error',
@@ -83,64 +255,235 @@ class QuestionController:
             }
             
         except Exception as e:
-            logger.error(f"Controller error: {str(e)}", exc_info=True)
+            logger.error(f"Controller error: {str(e) or type(e).__name__}", exc_info=True)
             return {
                 'status': 'error',
-                'message': str(e),
+                'message': str(e) or type(e).__name__,
                 'questions': self._get_fallback(category, company),
                 'source': 'fallback'
             }
 
-    def _generate_vqar_questions(self, 
-                               company: str, 
-                               experience: str,
-                               num_questions: int) -> Dict[str, Union[str, List]]:
-        """Generate and validate VQAR questions"""
+    def stream_vqar_questions(self,
+                              company: str,
+                              experience: str,
+                              force_refresh: bool = False) -> Iterator[Dict]:
+        """
+        Yield validated VQAR questions one at a time as the model streams them.
+        
+        Cached sets are replayed immediately, and an identical generation already
+        in flight is joined rather than repeated. A freshly streamed set is cached
+        once the model finishes, provided enough questions were valid.
+        Raises on invalid input or missing keys; callers fall back to
+        generate_questions in that case.
+        """
+        self._validate_inputs(company, experience, "VQAR")
+        cache_key = QuizCache.make_key(company, experience, "VQAR")
+        usage = RequestUsage(company, "VQAR")
+        if not force_refresh:
+            warm = self._pop_warm(company, experience)
+            if warm:
+                self._finish_request(usage, "warm_pool")
+                yield from warm
+                return
+            cached = self._get_cached(cache_key)
+            if cached:
+                self._finish_request(usage, "cache")
+                yield from cached
+                return
+        
+        if not self._check_required_keys("VQAR"):
+            raise ValueError("Missing required API keys")
+        
+        # Join an identical generation already in flight instead of starting another
+        flight, leader = _generation_flight.join(cache_key)
+        if not leader:
+            try:
+                result = _generation_flight.wait(flight, self.request_timeout)
+                if result['status'] != 'success':
+                    raise ValueError(result['message'])
+                logger.info(f"Coalesced with in-flight generation: {cache_key}")
+                self._finish_request(usage, "coalesced")
+                yield from result['questions']
+                return
+            except FlightCancelled:
+                # The leader went away; stream on our own without publishing
+                flight = None
+        
+        try:
+            start = time.perf_counter()
+            questions = []
+            seen = MinHashIndex()
+            for question in iter_raw_questions(iter_with_usage(usage, vqar_search_stream(company, experience))):
+                valid = self._validate_vqar_questions([question])
+                if valid:
+                    # Skip near-duplicates of questions already streamed in this quiz
+                    text = question_text(valid[0])
+                    if seen.find(text) is not None:
+                        NEAR_DUPLICATES.inc()
+                        continue
+                    seen.add(len(questions), text)
+                    questions.append(valid[0])
+                    yield valid[0]
+            
+            elapsed = time.perf_counter() - start
+            # A generator cannot hold a span open across yields, so record the total directly
+            STAGE_SECONDS.observe(elapsed, stage="vqar_stream")
+            self._finish_request(usage, "api")
+            self.last_generation = {'path': 'stream', 'elapsed': round(elapsed, 3)}
+            logger.info(f"VQAR generation path=stream elapsed={self.last_generation['elapsed']}s")
+            result = self._vqar_result(questions, 'stream')
+            if result['status'] == 'success':
+                self._set_cached(cache_key, questions)
+                get_question_bank().record(questions)
+        except BaseException as e:
+            if flight is not None:
+                _generation_flight.finish(cache_key, flight, e)
+            raise
+        if flight is not None:
+            flight.resolve(result)
+            _generation_flight.finish(cache_key, flight)
+
+    @traced("generate_vqar")
+    async def _agenerate_vqar_questions(self, 
+                                        company: str, 
+                                        experience: str) -> Dict[str, Union[str, List]]:
+        """Generate VQAR questions via the configured path, falling back to the two-step chain"""
+        start = time.perf_counter()
+        result = None
+        primary = {
+            'sectioned': self._agenerate_vqar_sectioned,
+            'structured': self._agenerate_vqar_structured
+        }.get(self.vqar_mode)
+        if primary is not None:
+            result = await primary(company, experience)
+            if result['status'] != 'success':
+                logger.warning(f"{self.vqar_mode} VQAR generation failed, falling back: {result['message']}")
+        if result is None or result['status'] != 'success':
+            result = await self._agenerate_vqar_two_step(company, experience)
+        
+        result['elapsed'] = round(time.perf_counter() - start, 3)
+        self.last_generation = {'path': result['path'], 'elapsed': result['elapsed']}
+        logger.info(f"VQAR generation path={result['path']} elapsed={result['elapsed']}s")
+        return result
+
+    @traced("vqar_sectioned")
+    async def _agenerate_vqar_sectioned(self,
+                                        company: str,
+                                        experience: str) -> Dict[str, Union[str, List]]:
+        """Generate quiz sections concurrently, retrying only the sections that fail or time out"""
+        sections = {}
+        pending = [name for name, _, _ in VQAR_SECTIONS]
+        for attempt in range(1 + self.section_retries):
+            # A section that overruns its timeout is cancelled, not left running
+            outcomes = await asyncio.gather(*(
+                asyncio.wait_for(
+                    self._call_model(f"section:{name}",
+                                     lambda name=name: avqar_search_section(company, experience, name)),
+                    self.section_timeout
+                )
+                for name in pending
+            ), return_exceptions=True)
+            failed = []
+            for name, outcome in zip(pending, outcomes):
+                if isinstance(outcome, BaseException) or not outcome:
+                    reason = (str(outcome) or type(outcome).__name__) if outcome else "no questions parsed"
+                    logger.warning(f"VQAR section '{name}' failed (attempt {attempt + 1}): {reason}")
+                    failed.append(name)
+                else:
+                    sections[name] = outcome
+            pending = failed
+            if not pending:
+                break
+        
+        if pending:
+            logger.warning(f"VQAR sections missing after retries: {pending}")
+        # Merge in section order regardless of completion order
+        questions = [q for name, _, _ in VQAR_SECTIONS for q in sections.get(name, [])]
+        return self._vqar_result(questions, 'sectioned')
+
+    @traced("vqar_structured")
+    async def _agenerate_vqar_structured(self,
+                                         company: str,
+                                         experience: str) -> Dict[str, Union[str, List]]:
+        """Generate VQAR questions as JSON in one model call"""
+        try:
+            questions = await self._call_model("structured", lambda: avqar_generate_structured(company, experience))
+            return self._vqar_result(questions, 'structured')
+        except Exception as e:
+            return {
+                'status': 'error',
+                'message': str(e),
+                'path': 'structured'
+            }
+
+    @traced("vqar_two_step")
+    async def _agenerate_vqar_two_step(self,
+                                       company: str,
+                                       experience: str) -> Dict[str, Union[str, List]]:
+        """Generate raw questions, then convert them to JSON with a second model call"""
         try:
             # Step 1: Generate raw questions
-            raw_questions = vqar_search(company, experience)
+            raw_questions = await self._call_model("vqar_search", lambda: avqar_search(company, experience))
             if not raw_questions or len(raw_questions.strip()) < 100:
                 return {
                     'status': 'error',
-                    'message': 'Insufficient questions generated'
+                    'message': 'Insufficient questions generated',
+                    'path': 'two_step'
                 }
             
             # Step 2: Format to JSON
-            formatted = format_quiz(raw_questions)
+            formatted = await self._call_model("format_quiz", lambda: aformat_quiz(raw_questions))
             questions = json.loads(formatted)
-            
-            # Step 3: Validate structure
-            valid_questions = self._validate_vqar_questions(questions)
-            if len(valid_questions) < self.min_vqar_questions:
-                return {
-                    'status': 'error',
-                    'message': f'Only {len(valid_questions)} valid questions generated'
-                }
-            
-            return {
-                'status': 'success',
-                'message': '',
-                'questions': valid_questions[:num_questions],
-                'source': 'api'
-            }
+            return self._vqar_result(questions, 'two_step')
             
         except json.JSONDecodeError as e:
             return {
                 'status': 'error',
-                'message': f'JSON parsing error: {str(e)}'
+                'message': f'JSON parsing error: {str(e)}',
+                'path': 'two_step'
             }
         except Exception as e:
             return {
                 'status': 'error',
-                'message': str(e)
+                'message': str(e),
+                'path': 'two_step'
             }
 
-    def _generate_coding_questions(self,
-                                 company: str,
-                                 experience: str) -> Dict[str, Union[str, List]]:
+    @staticmethod
+    def _finish_request(usage: RequestUsage, source: str) -> Dict:
+        """Count a finished request and close out its model usage"""
+        record_request(usage.category, source)
+        return usage.finish(source)
+
+    async def _call_model(self, kind: str, fn):
+        """Await a model call, hedging it when hedging is enabled"""
+        return await _hedger.run(kind, fn, hedge=self.hedging)
+
+    def _vqar_result(self, questions: List, path: str) -> Dict[str, Union[str, List]]:
+        """Validate generated questions, drop near-duplicates and build the result for the given path"""
+        valid_questions = dedupe_questions(self._validate_vqar_questions(questions))
+        if len(valid_questions) < self.min_vqar_questions:
+            return {
+                'status': 'error',
+                'message': f'Only {len(valid_questions)} valid questions generated',
+                'path': path
+            }
+        
+        return {
+            'status': 'success',
+            'message': '',
+            'questions': valid_questions,
+            'source': 'api',
+            'path': path
+        }
+
+    @traced("generate_coding_questions")
+    async def _agenerate_coding_questions(self,
+                                          company: str,
+                                          experience: str) -> Dict[str, Union[str, List]]:
         """Generate and validate coding questions"""
         try:
-            questions = generate_coding(company, experience)
+            questions = await agenerate_coding(company, experience)
             # If error returned as a dict
             if isinstance(questions, list) and questions and 'error' in questions[0]:
                 return {
@@ -165,11 +508,104 @@ class QuestionController:
                 'message': str(e)
             }
 
+    async def _agenerate_and_cache(self,
+                                   cache_key: str,
+                                   company: str,
+                                   experience: str,
+                                   category: str) -> Dict[str, Union[str, List]]:
+        """Run the generation for a category and cache a successful result"""
+        if category == "VQAR":
+            result = await self._agenerate_vqar_questions(company, experience)
+        else:
+            result = await self._agenerate_coding_questions(company, experience)
+        if result['status'] == 'success':
+            self._set_cached(cache_key, result['questions'])
+        return result
+
+    def _pop_warm(self, company: str, experience: str) -> Optional[List]:
+        """Take a ready quiz from the warm pool, if it is enabled"""
+        if self.warm_pool is None:
+            return None
+        return self.warm_pool.pop((company, experience))
+
+    def warm_pool_stats(self) -> Dict:
+        """Expose warm pool depth metrics (empty when disabled)"""
+        return self.warm_pool.metrics() if self.warm_pool is not None else {}
+
+    @traced("cache_get")
+    def _get_cached(self, key: str) -> Optional[List]:
+        """Look up a cached question set, treating cache failures as misses"""
+        try:
+            return self.cache.get(key)
+        except Exception as e:
+            logger.warning(f"Quiz cache read failed: {str(e)}")
+            return None
+
+    @traced("cache_set")
+    def _set_cached(self, key: str, questions: List):
+        """Store a freshly generated question set"""
+        try:
+            self.cache.set(key, questions)
+        except Exception as e:
+            logger.warning(f"Quiz cache write failed: {str(e)}")
+
+    @staticmethod
+    def _limit(questions: List, category: str, num_questions: int) -> List:
+        """Apply the requested question count (VQAR only), preferring questions served least often"""
+        if category == "VQAR":
+            return get_question_bank().pick_least_seen(questions, num_questions)
+        return questions
+
+    def cache_stats(self) -> Dict:
+        """Expose hit/miss counters of the shared quiz cache"""
+        try:
+            return self.cache.stats()
+        except Exception as e:
+            logger.warning(f"Quiz cache stats failed: {str(e)}")
+            return {}
+
+    def expected_wait(self, category: str) -> float:
+        """Seconds a new request for category would currently queue behind the provider rate limit"""
+        provider = "gemini" if category == "VQAR" else "tavily"
+        api_key = get_api_key(provider)
+        if not api_key:
+            return 0.0
+        return get_rate_limiter(provider, api_key).expected_wait()
+
+    @staticmethod
+    def rate_limit_stats() -> Dict:
+        """Expose per-key rate limiter queues and wait times"""
+        return get_rate_limit_stats()
+
+    @staticmethod
+    def hedging_stats() -> Dict:
+        """Expose how often hedged model calls fired and won"""
+        return _hedger.stats()
+
+    @staticmethod
+    def question_bank_stats() -> Dict:
+        """Near-duplicate clusters in the question bank and how often they were served"""
+        return get_question_bank().stats()
+
+    @staticmethod
+    def quiz_store_stats() -> Dict:
+        """Quizzes in the shared quiz store and how many sessions reference them"""
+        return get_quiz_store().stats()
+
+    @staticmethod
+    def usage_stats() -> Dict:
+        """Expose model token and cost totals by stage, category, company, session and request source"""
+        return usage_summary()
+
+    @staticmethod
+    def coalescing_stats() -> Dict:
+        """Expose process-wide request coalescing counters"""
+        return _generation_flight.stats()
+
     def _validate_inputs(self, company: str, experience: str, category: str):
         """Validate all input parameters"""
-        valid_companies = ["Amazon", "Google", "Microsoft", "TCS", 
-                          "Infosys", "Wipro", "Accenture", "Cognizant"]
-        valid_experience = ["fresher", "mid", "senior"]
+        valid_companies = VALID_COMPANIES
+        valid_experience = VALID_EXPERIENCE
         valid_categories = ["VQAR", "Coding"]
         
         if company not in valid_companies:
@@ -186,13 +622,14 @@ class QuestionController:
         return self._has_tavily_key()
 
     def _has_gemini_key(self) -> bool:
-        """Check for Gemini API key in env or session state"""
-        return "GOOGLE_API_KEY" in os.environ or "gemini_api_key" in st.session_state
+        """Check for Gemini API key in env, the bound request context or session state"""
+        return bool(get_api_key("gemini"))
 
     def _has_tavily_key(self) -> bool:
-        """Check for Tavily API key in env or session state"""
-        return "TAVILY_API_KEY" in os.environ or "tavily_api_key" in st.session_state
+        """Check for Tavily API key in env, the bound request context or session state"""
+        return bool(get_api_key("tavily"))
 
+    @traced("validate_vqar_questions")
     def _validate_vqar_questions(self, questions: List) -> List[Dict]:
         """Validate VQAR question structure"""
         valid = []
@@ -226,6 +663,7 @@ class QuestionController:
         return self._create_fallback_coding_questions(company)
 
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def _create_fallback_vqar_questions() -> str:
         """Default VQAR questions"""
         questions = [
@@ -285,6 +723,7 @@ class QuestionController:
         
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def _create_fallback_coding_questions(company: str) -> str:
         """Default coding questions with company context"""
         templates = {
@@ -1,9 +1,146 @@
-from utils.gemini_langchain import get_gemini_model, get_prompt
+from utils.gemini_langchain import get_gemini_model, get_prompt, acquire_gemini, aacquire_gemini, estimate_tokens
+from utils.json_stream import aiter_json_array, iter_json_array
+from utils.metrics import traced
 import json
+import logging
 import re
+from typing import AsyncIterable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-def format_quiz(raw_questions: str):
-    """Convert raw aptitude questions into properly formatted JSON"""
+logger = logging.getLogger(__name__)
+
+# Line patterns for the "Question: / A) .. D) / Answer:" format requested by vqar_search
+_MARKDOWN_RE = re.compile(r'\*\*|__|`|^\s*#+\s*|^\s*[-*•]\s+')
+_QUESTION_RE = re.compile(r'^(?:\d+\s*[.)]\s*)?(?:Q(?:uestion)?\s*\d*\s*[:.)\-]\s*)(.*)$', re.IGNORECASE)
+_NUMBERED_RE = re.compile(r'^\d+\s*[.)]\s+(.+)$')
+_OPTION_RE = re.compile(r'^\(?([A-Da-d])\s*[).:]\s*(.*)$')
+_ANSWER_RE = re.compile(r'^(?:Correct\s+)?Answer\s*[:\-]?\s*(.*)$', re.IGNORECASE)
+_ANSWER_LETTER_RE = re.compile(r'^(?:Option\s+)?\(?([A-Da-d])\)?(?:[.):]\s*(.*))?$')
+
+class _RawQuestionParser:
+    """Line-driven state machine that assembles one question block at a time"""
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self.question: List[str] = []
+        self.options: Dict[str, str] = {}
+        self.answer: Optional[str] = None
+        self.lines: List[str] = []
+
+    def feed_line(self, line: str) -> Optional[Tuple[Optional[Dict], str]]:
+        """
+        Consume one line of raw text.
+
+        Returns (question, raw_block) when the line closes the previous block,
+        where question is None if that block could not be parsed.
+        """
+        text = _MARKDOWN_RE.sub('', line).strip()
+        if not text:
+            return None
+
+        completed = None
+        question_match = _QUESTION_RE.match(text)
+        if not question_match and (self.answer is not None or not self.lines):
+            question_match = _NUMBERED_RE.match(text)
+        if question_match:
+            completed = self.flush()
+            self.question.append(question_match.group(1).strip())
+            self.lines.append(line)
+            return completed
+
+        if not self.lines:
+            # Preamble before the first question
+            return None
+        self.lines.append(line)
+
+        answer_match = _ANSWER_RE.match(text)
+        if answer_match:
+            # The answer line closes the block, so streamed questions are emitted without waiting for the next one
+            self.answer = answer_match.group(1).strip()
+            return self.flush()
+
+        option_match = _OPTION_RE.match(text)
+        if option_match and self.answer is None:
+            self.options[option_match.group(1).upper()] = option_match.group(2).strip()
+        elif not self.options and self.answer is None:
+            # Multi-line question statement
+            self.question.append(text)
+        return None
+
+    def flush(self) -> Optional[Tuple[Optional[Dict], str]]:
+        """Close the current block, if any"""
+        if not self.lines:
+            return None
+        block = (self._build(), "\n".join(self.lines))
+        self._reset()
+        return block
+
+    def _build(self) -> Optional[Dict]:
+        question = " ".join(part for part in self.question if part)
+        if not question or sorted(self.options) != ["A", "B", "C", "D"] or not self.answer:
+            return None
+        options = [self.options[letter] for letter in "ABCD"]
+        if not all(options):
+            return None
+
+        answer = None
+        letter_match = _ANSWER_LETTER_RE.match(self.answer)
+        if letter_match:
+            answer = self.options[letter_match.group(1).upper()]
+        elif self.answer in options:
+            answer = self.answer
+        if answer is None:
+            return None
+        return {
+            "question": question,
+            "options": options,
+            "answer": answer
+        }
+
+@traced("parse_raw_questions")
+def parse_raw_questions(raw_questions: str) -> Tuple[List[Dict], List[str]]:
+    """
+    Parse vqar_search output locally, without a model call.
+
+    Returns the questions that parsed cleanly and the raw text of the blocks
+    that did not, so only those need to go through the LLM formatter.
+    """
+    parser = _RawQuestionParser()
+    parsed, unparsed = [], []
+    for line in raw_questions.splitlines():
+        block = parser.feed_line(line)
+        if block:
+            (parsed if block[0] else unparsed).append(block[0] or block[1])
+    block = parser.flush()
+    if block:
+        (parsed if block[0] else unparsed).append(block[0] or block[1])
+    return parsed, unparsed
+
+def iter_raw_questions(chunks: Iterable[str]) -> Iterator[Dict]:
+    """Incrementally parse streamed vqar_search output, yielding each question once its block closes"""
+    parser = _RawQuestionParser()
+    buffer = ""
+    skipped = 0
+    for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            block = parser.feed_line(line)
+            if block and block[0]:
+                yield block[0]
+            elif block:
+                skipped += 1
+    for block in (parser.feed_line(buffer), parser.flush()):
+        if block and block[0]:
+            yield block[0]
+        elif block:
+            skipped += 1
+    if skipped:
+        logger.warning(f"iter_raw_questions: skipped {skipped} unparseable question blocks")
+
+def _format_quiz_chain():
+    """Build the prompt | model chain that converts raw questions to a JSON array"""
     
     template = """
     Convert the following aptitude questions into a valid JSON array format.
@@ -41,90 +178,133 @@ def format_quiz(raw_questions: str):
     """
     
     prompt = get_prompt(template)
-    chain = prompt | get_gemini_model()
+    return prompt | get_gemini_model()
+
+@traced("format_quiz")
+def format_quiz(raw_questions: str):
+    """Convert raw aptitude questions into properly formatted JSON"""
+    
+    # The common case parses locally; only malformed blocks need the model
+    parsed, unparsed = parse_raw_questions(raw_questions)
+    if parsed and not unparsed:
+        return json.dumps(parsed, indent=2)
+    
+    chain = _format_quiz_chain()
     
     try:
-        response = chain.invoke({"raw_questions": raw_questions}).content
-        
-        # Clean the response to extract JSON
-        response = response.strip()
-        
-        # Remove any markdown formatting
-        response = re.sub(r'```json\s*', '', response)
-        response = re.sub(r'```\s*$', '', response)
-        
-        # Find JSON array pattern
-        json_match = re.search(r'\[.*\]', response, re.DOTALL)
-        if json_match:
-            response = json_match.group(0)
+        llm_input = "\n\n".join(unparsed) if parsed else raw_questions
+        # Output is about as long as the input, plus the ~1.5k character instructions
+        acquire_gemini(estimate_tokens(1500 + 2 * len(llm_input)))
+        # Decode each question as soon as it streams in; one bad element no longer sinks the batch
+        response = (chunk.content for chunk in chain.stream({"raw_questions": llm_input}))
+        return _formatted(parsed + clean_quiz_questions(parse_quiz_stream(response)))
+    except Exception as e:
+        return _format_fallback(parsed, e)
+
+@traced("format_quiz")
+async def aformat_quiz(raw_questions: str):
+    """Async format_quiz; the model call (if any) is awaited rather than blocking a thread"""
+    parsed, unparsed = parse_raw_questions(raw_questions)
+    if parsed and not unparsed:
+        return json.dumps(parsed, indent=2)
+    
+    chain = _format_quiz_chain()
+    
+    try:
+        llm_input = "\n\n".join(unparsed) if parsed else raw_questions
+        await aacquire_gemini(estimate_tokens(1500 + 2 * len(llm_input)))
+        response = (chunk.content async for chunk in chain.astream({"raw_questions": llm_input}))
+        return _formatted(parsed + clean_quiz_questions(await aparse_quiz_stream(response)))
+    except Exception as e:
+        return _format_fallback(parsed, e)
+
+def _formatted(validated_questions: list) -> str:
+    if len(validated_questions) == 0:
+        raise ValueError("No valid questions found")
+    
+    return json.dumps(validated_questions, indent=2)
+
+def _format_fallback(parsed: list, error: Exception) -> str:
+    """Result of format_quiz when the model call fails"""
+    logger.error(f"Error in format_quiz: {str(error)}", exc_info=True)
+    if parsed:
+        # Keep what parsed locally rather than discarding the whole batch
+        return json.dumps(parsed, indent=2)
+    # Return safe default questions
+    default_questions = [
+        {
+            "question": "What is the result of 15 + 23?",
+            "options": ["38", "37", "39", "36"],
+            "answer": "38"
+        },
+        {
+            "question": "If a train travels 120 km in 2 hours, what is its speed?",
+            "options": ["50 km/h", "60 km/h", "70 km/h", "80 km/h"],
+            "answer": "60 km/h"
+        },
+        {
+            "question": "Choose the odd one out: Apple, Banana, Carrot, Mango",
+            "options": ["Apple", "Banana", "Carrot", "Mango"],
+            "answer": "Carrot"
+        }
+    ]
+    return json.dumps(default_questions)
+
+def parse_quiz_stream(chunks: Iterable[str]) -> list:
+    """Decode a (possibly streamed) JSON quiz array element by element, skipping malformed ones"""
+    errors = []
+    items = list(iter_json_array(chunks, errors))
+    if errors:
+        logger.warning(f"Skipped {len(errors)} malformed quiz elements")
+        logger.debug(f"Malformed quiz elements: {errors}")
+    return items
+
+async def aparse_quiz_stream(chunks: AsyncIterable[str]) -> list:
+    """Async parse_quiz_stream"""
+    errors = []
+    items = [item async for item in aiter_json_array(chunks, errors)]
+    if errors:
+        logger.warning(f"Skipped {len(errors)} malformed quiz elements")
+        logger.debug(f"Malformed quiz elements: {errors}")
+    return items
+
+@traced("clean_quiz_questions")
+def clean_quiz_questions(parsed: list) -> list:
+    """Normalise parsed quiz items to {question, options, answer} and drop malformed ones"""
+    validated_questions = []
+    for q in parsed:
+        if not isinstance(q, dict):
+            continue
+            
+        # Ensure required fields exist
+        if 'question' not in q or 'options' not in q or 'answer' not in q:
+            continue
         
-        # Parse and validate JSON
-        parsed = json.loads(response)
+        # Clean and validate options
+        if not isinstance(q['options'], list) or len(q['options']) != 4:
+            continue
         
-        if not isinstance(parsed, list):
-            raise ValueError("Response is not a list")
+        # Clean options (remove A), B), etc.)
+        cleaned_options = []
+        for opt in q['options']:
+            cleaned_opt = re.sub(r'^[A-D]\)\s*', '', str(opt).strip())
+            cleaned_opt = re.sub(r'^[A-D][\.\)]\s*', '', cleaned_opt)
+            cleaned_options.append(cleaned_opt)
         
-        # Validate and clean each question
-        validated_questions = []
-        for i, q in enumerate(parsed):
-            if not isinstance(q, dict):
-                continue
-                
-            # Ensure required fields exist
-            if 'question' not in q or 'options' not in q or 'answer' not in q:
-                continue
-            
-            # Clean and validate options
-            if not isinstance(q['options'], list) or len(q['options']) != 4:
-                continue
-            
-            # Clean options (remove A), B), etc.)
-            cleaned_options = []
-            for opt in q['options']:
-                cleaned_opt = re.sub(r'^[A-D]\)\s*', '', str(opt).strip())
-                cleaned_opt = re.sub(r'^[A-D][\.\)]\s*', '', cleaned_opt)
-                cleaned_options.append(cleaned_opt)
-            
-            # Ensure answer matches one of the options
-            answer = str(q['answer']).strip()
-            answer = re.sub(r'^[A-D]\)\s*', '', answer)
-            answer = re.sub(r'^[A-D][\.\)]\s*', '', answer)
-            
-            if answer not in cleaned_options:
-                # Try to find the closest match
-                answer = cleaned_options[0]  # Default to first option
-            
-            validated_question = {
-                "question": str(q['question']).strip(),
-                "options": cleaned_options,
-                "answer": answer
-            }
-            
-            validated_questions.append(validated_question)
+        # Ensure answer matches one of the options
+        answer = str(q['answer']).strip()
+        answer = re.sub(r'^[A-D]\)\s*', '', answer)
+        answer = re.sub(r'^[A-D][\.\)]\s*', '', answer)
         
-        if len(validated_questions) == 0:
-            raise ValueError("No valid questions found")
+        if answer not in cleaned_options:
+            # Try to find the closest match
+            answer = cleaned_options[0]  # Default to first option
         
-        return json.dumps(validated_questions, indent=2)
+        validated_question = {
+            "question": str(q['question']).strip(),
+            "options": cleaned_options,
+            "answer": answer
+        }
         
-    except Exception as e:
-        print(f"Error in format_quiz: {str(e)}")
-        # Return safe default questions
-        default_questions = [
-            {
-                "question": "What is the result of 15 + 23?",
-                "options": ["38", "37", "39", "36"],
-                "answer": "38"
-            },
-            {
-                "question": "If a train travels 120 km in 2 hours, what is its speed?",
-                "options": ["50 km/h", "60 km/h", "70 km/h", "80 km/h"],
-                "answer": "60 km/h"
-            },
-            {
-                "question": "Choose the odd one out: Apple, Banana, Carrot, Mango",
-                "options": ["Apple", "Banana", "Carrot", "Mango"],
-                "answer": "Carrot"
-            }
-        ]
-        return json.dumps(default_questions)
\ No newline at end of file
+        validated_questions.append(validated_question)
+    return validated_questions
@@ -1,7 +1,23 @@
-from utils.gemini_langchain import get_gemini_model, get_prompt
+from utils.gemini_langchain import (get_gemini_model, get_prompt, acquire_gemini, aacquire_gemini,
+                                    estimate_tokens)
+from utils.metrics import traced
+from agents.vqar_quiz_formatter import (parse_quiz_stream, aparse_quiz_stream, clean_quiz_questions,
+                                        parse_raw_questions)
+from typing import AsyncIterator, Dict, Iterator, List, Tuple
 
-def vqar_search(company: str, experience: str):
-    """Generate company-specific aptitude questions"""
+# Quiz sections in display order: (name, topics, question count)
+VQAR_SECTIONS = [
+    ("Quantitative Aptitude", "arithmetic, algebra, geometry, data interpretation", 10),
+    ("Logical Reasoning", "patterns, sequences, analytical reasoning", 8),
+    ("Verbal Ability", "reading comprehension, grammar, vocabulary", 7)
+]
+
+# Approximate rendered prompt length, for rate limit token budgeting
+_PROMPT_CHARS = 1500
+_FULL_QUIZ_TOKENS = estimate_tokens(_PROMPT_CHARS, 25)
+
+def _build_profile(company: str, experience: str) -> Dict[str, str]:
+    """Resolve the company focus areas and difficulty used by the prompts"""
     
     # Company-specific question focus
     company_focus = {
@@ -26,6 +42,16 @@ def vqar_search(company: str, experience: str):
     
     difficulty = difficulty_map.get(experience, "intermediate level")
     
+    return {
+        "company": company,
+        "experience": experience,
+        "focus_area": focus_area,
+        "difficulty": difficulty
+    }
+
+def _vqar_search_chain():
+    """Build the prompt | model chain for the free-text question format"""
+    
     template = """
     Generate 25 high-quality aptitude questions specifically tailored for {company} placement interviews.
     
@@ -58,12 +84,147 @@ def vqar_search(company: str, experience: str):
     Generate exactly 25 questions following this format.
     """
     
+    prompt = get_prompt(template)
+    return prompt | get_gemini_model()
+
+@traced("vqar_search")
+def vqar_search(company: str, experience: str):
+    """Generate company-specific aptitude questions"""
+    acquire_gemini(_FULL_QUIZ_TOKENS)
+    return _vqar_search_chain().invoke(_build_profile(company, experience)).content
+
+def vqar_search_stream(company: str, experience: str) -> Iterator[str]:
+    """Generate company-specific aptitude questions, yielding text chunks as the model produces them"""
+    acquire_gemini(_FULL_QUIZ_TOKENS)
+    for chunk in _vqar_search_chain().stream(_build_profile(company, experience)):
+        if chunk.content:
+            yield chunk.content
+
+@traced("vqar_search")
+async def avqar_search(company: str, experience: str):
+    """Async vqar_search; cancelling the awaiting task aborts the model call"""
+    await aacquire_gemini(_FULL_QUIZ_TOKENS)
+    return (await _vqar_search_chain().ainvoke(_build_profile(company, experience))).content
+
+async def avqar_search_stream(company: str, experience: str) -> AsyncIterator[str]:
+    """Async vqar_search_stream"""
+    await aacquire_gemini(_FULL_QUIZ_TOKENS)
+    async for chunk in _vqar_search_chain().astream(_build_profile(company, experience)):
+        if chunk.content:
+            yield chunk.content
+
+def _vqar_structured_chain():
+    """Build the prompt | model chain that answers with a JSON array"""
+
+    template = """
+    Generate 25 high-quality aptitude questions specifically tailored for {company} placement interviews.
+
+    Candidate Profile:
+    - Experience Level: {experience}
+    - Target Company: {company}
+    - Focus Areas: {focus_area}
+    - Difficulty: {difficulty}
+
+    Question Distribution:
+    - 10 Quantitative Aptitude questions (arithmetic, algebra, geometry, data interpretation)
+    - 8 Logical Reasoning questions (patterns, sequences, analytical reasoning)
+    - 7 Verbal Ability questions (reading comprehension, grammar, vocabulary)
+
+    Requirements:
+    - Each question should be clear and unambiguous
+    - Include realistic scenarios relevant to {company}'s domain when possible
+    - Ensure questions are at {difficulty}
+    - Questions should be solvable within 1-2 minutes each
+    - Avoid overly complex calculations without calculators
+
+    OUTPUT FORMAT:
+    Return ONLY a valid JSON array, no other text. Each element must be:
+    {{
+        "question": "Clear question text without numbering",
+        "options": ["Option text 1", "Option text 2", "Option text 3", "Option text 4"],
+        "answer": "Exact option text that matches one of the 4 options"
+    }}
+
+    Generate exactly 25 questions following this format.
+    """
+
+    prompt = get_prompt(template)
+    return prompt | get_gemini_model()
+
+@traced("vqar_generate_structured")
+def vqar_generate_structured(company: str, experience: str) -> List[Dict]:
+    """Generate company-specific aptitude questions as validated JSON in a single model call"""
+    chain = _vqar_structured_chain()
+    acquire_gemini(_FULL_QUIZ_TOKENS)
+    response = (chunk.content for chunk in chain.stream(_build_profile(company, experience)))
+    questions = clean_quiz_questions(parse_quiz_stream(response))
+    if not questions:
+        raise ValueError("No valid questions found in structured response")
+    return questions
+
+@traced("vqar_generate_structured")
+async def avqar_generate_structured(company: str, experience: str) -> List[Dict]:
+    """Async vqar_generate_structured"""
+    chain = _vqar_structured_chain()
+    await aacquire_gemini(_FULL_QUIZ_TOKENS)
+    response = (chunk.content async for chunk in chain.astream(_build_profile(company, experience)))
+    questions = clean_quiz_questions(await aparse_quiz_stream(response))
+    if not questions:
+        raise ValueError("No valid questions found in structured response")
+    return questions
+
+def _vqar_section_chain(company: str, experience: str, section: str) -> Tuple:
+    """Build the chain, prompt inputs and question count for one quiz section"""
+    
+    topics, count = next((t, c) for name, t, c in VQAR_SECTIONS if name == section)
+    
+    template = """
+    Generate {count} high-quality {section} questions specifically tailored for {company} placement interviews.
+    
+    Candidate Profile:
+    - Experience Level: {experience}
+    - Target Company: {company}
+    - Focus Areas: {focus_area}
+    - Difficulty: {difficulty}
+    - Topics: {topics}
+    
+    Requirements:
+    - Each question should be clear and unambiguous
+    - Include realistic scenarios relevant to {company}'s domain when possible
+    - Ensure questions are at {difficulty}
+    - Questions should be solvable within 1-2 minutes each
+    - Avoid overly complex calculations without calculators
+    
+    Format each question as:
+    Question: [Clear question statement]
+    A) [Option 1]
+    B) [Option 2]
+    C) [Option 3]
+    D) [Option 4]
+    Answer: [Correct option letter]
+    
+    Generate exactly {count} questions following this format.
+    """
+    
     prompt = get_prompt(template)
     chain = prompt | get_gemini_model()
     
-    return chain.invoke({
-        "company": company,
-        "experience": experience,
-        "focus_area": focus_area,
-        "difficulty": difficulty
-    }).content
\ No newline at end of file
+    inputs = _build_profile(company, experience)
+    inputs.update({"section": section, "topics": topics, "count": count})
+    return chain, inputs, count
+
+@traced("vqar_search_section")
+def vqar_search_section(company: str, experience: str, section: str) -> List[Dict]:
+    """Generate and parse one section of the aptitude quiz, so sections can run in parallel"""
+    chain, inputs, count = _vqar_section_chain(company, experience, section)
+    acquire_gemini(estimate_tokens(_PROMPT_CHARS, count))
+    questions, _ = parse_raw_questions(chain.invoke(inputs).content)
+    return questions[:count]
+
+@traced("vqar_search_section")
+async def avqar_search_section(company: str, experience: str, section: str) -> List[Dict]:
+    """Async vqar_search_section"""
+    chain, inputs, count = _vqar_section_chain(company, experience, section)
+    await aacquire_gemini(estimate_tokens(_PROMPT_CHARS, count))
+    questions, _ = parse_raw_questions((await chain.ainvoke(inputs)).content)
+    return questions[:count]
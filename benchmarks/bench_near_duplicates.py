@@ -0,0 +1,131 @@
+"""
+Near-duplicate lookup latency and accuracy for a question bank of
+tens of thousands of questions.
+
+The bank is filled with distinct synthetic questions built from a few
+common aptitude shapes with varied wording. Two kinds of probe
+are then timed against it. Near-duplicate probes are bank questions with new
+numbers and one word changed; they should be found. Fresh probes are
+unseen questions; they should not match. Signatures are computed cold for
+every probe, so the timings include hashing.
+
+A last check runs dedupe_questions over distinct numeric questions (series,
+equations, percentages) whose wording is nearly identical and whose numbers
+differ; none of them should be dropped.
+
+Run from the repository root:
+    python -m benchmarks.bench_near_duplicates [--bank N] [--probes N]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from utils.question_similarity import MinHashIndex, dedupe_questions, signature
+
+_SHAPES = [
+    "A {0} {1} {2} m long passes a {3} {4} in {5} seconds. What is the speed of the {0} in km/h?",
+    "A {0} sells a {1} {2} for Rs. {3} at a profit of {4}%. Find the cost price of the {2}.",
+    "Pipes {0} and {1} can fill the {2} {3} in {4} and {5} hours. How long do they take together?",
+    "Choose the word most similar in meaning to {0}. A) {1} B) {2} C) {3} D) {4}",
+    "If all {0} are {1} and some {1} are {2}, which conclusion about {3} follows?",
+    "{0} is {1} years older than {2}. In {3} years the ratio of their ages at the {4} will be {5}:4. Find {2}'s age.",
+    "Find the odd one out: {0}, {1}, {2}, {3}, {4}",
+    "A {0} walks {1} km towards the {2}, turns towards the {3} and walks {4} km. How far is the {5} from the start?"
+]
+
+def _vocabulary(rng: random.Random, size: int = 3000) -> list:
+    syllables = "ka lo mi ne ru ta vo shi en dar gil mor pen quo sel tir um ver wal yen".split()
+    return ["".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(size)]
+
+def build_questions(count: int, seed: int) -> list:
+    """Distinct aptitude-style questions: a few shapes, varied wording and numbers"""
+    rng = random.Random(seed)
+    vocabulary = _vocabulary(random.Random(0))
+    questions = []
+    for _ in range(count):
+        shape = rng.choice(_SHAPES)
+        fillers = [rng.choice(vocabulary) if rng.random() < 0.7 else str(rng.randint(2, 500)) for _ in range(6)]
+        questions.append(shape.format(*fillers) + " " + " ".join(rng.sample(vocabulary, 12)))
+    return questions
+
+def _numeric_question(rng: random.Random) -> tuple:
+    """A short quant or series question and its answer"""
+    kind = rng.randrange(5)
+    if kind == 0:
+        start, step = rng.randint(1, 20), rng.randint(2, 9)
+        series = [start + step * i for i in range(5)]
+        return f"Find the next number: {', '.join(map(str, series))}, ?", start + step * 5
+    if kind == 1:
+        start, ratio = rng.randint(1, 5), rng.randint(2, 4)
+        series = [start * ratio ** i for i in range(4)]
+        return f"Find the next number: {', '.join(map(str, series))}, ?", start * ratio ** 4
+    if kind == 2:
+        a, x, b = rng.randint(2, 9), rng.randint(1, 15), rng.randint(1, 30)
+        return f"If {a}x + {b} = {a * x + b}, what is x?", x
+    if kind == 3:
+        percent, whole = rng.choice([5, 10, 15, 20, 25, 40, 50, 75]), rng.randint(2, 60) * 20
+        return f"What is {percent}% of {whole}?", percent * whole // 100
+    values = [rng.randint(1, 99) for _ in range(4)]
+    return f"What is the sum of {', '.join(map(str, values))}?", sum(values)
+
+def numeric_questions(count: int, seed: int) -> list:
+    """Distinct numeric questions with numeric options, as the quant and series sections produce"""
+    rng = random.Random(seed)
+    questions = {}
+    while len(questions) < count:
+        stem, answer = _numeric_question(rng)
+        options = [str(answer)] + [str(answer + delta) for delta in rng.sample([-3, -2, -1, 1, 2, 3, 5], 3)]
+        rng.shuffle(options)
+        questions.setdefault(stem, {"question": stem, "options": options, "answer": str(answer)})
+    return list(questions.values())
+
+def near_duplicate(text: str, rng: random.Random) -> str:
+    words = [str(rng.randint(2, 999)) if w.isdigit() else w for w in text.split()]
+    words[rng.randrange(len(words))] = "altered"
+    return " ".join(words)
+
+def time_queries(index: MinHashIndex, probes: list) -> tuple:
+    timings, found = [], 0
+    for probe in probes:
+        start = time.perf_counter()
+        match = index.find(probe)
+        timings.append(time.perf_counter() - start)
+        found += match is not None
+    return timings, found
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--bank", type=int, default=30000)
+    arg_parser.add_argument("--probes", type=int, default=2000)
+    arg_parser.add_argument("--quizzes", type=int, default=200, help="quizzes of 25 distinct numeric questions")
+    args = arg_parser.parse_args()
+
+    rng = random.Random(3)
+    bank = build_questions(args.bank, seed=1)
+    index = MinHashIndex()
+    start = time.perf_counter()
+    for i, text in enumerate(bank):
+        index.add(i, text)
+    build = time.perf_counter() - start
+    signature.cache_clear()
+
+    print(f"bank of {len(index)} questions built in {build:.1f}s ({build * 1e6 / len(index):.0f} us/question)")
+    corpora = [
+        ("near-duplicate", [near_duplicate(t, rng) for t in rng.sample(bank, args.probes)], "found"),
+        ("fresh", build_questions(args.probes, seed=2), "false matches")
+    ]
+    for name, probes, outcome in corpora:
+        timings, found = time_queries(index, probes)
+        timings.sort()
+        print(f"  {name:<15} p50 {statistics.median(timings) * 1e6:7.1f} us   "
+              f"p99 {timings[int(len(timings) * 0.99)] * 1e6:7.1f} us   {outcome}: {found / len(probes):.1%}")
+
+    # Distinct numeric questions must survive deduplication
+    numeric = numeric_questions(args.quizzes * 25, seed=4)
+    dropped = sum(25 - len(dedupe_questions(numeric[i:i + 25])) for i in range(0, len(numeric), 25))
+    print(f"  {'numeric':<15} {args.quizzes} quizzes of 25 distinct questions   dropped: "
+          f"{dropped / len(numeric):.1%}")
+
+if __name__ == "__main__":
+    main()
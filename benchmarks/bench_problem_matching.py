@@ -0,0 +1,112 @@
+"""
+Compare the Aho-Corasick find_leetcode_problem against the previous
+per-keyword substring scan, after checking both pick the same problem.
+
+Two corpora are timed: problem statements like the ones the app matches,
+and synthetic keyword-dense texts where almost every position ends a
+keyword (the automaton's worst case). Times are the best of --repeat runs.
+find_leetcode_problems is a wrapper over the per-text call, timed to show
+it adds no speedup on distinct texts.
+
+Run from the repository root:
+    python -m benchmarks.bench_problem_matching [--texts N] [--repeat N]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.suite import PROBLEM_TEXTS
+from utils.problem_matching import LEETCODE_PROBLEM_MAP, find_leetcode_problem, find_leetcode_problems
+
+_LEGACY_FALLBACKS = [
+    (["array", "sum", "two"], "https://leetcode.com/problems/two-sum/"),
+    (["linked", "list", "node"], "https://leetcode.com/problems/reverse-linked-list/"),
+    (["tree", "binary", "traversal"], "https://leetcode.com/problems/binary-tree-inorder-traversal/"),
+    (["sort", "merge", "quick", "heap"], "https://leetcode.com/problems/sort-an-array/"),
+    (["search", "binary", "find"], "https://leetcode.com/problems/binary-search/"),
+    (["string", "substring", "character"], "https://leetcode.com/problems/longest-substring-without-repeating-characters/"),
+    (["palindrome", "palindromic"], "https://leetcode.com/problems/valid-palindrome/"),
+    (["parenthes", "bracket", "valid"], "https://leetcode.com/problems/valid-parentheses/"),
+    (["graph", "island", "connected"], "https://leetcode.com/problems/number-of-islands/"),
+    (["dynamic", "dp", "fibonacci", "stairs"], "https://leetcode.com/problems/climbing-stairs/"),
+    (["stack", "queue", "push", "pop"], "https://leetcode.com/problems/min-stack/"),
+    (["hash", "map", "frequency"], "https://leetcode.com/problems/two-sum/")
+]
+
+def legacy_find_leetcode_problem(problem_text):
+    """The linear keyword scan find_leetcode_problem used before the automaton"""
+    problem_text_lower = problem_text.lower()
+    best_match = None
+    best_score = 0
+    for keyword, leetcode_slug in LEETCODE_PROBLEM_MAP.items():
+        if keyword in problem_text_lower:
+            score = len(keyword)
+            if problem_text_lower.startswith(keyword):
+                score += 10
+            if score > best_score:
+                best_score = score
+                best_match = leetcode_slug
+    if best_match:
+        return f"https://leetcode.com/problems/{best_match}/"
+    for words, url in _LEGACY_FALLBACKS:
+        if any(word in problem_text_lower for word in words):
+            return url
+    return "https://leetcode.com/problemset/algorithms/"
+
+def build_texts(count: int, seed: int = 7) -> list:
+    """Keyword-dense texts mixing map keywords, fallback words and filler"""
+    rng = random.Random(seed)
+    vocabulary = (list(LEETCODE_PROBLEM_MAP) + [w for words, _ in _LEGACY_FALLBACKS for w in words] +
+                  "given return the of an a integer each value input output such that we you must".split())
+    texts = []
+    while len(texts) < count:
+        words = rng.choices(vocabulary, k=rng.randint(4, 40))
+        if rng.random() < 0.3:
+            # Filler only, so the fallback and default branches are exercised too
+            words = [w for w in words if " " not in w and w not in LEETCODE_PROBLEM_MAP]
+        text = " ".join(words)
+        texts.append(text.capitalize() if rng.random() < 0.5 else text.upper())
+    return texts[:count]
+
+def time_it(fn, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--texts", type=int, default=5000)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    corpora = [
+        ("problem statements", (PROBLEM_TEXTS * (args.texts // len(PROBLEM_TEXTS) + 1))[:args.texts]),
+        ("keyword-dense", build_texts(args.texts))
+    ]
+    for name, texts in corpora:
+        expected = [legacy_find_leetcode_problem(t) for t in texts]
+        assert [find_leetcode_problem(t) for t in texts] == expected, name
+        assert find_leetcode_problems(texts) == expected, name
+
+    print(f"find_leetcode_problem over {len(LEETCODE_PROBLEM_MAP)} keywords, best of {args.repeat} runs")
+    for name, texts in corpora:
+        print(f"{name}: {len(texts)} texts, mean {statistics.mean(map(len, texts)):.0f} chars")
+        # Distinct copies so the wrapper cannot skip repeated texts
+        unique = [f"{t} #{i}" for i, t in enumerate(texts)]
+        runs = [
+            ("linear scan", lambda: [legacy_find_leetcode_problem(t) for t in unique]),
+            ("automaton", lambda: [find_leetcode_problem(t) for t in unique]),
+            ("batch wrapper", lambda: find_leetcode_problems(unique))
+        ]
+        baseline = None
+        for label, fn in runs:
+            best = min(time_it(fn, args.repeat))
+            baseline = baseline or best
+            print(f"  {label:<16} {best * 1e6 / len(texts):8.2f} us/text   {baseline / best:5.2f}x")
+
+if __name__ == "__main__":
+    main()
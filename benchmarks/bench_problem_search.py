@@ -0,0 +1,74 @@
+"""
+Compare ProblemCatalog.search against the loop it replaces: walking every
+company list and tagging each title with extract_problem_concepts.
+
+The scan can only filter on concepts the tagger finds in titles, so its
+results differ from the curated catalog concepts; only timings are compared.
+
+Run from the repository root:
+    python -m benchmarks.bench_problem_search [--queries N] [--repeat N]
+"""
+import argparse
+import random
+import time
+
+from utils.problem_catalog import get_problem_catalog
+from utils.problem_matching import extract_problem_concepts
+
+def scan_search(catalog, concepts, difficulty, companies):
+    """Per-query scan over every company's list, as callers had to do before the index"""
+    results = {}
+    for company in catalog.by_company:
+        for question in catalog.company_questions(company):
+            problem = catalog.get(question["url"].rstrip("/").rsplit("/", 1)[-1])
+            if not all(c in problem.companies for c in companies):
+                continue
+            if difficulty and problem.difficulty not in difficulty:
+                continue
+            if not set(concepts) <= set(extract_problem_concepts(question["title"])):
+                continue
+            results[problem.slug] = problem
+    return list(results.values())
+
+def build_queries(catalog, count: int, seed: int = 5) -> list:
+    rng = random.Random(seed)
+    facets = catalog.facets()
+    return [
+        (rng.sample(facets["concepts"], rng.randint(0, 2)),
+         rng.sample(facets["difficulties"], rng.randint(0, 1)),
+         rng.sample(facets["companies"], rng.randint(1, 2)))
+        for _ in range(count)
+    ]
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--queries", type=int, default=2000)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    catalog = get_problem_catalog()
+    queries = build_queries(catalog, args.queries)
+    hits = sum(len(catalog.search(concepts=c, difficulty=d, companies=co)) for c, d, co in queries)
+
+    print(f"{len(queries)} queries over {len(catalog.problems)} problems, "
+          f"{hits / len(queries):.1f} results per query, best of {args.repeat} runs")
+    runs = [
+        ("scan + tagging", lambda: [scan_search(catalog, c, d, co) for c, d, co in queries]),
+        ("inverted index", lambda: [catalog.search(concepts=c, difficulty=d, companies=co) for c, d, co in queries])
+    ]
+    baseline = None
+    for label, fn in runs:
+        best = best_of(fn, args.repeat)
+        baseline = baseline or best
+        print(f"  {label:<16} {best * 1e6 / len(queries):8.2f} us/query   {baseline / best:6.1f}x")
+
+if __name__ == "__main__":
+    main()
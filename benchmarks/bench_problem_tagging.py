@@ -0,0 +1,109 @@
+"""
+Compare the compiled concept/difficulty tagger against the previous
+per-call substring scans, on a large list of distinct problem texts.
+
+Also reports how often the labels differ: the tagger matches whole words,
+so substring hits such as "or" inside "for" (Bit Manipulation) or "sum"
+inside "summary" (Array) are expected to disappear. Some texts carry real
+bit manipulation wording, and how many of those are still tagged is
+reported separately.
+
+Run from the repository root:
+    python -m benchmarks.bench_problem_tagging [--texts N] [--repeat N]
+"""
+import argparse
+import random
+import time
+from collections import Counter
+
+from benchmarks.suite import PROBLEM_TEXTS
+from utils.problem_matching import CONCEPT_KEYWORDS, tag_problem, tag_problems
+
+# Mixed into the corpus so Bit Manipulation is exercised by real bitwise wording
+BIT_SENTENCES = [
+    "Every element appears twice except for one; find that single one using xor",
+    "Count the number of set bits in the binary representation of each number up to n",
+    "Enumerate every subset of the input with a bitmask",
+    "Return true if n is a power of two",
+    "Compute the Hamming distance between two integers",
+    "Reverse the bits of a 32-bit unsigned integer with shifts"
+]
+
+_LEGACY_CONCEPT_MAP = dict(CONCEPT_KEYWORDS, **{"Bit Manipulation": ["bit", "xor", "and", "or", "shift", "binary", "power of 2"]})
+
+def legacy_extract_problem_concepts(question_text):
+    """extract_problem_concepts as it was before the tagger"""
+    concepts = []
+    question_lower = question_text.lower()
+    concept_map = {concept: list(keywords) for concept, keywords in _LEGACY_CONCEPT_MAP.items()}
+    for concept, keywords in concept_map.items():
+        if any(keyword in question_lower for keyword in keywords):
+            concepts.append(concept)
+    return concepts if concepts else ["General Algorithm"]
+
+def legacy_get_difficulty_from_text(question_text):
+    """get_difficulty_from_text as it was before the tagger"""
+    question_lower = question_text.lower()
+    hard_indicators = ["complex", "advanced", "optimize", "minimum time", "maximum efficiency",
+                      "hard", "challenging", "difficult", "expert", "o(log n)", "divide and conquer"]
+    easy_indicators = ["simple", "basic", "easy", "straightforward", "beginner", "introduction",
+                      "find", "check", "validate", "single pass"]
+    hard_score = sum(1 for indicator in hard_indicators if indicator in question_lower)
+    easy_score = sum(1 for indicator in easy_indicators if indicator in question_lower)
+    if hard_score > easy_score and hard_score > 0:
+        return "Hard"
+    elif easy_score > 0:
+        return "Easy"
+    return "Medium"
+
+def build_texts(count: int, seed: int = 11) -> list:
+    """Distinct problem statements: the suite's samples recombined sentence by sentence"""
+    rng = random.Random(seed)
+    sentences = [s.strip() for text in PROBLEM_TEXTS for s in text.split(". ") if s.strip()] + BIT_SENTENCES
+    return [" ".join(rng.sample(sentences, rng.randint(1, 4))) + f" (variant {i})" for i in range(count)]
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--texts", type=int, default=20000)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    texts = build_texts(args.texts)
+    batch = tag_problems(texts)
+    assert batch == [tag_problem(t) for t in texts]
+
+    legacy = [(legacy_extract_problem_concepts(t), legacy_get_difficulty_from_text(t)) for t in texts]
+    dropped, added = Counter(), Counter()
+    for (concepts, difficulty), tags in zip(legacy, batch):
+        dropped.update(set(concepts) - set(tags["concepts"]))
+        added.update(set(tags["concepts"]) - set(concepts))
+    with_bits = [tags for text, tags in zip(texts, batch) if any(s in text for s in BIT_SENTENCES)]
+    same = sum(1 for (c, d), tags in zip(legacy, batch) if c == tags["concepts"] and d == tags["difficulty"])
+
+    print(f"{len(texts)} distinct problem texts, best of {args.repeat} runs")
+    runs = [
+        ("substring scans", lambda: [(legacy_extract_problem_concepts(t), legacy_get_difficulty_from_text(t)) for t in texts]),
+        ("tag_problem", lambda: [tag_problem(t) for t in texts]),
+        ("tag_problems", lambda: tag_problems(texts))
+    ]
+    baseline = None
+    for label, fn in runs:
+        best = best_of(fn, args.repeat)
+        baseline = baseline or best
+        print(f"  {label:<16} {best * 1e6 / len(texts):8.2f} us/text   {baseline / best:5.2f}x")
+    print(f"identical labels: {same / len(texts):.1%}")
+    print(f"  labels no longer applied: {dict(dropped.most_common(5))}")
+    print(f"  labels newly applied:     {dict(added.most_common(5))}")
+    print(f"Bit Manipulation on texts with bitwise wording: "
+          f"{sum('Bit Manipulation' in tags['concepts'] for tags in with_bits)}/{len(with_bits)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compare wall-clock time of one 25-question VQAR call against the parallel
+per-section fan-out, using a fake model whose latency grows with output length.
+
+Run from the repository root:
+    python -m benchmarks.bench_sectioned_vqar [--runs N] [--per-question SECONDS]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+os.environ.setdefault("QUIZ_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "bench.sqlite3"))
+# Measure generation latency, not the client-side quota
+os.environ.setdefault("GEMINI_RPM", "0")
+os.environ.setdefault("GEMINI_TPM", "0")
+
+import agents.vqar_search as vqar_search_module
+from agents.controller import QuestionController
+from benchmarks.fakes import make_fake_gemini
+
+def time_mode(mode: str, runs: int) -> list:
+    controller = QuestionController(company="Amazon")
+    controller.vqar_mode = mode
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = controller.generate_questions("Amazon", "fresher", "VQAR", num_questions=25, force_refresh=True)
+        timings.append(time.perf_counter() - start)
+        assert result['status'] == 'success' and len(result['questions']) == 25, result.get('message')
+        assert result['path'] == mode, result['path']
+    return timings
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--runs", type=int, default=5)
+    arg_parser.add_argument("--base", type=float, default=0.05, help="fixed latency per call (s)")
+    arg_parser.add_argument("--per-question", type=float, default=0.02, help="latency per generated question (s)")
+    args = arg_parser.parse_args()
+
+    vqar_search_module.get_gemini_model = make_fake_gemini(args.base, args.per_question)
+
+    print(f"25-question VQAR quiz, fake model: {args.base}s + {args.per_question}s/question, {args.runs} runs")
+    for mode in ("two_step", "sectioned"):
+        timings = time_mode(mode, args.runs)
+        print(f"  {mode:<10} median {statistics.median(timings) * 1000:8.1f} ms   max {max(timings) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
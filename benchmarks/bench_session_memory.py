@@ -0,0 +1,100 @@
+"""
+Per-session memory held by a finished aptitude quiz in st.session_state,
+with the previous dict-based layout, with the slotted records and with
+the records kept once in the shared quiz store.
+
+Each simulated session parses its own copy of a cached quiz (as every
+session does when served from the quiz cache), keeps the requested number
+of questions, answers all of them and holds on to the state. Memory is
+measured with tracemalloc while --sessions sessions are alive.
+
+Run from the repository root:
+    python -m benchmarks.bench_session_memory [--sessions N] [--questions N]
+"""
+import argparse
+import functools
+import gc
+import json
+import tracemalloc
+
+from benchmarks.fakes import fake_question_json
+from utils.quiz_records import QuizAnswer, result_summary, to_records
+from utils.quiz_store import QuizStore
+
+def controller_result(payload: str) -> dict:
+    """A successful controller result as the UI receives it"""
+    return {
+        "status": "success",
+        "message": "",
+        "questions": json.loads(payload),
+        "source": "cache",
+        "usage": {"calls": 0, "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0,
+                  "session": "3f2b6c1e-8a4d-4f57-9c0e-2d7a1b5e9f13", "company": "Amazon",
+                  "category": "VQAR", "source": "cache"}
+    }
+
+def legacy_session(payload: str, count: int) -> dict:
+    """Quiz state as kept before the records: dict questions and answers, the full controller result"""
+    result = controller_result(payload)
+    questions = result["questions"][:count]
+    answers = [{
+        "question": q["question"],
+        "selected": q["options"][i % 4],
+        "correct": q["answer"],
+        "result": q["options"][i % 4] == q["answer"]
+    } for i, q in enumerate(questions)]
+    return {"questions": questions, "current": count - 1, "score": sum(a["result"] for a in answers),
+            "answers": answers, "done": True, "generated": True, "start_time": 0.0,
+            "raw_response": result, "stream": None}
+
+def record_session(payload: str, count: int) -> dict:
+    """Quiz state as kept now: slotted records, index-based answers, the result without its questions"""
+    result = controller_result(payload)
+    questions = to_records(result["questions"][:count])
+    answers = [QuizAnswer.for_question(i, q, q.options[i % 4]) for i, q in enumerate(questions)]
+    return {"questions": questions, "current": count - 1, "score": sum(a.correct for a in answers),
+            "answers": answers, "done": True, "generated": True, "start_time": 0.0,
+            "raw_response": result_summary(result), "stream": None}
+
+def stored_session(store: QuizStore, payload: str, count: int) -> dict:
+    """Quiz state with the records in the shared store: the session keeps a reference and its progress"""
+    result = controller_result(payload)
+    questions = to_records(result["questions"][:count])
+    ref = store.put(questions)
+    answers = [QuizAnswer.for_question(i, q, q.options[i % 4]) for i, q in enumerate(questions)]
+    return {"questions": [], "quiz_ref": ref, "current": count - 1, "score": sum(a.correct for a in answers),
+            "answers": answers, "done": True, "generated": True, "start_time": 0.0,
+            "raw_response": result_summary(result), "stream": None, "stream_metrics": None}
+
+def measure(build, payload: str, sessions: int, count: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = [build(payload, count) for _ in range(sessions)]
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del held
+    return used
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--sessions", type=int, default=1000)
+    arg_parser.add_argument("--questions", type=int, default=15, help="questions per quiz (the UI default)")
+    arg_parser.add_argument("--generated", type=int, default=25, help="questions in the cached set")
+    args = arg_parser.parse_args()
+
+    payload = fake_question_json(args.generated)
+    # Warm up interning and allocator pools so neither run pays one-off costs
+    measure(record_session, payload, 10, args.questions)
+
+    print(f"{args.sessions} sessions, {args.questions} of {args.generated} cached questions each")
+    baseline = None
+    for label, build in (("dict state", legacy_session), ("slotted records", record_session),
+                         ("shared store", functools.partial(stored_session, QuizStore()))):
+        per_session = measure(build, payload, args.sessions, args.questions) / args.sessions
+        baseline = baseline or per_session
+        print(f"  {label:<16} {per_session / 1024:7.1f} KB/session   {per_session / baseline:6.1%}")
+
+if __name__ == "__main__":
+    main()
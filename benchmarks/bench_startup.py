@@ -0,0 +1,98 @@
+"""
+Cold start of a fresh Streamlit worker: the time to import everything
+ui/streamlit_app.py imports, and the modules that time goes to.
+
+Every run starts a new interpreter with -X importtime and imports
+streamlit plus the app's modules, which are read from the script so the
+list stays in sync with it. The app's share is measured within the same
+run: the cumulative time of the top-level imports that a bare
+`import streamlit` does not already load. Model and HTTP client libraries must not load at
+startup; they are imported by the first Gemini call or Tavily search.
+
+Exits non-zero when the app's share (best run) exceeds --target-ms or a
+deferred module was imported, so it can gate changes.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup [--runs N] [--top N] [--target-ms MS]
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+import time
+
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ui", "streamlit_app.py")
+
+# Imported on first use of the path that needs them, never by the app at startup
+DEFERRED_MODULES = ("google.generativeai", "langchain_google_genai", "langchain_core", "langsmith",
+                    "aiohttp", "requests")
+
+def app_imports(path: str = APP_SCRIPT) -> list:
+    """Modules the app script imports at module level"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and not node.level:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+def start_worker(modules: list) -> tuple:
+    """Import streamlit and `modules` in a fresh interpreter; returns (wall seconds, {module: (depth, cumulative us)})"""
+    code = "".join(f"import {module}\n" for module in ["streamlit"] + modules)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented by two spaces per level
+        timings[name.strip()] = ((len(name) - len(name.lstrip()) - 1) // 2, int(cumulative))
+    return wall, timings
+
+def import_ms(timings: dict, exclude=()) -> float:
+    """Cumulative time of the top-level imports, leaving out modules in `exclude`"""
+    return sum(cumulative for name, (depth, cumulative) in timings.items()
+               if depth == 0 and name not in exclude) / 1000
+
+def best_of(runs: int, modules: list, exclude=()) -> tuple:
+    results = [start_worker(modules) for _ in range(runs)]
+    return min(results, key=lambda r: import_ms(r[1], exclude))
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--runs", type=int, default=5)
+    arg_parser.add_argument("--top", type=int, default=15, help="slowest app imports to list")
+    arg_parser.add_argument("--target-ms", type=float, default=250,
+                            help="budget for the app's imports on top of streamlit")
+    args = arg_parser.parse_args()
+
+    modules = app_imports()
+    # Only the module names matter here, which one bare run gives
+    _, bare = start_worker([])
+    wall, timings = best_of(args.runs, modules, exclude=bare)
+    app_ms = import_ms(timings, exclude=bare)
+
+    print(f"fresh worker, best of {args.runs}: {wall * 1000:.0f} ms wall, "
+          f"{import_ms(timings) - app_ms:.0f} ms streamlit + {app_ms:.0f} ms app imports "
+          f"(target {args.target_ms:.0f} ms)")
+    added = sorted(((cumulative, depth, name) for name, (depth, cumulative) in timings.items() if name not in bare),
+                   reverse=True)
+    print("\nslowest imports on top of streamlit:")
+    for cumulative, depth, name in added[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {'  ' * depth}{name}")
+
+    loaded = [name for name in DEFERRED_MODULES if name in timings and name not in bare]
+    if loaded:
+        print(f"\ndeferred modules imported at startup: {', '.join(loaded)}")
+    if loaded or app_ms > args.target_ms:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
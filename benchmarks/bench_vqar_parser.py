@@ -0,0 +1,55 @@
+"""
+Benchmark the local VQAR parser on 25-question batches.
+
+Run from the repository root:
+    python -m benchmarks.bench_vqar_parser [--iterations N]
+"""
+import argparse
+import statistics
+import time
+
+from agents.vqar_quiz_formatter import parse_raw_questions
+
+def build_batch(num_questions: int = 25) -> str:
+    """Build raw vqar_search-style output with the formatting variants seen in practice"""
+    blocks = ["Here are 25 aptitude questions:\n", "**Quantitative Aptitude**\n"]
+    for i in range(1, num_questions + 1):
+        if i % 3 == 0:
+            blocks.append(
+                f"**Question {i}:** A shop sells item {i} for Rs. {i * 40} at a {i}% profit. "
+                f"What was the cost price?\n"
+                f"a. Rs. {i * 30}\nb. Rs. {i * 35}\nc. Rs. {i * 38}\nd. Rs. {i * 39}\n"
+                f"**Answer:** (C) Rs. {i * 38}\n"
+            )
+        else:
+            blocks.append(
+                f"{i}. Question: If a train travels {i * 60} km in {i} hours,\n"
+                f"what is its average speed?\n"
+                f"A) 50 km/h\nB) 60 km/h \nC) 70 km/h\nD) 80 km/h\n"
+                f"Answer: B\n"
+            )
+    return "\n".join(blocks)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--iterations", type=int, default=2000)
+    args = arg_parser.parse_args()
+
+    raw = build_batch()
+    parsed, unparsed = parse_raw_questions(raw)
+    assert len(parsed) == 25 and not unparsed, (len(parsed), unparsed)
+
+    timings = []
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        parse_raw_questions(raw)
+        timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    print(f"parse_raw_questions: 25-question batch ({len(raw)} chars), {args.iterations} iterations")
+    print(f"  mean  {statistics.mean(timings) * 1e6:8.1f} us/batch")
+    print(f"  p50   {timings[len(timings) // 2] * 1e6:8.1f} us/batch")
+    print(f"  p99   {timings[int(len(timings) * 0.99)] * 1e6:8.1f} us/batch")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Local stand-ins for Gemini and Tavily used by the benchmarks.
+
+The fake model answers in the same text format vqar_search asks for (or as
+a JSON array when the prompt asks for one) and sleeps in proportion to the
+number of questions requested, so latency scales with output length the way
+a real completion does. The fake Tavily server answers /search over local
+HTTP with LeetCode-style results of configurable count and size.
+"""
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+_COUNT_RE = re.compile(r'Generate exactly (\d+)')
+_STEM_WORDS = ("train bus cyclist boat runner truck convoy ferry tram courier scooter caravan glider rocket "
+               "northern eastern coastal hilly crowded quiet narrow winding flooded frozen dusty sunny "
+               "bridge tunnel canal valley market harbour station airport village campus forest desert "
+               "red blue green amber silver golden early late morning evening winter summer "
+               "old new long short heavy light slow steady loaded empty rented private").split()
+
+def _fake_stem(i: int, seed: int) -> str:
+    """Distinct wording per question, so near-duplicate filtering keeps every fake question"""
+    words = random.Random(seed * 100003 + i).sample(_STEM_WORDS, 12)
+    return f"If a {' '.join(words[:4])} crosses the {' '.join(words[4:8])} and {' '.join(words[8:])}"
+
+def fake_question_text(count: int, offset: int = 0, padding: int = 0, seed: int = 0) -> str:
+    """Render `count` questions in the Question / A)-D) / Answer format"""
+    filler = " Consider the scenario carefully." * (padding // 32)
+    blocks = []
+    for i in range(offset + 1, offset + count + 1):
+        blocks.append(
+            f"{i}. Question: {_fake_stem(i, seed)} in {i} hours covering {i * 60} km, what is its average speed?{filler}\n"
+            f"A) {i * 50} km/h\nB) 60 km/h\nC) {i * 70} km/h\nD) {i * 80 + 1} km/h\n"
+            f"Answer: B\n"
+        )
+    return "\n".join(blocks)
+
+def fake_question_json(count: int, padding: int = 0, seed: int = 0) -> str:
+    """Render `count` questions as the JSON array format_quiz asks for"""
+    filler = " Consider the scenario carefully." * (padding // 32)
+    return json.dumps([
+        {
+            "question": f"{_fake_stem(i, seed)} in {i} hours covering {i * 60} km, what is its average speed?{filler}",
+            "options": [f"{i * 50} km/h", "60 km/h", f"{i * 70} km/h", f"{i * 80 + 1} km/h"],
+            "answer": "60 km/h"
+        }
+        for i in range(1, count + 1)
+    ], indent=2)
+
+def make_fake_gemini(base_latency: float = 0.05, per_question_latency: float = 0.02, padding: int = 0):
+    """Return a get_gemini_model replacement backed by a sleeping fake"""
+
+    def requested(prompt_value) -> int:
+        match = _COUNT_RE.search(prompt_value.to_string())
+        return int(match.group(1)) if match else 25
+
+    def render(prompt_value, count: int) -> AIMessage:
+        prompt = prompt_value.to_string()
+        # Each prompt (e.g. each quiz section) gets its own question wording
+        seed = zlib.crc32(prompt.encode("utf-8"))
+        if "JSON array" in prompt:
+            return AIMessage(content=fake_question_json(count, padding, seed))
+        return AIMessage(content=fake_question_text(count, padding=padding, seed=seed))
+
+    def respond(prompt_value):
+        count = requested(prompt_value)
+        time.sleep(base_latency + per_question_latency * count)
+        return render(prompt_value, count)
+
+    async def arespond(prompt_value):
+        count = requested(prompt_value)
+        await asyncio.sleep(base_latency + per_question_latency * count)
+        return render(prompt_value, count)
+
+    model = RunnableLambda(respond, afunc=arespond)
+    return lambda *args, **kwargs: model
+
+def fake_tavily_results(count: int, content_chars: int = 500) -> list:
+    """Tavily-style results: LeetCode problem pages plus some unrelated links"""
+    results = []
+    for i in range(count):
+        url = (f"https://leetcode.com/problems/problem-{i}/" if i % 4 else
+               f"https://example.com/interview-experience-{i}")
+        results.append({
+            "url": url,
+            "title": f"Problem {i} - LeetCode",
+            "content": ("Given an array of integers, return indices of the two numbers. " * (content_chars // 64 + 1))[:content_chars],
+            "raw_content": "x" * content_chars * 4,
+            "score": 0.9
+        })
+    return results
+
+class FakeTavilyServer:
+    """Threaded local HTTP server that mimics POST /search"""
+
+    def __init__(self, latency: float = 0.05, results: int = 30, content_chars: int = 500):
+        body = json.dumps({"results": fake_tavily_results(results, content_chars)}).encode("utf-8")
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                time.sleep(latency)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/search"
+
+    def __enter__(self) -> "FakeTavilyServer":
+        threading.Thread(target=self._server.serve_forever, name="fake-tavily", daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
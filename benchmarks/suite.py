@@ -0,0 +1,297 @@
+"""
+Benchmark the question generation pipeline end to end, offline.
+
+The real controller, agents and helpers run against a fake Gemini model and
+a local fake Tavily HTTP server. Each stage reports p50/p95/p99 latency,
+throughput and per-call allocations (tracemalloc, measured in a separate
+pass so tracing does not skew the timings). Results are written as JSON;
+pass --compare with an earlier file to flag regressions.
+
+Run from the repository root:
+    python -m benchmarks.suite [--iterations N] [--concurrency C] [--stages a,b]
+                               [--output PATH] [--compare PATH] [--threshold 0.1]
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional
+
+_tmp = tempfile.mkdtemp(prefix="bench-")
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+os.environ.setdefault("TAVILY_API_KEY", "benchmark")
+os.environ.setdefault("QUIZ_CACHE_PATH", os.path.join(_tmp, "quiz.sqlite3"))
+os.environ.setdefault("SEARCH_CACHE_PATH", os.path.join(_tmp, "search.sqlite3"))
+# Measure the pipeline, not the client-side quota or background work
+for name in ("GEMINI_RPM", "GEMINI_TPM", "TAVILY_RPM", "TAVILY_CREDITS_PER_MINUTE", "WARM_POOL_DEPTH"):
+    os.environ.setdefault(name, "0")
+
+import agents.coding_question_gen as coding_module
+import agents.vqar_quiz_formatter as formatter_module
+import agents.vqar_search as vqar_search_module
+from agents.controller import VALID_COMPANIES, QuestionController
+from benchmarks.bench_startup import DEFERRED_MODULES, app_imports, start_worker
+from benchmarks.bench_vqar_parser import build_batch
+from benchmarks.fakes import FakeTavilyServer, fake_question_json, fake_tavily_results, make_fake_gemini
+from utils.problem_matching import extract_problem_concepts, find_leetcode_problem, get_difficulty_from_text, tag_problems
+from utils.question_processing import (coding_problem_links, parse_quiz_response, valid_coding_questions,
+                                       valid_vqar_questions, vqar_questions)
+from utils.question_similarity import dedupe_questions, signature
+from utils.quiz_cache import get_search_cache
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+PROBLEM_TEXTS = [
+    "Given an array of integers nums and an integer target, return indices of the two numbers such that they add up to target.",
+    "Reverse a singly linked list and return the new head node.",
+    "Find the length of the longest substring without repeating characters in a string.",
+    "Given a binary tree, return the level order traversal of its nodes' values using a queue.",
+    "Count the number of islands in a 2D grid map of '1's (land) and '0's (water).",
+    "Design and implement a data structure for a Least Recently Used (LRU) cache with O(1) operations.",
+    "You are climbing a staircase. Each time you can climb 1 or 2 steps. Use dynamic programming to count the ways.",
+    "Merge all overlapping intervals and return an array of the non-overlapping intervals that cover the input.",
+    "Given a string containing just the characters '(', ')', '{', '}', '[' and ']', determine if the input string is valid.",
+    "Optimize the minimum time to finish all tasks with a complex divide and conquer approach."
+]
+
+def percentile(samples: list, fraction: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+class Stage:
+    """One benchmarked operation; `setup` runs untimed before every call"""
+
+    def __init__(self, name: str, fn, setup=None, check=None, concurrent: bool = False,
+                 max_iterations: Optional[int] = None):
+        self.name = name
+        self.fn = fn
+        self.setup = setup
+        self.check = check
+        self.concurrent = concurrent
+        # Caps --iterations for stages that take seconds per call
+        self.max_iterations = max_iterations
+
+    def call(self) -> float:
+        if self.setup:
+            self.setup()
+        start = time.perf_counter()
+        result = self.fn()
+        elapsed = time.perf_counter() - start
+        if self.check:
+            self.check(result)
+        return elapsed
+
+def measure(stage: Stage, iterations: int, concurrency: int, warmup: int) -> dict:
+    iterations = min(iterations, stage.max_iterations or iterations)
+    for _ in range(warmup):
+        stage.call()
+
+    workers = concurrency if stage.concurrent else 1
+    wall_start = time.perf_counter()
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            latencies = list(pool.map(lambda _: stage.call(), range(iterations)))
+    else:
+        latencies = [stage.call() for _ in range(iterations)]
+    wall = time.perf_counter() - wall_start
+
+    # Allocation pass: peak traced memory above the baseline for a single call
+    alloc_runs = min(iterations, 20)
+    peaks, retained = [], []
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_runs):
+            if stage.setup:
+                stage.setup()
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            stage.fn()
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+            retained.append(current - baseline)
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "iterations": iterations,
+        "concurrency": workers,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "throughput_per_s": round(iterations / wall, 2),
+        "alloc_peak_kb": round(sorted(peaks)[len(peaks) // 2] / 1024, 1),
+        "alloc_retained_kb": round(sorted(retained)[len(retained) // 2] / 1024, 1)
+    }
+
+def build_stages(args) -> list:
+    vqar_search_module.get_gemini_model = make_fake_gemini(args.llm_latency, args.llm_per_question, args.llm_padding)
+    formatter_module.get_gemini_model = vqar_search_module.get_gemini_model
+
+    def controller(mode: str) -> QuestionController:
+        instance = QuestionController(company="Amazon")
+        instance.vqar_mode = mode
+        return instance
+
+    sectioned, two_step = controller("sectioned"), controller("two_step")
+    coding = controller("sectioned")
+    # Rotate companies so concurrent callers are not coalesced into one generation
+    companies = itertools.cycle(VALID_COMPANIES)
+
+    def expect_success(result):
+        assert result['status'] == 'success', result.get('message')
+
+    def clear_search_cache():
+        get_search_cache().clear()
+
+    raw_batch = build_batch()
+    malformed_batch = raw_batch.replace("Answer:", "Solution:")
+    results = fake_tavily_results(args.tavily_results, args.tavily_content_chars)
+    quiz_json = fake_question_json(25, args.llm_padding)
+    quiz_questions = json.loads(quiz_json)
+    # Force the JSON fallback path the UI uses for responses with stray text
+    quiz_response = "Here is your quiz:\n" + quiz_json
+    coding_result = {"questions": coding_module.extract_leetcode_problems(results)}
+    # A plain-text coding response, for the splitting fallback
+    coding_text = "\n---\n".join(f"Problem {i + 1}: {text} Input and output are described below."
+                                  for i, text in enumerate(PROBLEM_TEXTS * 2))
+    # Distinct texts, so the per-list memo of repeated problems doesn't flatter the tagger
+    problem_texts = [f"{text} (variant {i})" for i, text in enumerate(PROBLEM_TEXTS * 10)]
+    startup_modules = app_imports()
+
+    def expect_lazy_startup(result):
+        loaded = [name for name in DEFERRED_MODULES if name in result[1]]
+        assert not loaded, f"imported at startup: {', '.join(loaded)}"
+
+    return [
+        Stage("generate_questions.vqar_sectioned",
+              lambda: sectioned.generate_questions(next(companies), "fresher", "VQAR", force_refresh=True),
+              check=expect_success, concurrent=True),
+        Stage("generate_questions.vqar_two_step",
+              lambda: two_step.generate_questions(next(companies), "fresher", "VQAR", force_refresh=True),
+              check=expect_success, concurrent=True),
+        Stage("generate_questions.coding",
+              lambda: coding.generate_questions("Amazon", "fresher", "Coding", force_refresh=True),
+              setup=clear_search_cache, check=expect_success),
+        Stage("fetch_tavily_search",
+              lambda: coding_module.fetch_tavily_search("Amazon LeetCode problems", "benchmark", max_results=30),
+              check=lambda r: len(r) == args.tavily_results, concurrent=True),
+        Stage("format_quiz.local", lambda: formatter_module.format_quiz(raw_batch)),
+        Stage("format_quiz.llm", lambda: formatter_module.format_quiz(malformed_batch), concurrent=True),
+        Stage("extract_leetcode_problems", lambda: coding_module.extract_leetcode_problems(results)),
+        Stage("find_leetcode_problem", lambda: [find_leetcode_problem(t) for t in problem_texts]),
+        Stage("extract_problem_concepts", lambda: [extract_problem_concepts(t) for t in problem_texts]),
+        Stage("get_difficulty_from_text", lambda: [get_difficulty_from_text(t) for t in problem_texts]),
+        Stage("tag_problems", lambda: tag_problems(problem_texts)),
+        # Cold signatures, as for a freshly generated quiz
+        Stage("dedupe_questions", lambda: dedupe_questions(quiz_questions), setup=signature.cache_clear,
+              check=lambda r: len(r) == len(quiz_questions)),
+        Stage("parse_quiz_response", lambda: parse_quiz_response(quiz_response),
+              check=lambda r: len(r) == 25),
+        # The parsing and validation behind the app's _process_vqar_questions / _process_coding_questions
+        Stage("process_vqar_questions", lambda: valid_vqar_questions(vqar_questions(quiz_response)),
+              check=lambda r: len(r) == 25),
+        Stage("process_coding_questions.links", lambda: coding_problem_links(coding_result),
+              check=lambda r: len(r) == len(coding_result["questions"])),
+        Stage("process_coding_questions.text", lambda: valid_coding_questions(coding_text),
+              check=lambda r: len(r) == 2 * len(PROBLEM_TEXTS)),
+        # A fresh interpreter importing streamlit and the app's modules, as a new worker does
+        Stage("cold_start.app_imports", lambda: start_worker(startup_modules), check=expect_lazy_startup,
+              max_iterations=10)
+    ]
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+def compare(report: dict, baseline_path: str, threshold: float) -> list:
+    """Print per-stage deltas against a baseline report; returns the regressed stages"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    regressions = []
+    print(f"\nCompared with {baseline_path} ({baseline['meta'].get('git_revision')}):")
+    ignored = {"output", "compare", "stages", "threshold"}
+    changed = sorted(k for k, v in report["meta"]["params"].items()
+                     if k not in ignored and baseline["meta"].get("params", {}).get(k) != v)
+    if changed:
+        print(f"  note: parameters differ from the baseline: {', '.join(changed)}")
+    for name, stats in report["stages"].items():
+        before = baseline["stages"].get(name)
+        if not before:
+            continue
+        deltas = {metric: (stats[metric] - before[metric]) / before[metric] if before[metric] else 0.0
+                  for metric in ("p50_ms", "p95_ms", "alloc_peak_kb")}
+        regressed = [metric for metric, delta in deltas.items() if delta > threshold]
+        if regressed:
+            regressions.append(name)
+        print(f"  {name:<36} p50 {deltas['p50_ms']:+7.1%}  p95 {deltas['p95_ms']:+7.1%}  "
+              f"alloc {deltas['alloc_peak_kb']:+7.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--iterations", type=int, default=30)
+    arg_parser.add_argument("--warmup", type=int, default=2)
+    arg_parser.add_argument("--concurrency", type=int, default=1, help="parallel callers for I/O-bound stages")
+    arg_parser.add_argument("--stages", help="comma-separated stage names (default: all)")
+    arg_parser.add_argument("--llm-latency", type=float, default=0.05, help="fake model latency per call (s)")
+    arg_parser.add_argument("--llm-per-question", type=float, default=0.002, help="fake model latency per question (s)")
+    arg_parser.add_argument("--llm-padding", type=int, default=0, help="extra characters per generated question")
+    arg_parser.add_argument("--tavily-latency", type=float, default=0.05, help="fake Tavily latency per call (s)")
+    arg_parser.add_argument("--tavily-results", type=int, default=30)
+    arg_parser.add_argument("--tavily-content-chars", type=int, default=500)
+    arg_parser.add_argument("--output", help="JSON report path (default: benchmarks/results/<timestamp>.json)")
+    arg_parser.add_argument("--compare", help="earlier JSON report to compare against")
+    arg_parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown counted as a regression")
+    args = arg_parser.parse_args()
+    # The pipeline logs every Tavily result at INFO, which would bury the results table
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with FakeTavilyServer(args.tavily_latency, args.tavily_results, args.tavily_content_chars) as tavily:
+        coding_module.TAVILY_SEARCH_URL = tavily.url
+        stages = build_stages(args)
+        if args.stages:
+            wanted = set(args.stages.split(","))
+            stages = [stage for stage in stages if stage.name in wanted]
+
+        report = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "git_revision": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "params": vars(args)
+            },
+            "stages": {}
+        }
+        print(f"{'stage':<36} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>9} {'peak KB':>9}")
+        for stage in stages:
+            stats = measure(stage, args.iterations, args.concurrency, args.warmup)
+            report["stages"][stage.name] = stats
+            print(f"{stage.name:<36} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} "
+                  f"{stats['throughput_per_s']:>9.1f} {stats['alloc_peak_kb']:>9.1f}")
+
+    output = args.output or os.path.join(
+        DEFAULT_OUTPUT_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.compare and compare(report, args.compare, args.threshold):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,18 @@
 import streamlit as st
-from agents.controller import QuestionController  
+from streamlit.runtime.scriptrunner import add_script_run_ctx
+from agents.controller import QuestionController, get_controller
+from utils.quiz_stream import QuizStream
+from utils.quiz_records import QuizAnswer, QuizQuestion, iter_records, result_summary, to_records
+from utils.quiz_store import get_quiz_store
+from utils.question_processing import coding_problem_links, valid_coding_questions, valid_vqar_questions, vqar_questions
+from utils.gemini_langchain import get_client_pool_stats
+from agents.coding_question_gen import get_tavily_latency_stats
+from utils.problem_catalog import DEFAULT_COMPANY, get_problem_catalog
+from utils.metrics import recent_spans, render_prometheus, stage_summary, start_metrics_server, traced
 import json
 import time
-import re
-from typing import Dict
 import logging
+from typing import Sequence
 logging.basicConfig(
     level=logging.INFO,
     filename='app.log',
@@ -12,61 +20,13 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-# --- Fetch company-specific problems (mock) ---
+# --- Fetch company-specific problems ---
 def fetch_company_problems(company):
     """
-    Mock function to fetch company-specific problems.
-    Replace this with your actual Tavily or other API call.
+    Company-specific practice problems from the shared problem catalog,
+    defaulting to Amazon's list for companies it doesn't cover.
     """
-    problems_db = {
-        "Amazon": [
-            {'title': 'Two Sum', 'url': 'https://leetcode.com/problems/two-sum/'},
-            {'title': 'Longest Substring Without Repeating Characters', 'url': 'https://leetcode.com/problems/longest-substring-without-repeating-characters/'},
-            {'title': 'Median of Two Sorted Arrays', 'url': 'https://leetcode.com/problems/median-of-two-sorted-arrays/'},
-            {'title': 'Merge Intervals', 'url': 'https://leetcode.com/problems/merge-intervals/'},
-            {'title': 'Valid Parentheses', 'url': 'https://leetcode.com/problems/valid-parentheses/'},
-            {'title': 'Search in Rotated Sorted Array', 'url': 'https://leetcode.com/problems/search-in-rotated-sorted-array/'},
-            {'title': 'Trapping Rain Water', 'url': 'https://leetcode.com/problems/trapping-rain-water/'},
-            {'title': 'Word Ladder', 'url': 'https://leetcode.com/problems/word-ladder/'},
-            {'title': 'Minimum Window Substring', 'url': 'https://leetcode.com/problems/minimum-window-substring/'},
-            {'title': 'LRU Cache', 'url': 'https://leetcode.com/problems/lru-cache/'},
-            {'title': 'Course Schedule', 'url': 'https://leetcode.com/problems/course-schedule/'},
-            {'title': 'Clone Graph', 'url': 'https://leetcode.com/problems/clone-graph/'},
-            {'title': 'Number of Islands', 'url': 'https://leetcode.com/problems/number-of-islands/'},
-            {'title': 'Kth Largest Element in an Array', 'url': 'https://leetcode.com/problems/kth-largest-element-in-an-array/'},
-            {'title': 'Product of Array Except Self', 'url': 'https://leetcode.com/problems/product-of-array-except-self/'},
-            {'title': 'Find Minimum in Rotated Sorted Array', 'url': 'https://leetcode.com/problems/find-minimum-in-rotated-sorted-array/'},
-            {'title': 'Maximum Subarray', 'url': 'https://leetcode.com/problems/maximum-subarray/'},
-            {'title': 'Binary Tree Maximum Path Sum', 'url': 'https://leetcode.com/problems/binary-tree-maximum-path-sum/'},
-            {'title': 'Serialize and Deserialize Binary Tree', 'url': 'https://leetcode.com/problems/serialize-and-deserialize-binary-tree/'},
-            {'title': 'Subsets', 'url': 'https://leetcode.com/problems/subsets/'}
-        ],
-        "Wipro": [
-            {'title': 'Find Peak Element', 'url': 'https://leetcode.com/problems/find-peak-element/'},
-            {'title': 'Reverse Linked List', 'url': 'https://leetcode.com/problems/reverse-linked-list/'},
-            {'title': 'Intersection of Two Linked Lists', 'url': 'https://leetcode.com/problems/intersection-of-two-linked-lists/'},
-            {'title': 'Remove Nth Node From End of List', 'url': 'https://leetcode.com/problems/remove-nth-node-from-end-of-list/'},
-            {'title': 'Linked List Cycle', 'url': 'https://leetcode.com/problems/linked-list-cycle/'},
-            {'title': 'Binary Tree Inorder Traversal', 'url': 'https://leetcode.com/problems/binary-tree-inorder-traversal/'},
-            {'title': 'Validate Binary Search Tree', 'url': 'https://leetcode.com/problems/validate-binary-search-tree/'},
-            {'title': 'Symmetric Tree', 'url': 'https://leetcode.com/problems/symmetric-tree/'},
-            {'title': 'Maximum Depth of Binary Tree', 'url': 'https://leetcode.com/problems/maximum-depth-of-binary-tree/'},
-            {'title': 'Same Tree', 'url': 'https://leetcode.com/problems/same-tree/'},
-            {'title': 'Invert Binary Tree', 'url': 'https://leetcode.com/problems/invert-binary-tree/'},
-            {'title': 'Path Sum', 'url': 'https://leetcode.com/problems/path-sum/'},
-            {'title': 'Best Time to Buy and Sell Stock', 'url': 'https://leetcode.com/problems/best-time-to-buy-and-sell-stock/'},
-            {'title': 'Valid Anagram', 'url': 'https://leetcode.com/problems/valid-anagram/'},
-            {'title': 'Group Anagrams', 'url': 'https://leetcode.com/problems/group-anagrams/'},
-            {'title': 'Minimum Depth of Binary Tree', 'url': 'https://leetcode.com/problems/minimum-depth-of-binary-tree/'},
-            {'title': 'Balanced Binary Tree', 'url': 'https://leetcode.com/problems/balanced-binary-tree/'},
-            {'title': 'Convert Sorted Array to Binary Search Tree', 'url': 'https://leetcode.com/problems/convert-sorted-array-to-binary-search-tree/'},
-            {'title': 'Pascal’s Triangle', 'url': 'https://leetcode.com/problems/pascals-triangle/'},
-            {'title': 'Pascal’s Triangle II', 'url': 'https://leetcode.com/problems/pascals-triangle-ii/'}
-        ]
-        # Add more companies as needed
-    }
-    # Default fallback
-    return {"questions": problems_db.get(company, problems_db["Amazon"])}
+    return {"questions": get_problem_catalog().company_questions(company, default=DEFAULT_COMPANY)}
 
 # Configure page
 st.set_page_config(
@@ -76,6 +36,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Expose pipeline metrics for Prometheus (once per process; METRICS_PORT=0 disables)
+start_metrics_server()
+
 # Enhanced Custom CSS for better UI
 st.markdown("""
     <style>
@@ -252,146 +215,6 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Enhanced LeetCode problem mappings with more specific problems
-LEETCODE_PROBLEM_MAP = {
-    # Array and String Problems
-    "two sum": "two-sum",
-    "array sum": "two-sum",
-    "pair sum": "two-sum",
-    "add two numbers": "add-two-numbers",
-    "longest substring": "longest-substring-without-repeating-characters",
-    "substring": "longest-substring-without-repeating-characters",
-    "median two sorted arrays": "median-of-two-sorted-arrays",
-    "median": "median-of-two-sorted-arrays",
-    "reverse string": "reverse-string",
-    "string reverse": "reverse-string",
-    "palindrome": "valid-palindrome",
-    "palindromic": "valid-palindrome",
-    "anagram": "valid-anagram",
-    "anagrams": "group-anagrams",
-    "group anagrams": "group-anagrams",
-    "maximum subarray": "maximum-subarray",
-    "max subarray": "maximum-subarray",
-    "kadane": "maximum-subarray",
-    "product except self": "product-of-array-except-self",
-    "product array": "product-of-array-except-self",
-    "container water": "container-with-most-water",
-    "water container": "container-with-most-water",
-    "3sum": "3sum",
-    "three sum": "3sum",
-    "trapping rain water": "trapping-rain-water",
-    "rain water": "trapping-rain-water",
-    
-    # Linked List Problems
-    "reverse linked list": "reverse-linked-list",
-    "linked list reverse": "reverse-linked-list",
-    "merge two sorted lists": "merge-two-sorted-lists",
-    "merge sorted": "merge-two-sorted-lists",
-    "linked list cycle": "linked-list-cycle",
-    "cycle detection": "linked-list-cycle",
-    "remove nth node": "remove-nth-node-from-end-of-list",
-    "nth node": "remove-nth-node-from-end-of-list",
-    "intersection two linked lists": "intersection-of-two-linked-lists",
-    "linked list intersection": "intersection-of-two-linked-lists",
-    
-    # Tree Problems
-    "binary tree inorder": "binary-tree-inorder-traversal",
-    "inorder traversal": "binary-tree-inorder-traversal",
-    "binary tree preorder": "binary-tree-preorder-traversal",
-    "preorder traversal": "binary-tree-preorder-traversal",
-    "binary tree postorder": "binary-tree-postorder-traversal",
-    "postorder traversal": "binary-tree-postorder-traversal",
-    "maximum depth": "maximum-depth-of-binary-tree",
-    "tree depth": "maximum-depth-of-binary-tree",
-    "validate bst": "validate-binary-search-tree",
-    "binary search tree": "validate-binary-search-tree",
-    "symmetric tree": "symmetric-tree",
-    "tree symmetric": "symmetric-tree",
-    "binary tree level order": "binary-tree-level-order-traversal",
-    "level order": "binary-tree-level-order-traversal",
-    "path sum": "path-sum",
-    "tree path": "path-sum",
-    "lowest common ancestor": "lowest-common-ancestor-of-a-binary-tree",
-    "lca": "lowest-common-ancestor-of-a-binary-tree",
-    
-    # Dynamic Programming
-    "climbing stairs": "climbing-stairs",
-    "stairs": "climbing-stairs",
-    "fibonacci": "fibonacci-number",
-    "fib": "fibonacci-number",
-    "coin change": "coin-change",
-    "coins": "coin-change",
-    "longest increasing subsequence": "longest-increasing-subsequence",
-    "lis": "longest-increasing-subsequence",
-    "edit distance": "edit-distance",
-    "levenshtein": "edit-distance",
-    "house robber": "house-robber",
-    "robber": "house-robber",
-    "knapsack": "partition-equal-subset-sum",
-    "0/1 knapsack": "partition-equal-subset-sum",
-    "subset sum": "partition-equal-subset-sum",
-    
-    # Graph Problems
-    "number of islands": "number-of-islands",
-    "islands": "number-of-islands",
-    "course schedule": "course-schedule",
-    "topological sort": "course-schedule",
-    "clone graph": "clone-graph",
-    "graph clone": "clone-graph",
-    "word ladder": "word-ladder",
-    "ladder": "word-ladder",
-    "network delay time": "network-delay-time",
-    "shortest path": "network-delay-time",
-    
-    # Sorting and Searching
-    "merge sort": "sort-an-array",
-    "mergesort": "sort-an-array",
-    "quick sort": "sort-an-array",
-    "quicksort": "sort-an-array",
-    "heap sort": "sort-an-array",
-    "binary search": "binary-search",
-    "search": "binary-search",
-    "search rotated array": "search-in-rotated-sorted-array",
-    "rotated array": "search-in-rotated-sorted-array",
-    "find peak element": "find-peak-element",
-    "peak element": "find-peak-element",
-    "search 2d matrix": "search-a-2d-matrix",
-    "2d matrix": "search-a-2d-matrix",
-    
-    # Stack and Queue
-    "valid parentheses": "valid-parentheses",
-    "parentheses": "valid-parentheses",
-    "brackets": "valid-parentheses",
-    "implement queue using stacks": "implement-queue-using-stacks",
-    "queue using stacks": "implement-queue-using-stacks",
-    "implement stack using queues": "implement-stack-using-queues",
-    "stack using queues": "implement-stack-using-queues",
-    "min stack": "min-stack",
-    "minimum stack": "min-stack",
-    "evaluate reverse polish": "evaluate-reverse-polish-notation",
-    "reverse polish": "evaluate-reverse-polish-notation",
-    "rpn": "evaluate-reverse-polish-notation",
-    
-    # Hash Table
-    "group anagrams": "group-anagrams",
-    "top k frequent": "top-k-frequent-elements",
-    "k frequent": "top-k-frequent-elements",
-    "longest consecutive": "longest-consecutive-sequence",
-    "consecutive sequence": "longest-consecutive-sequence",
-    
-    # Math and Bit Manipulation
-    "reverse integer": "reverse-integer",
-    "integer reverse": "reverse-integer",
-    "palindrome number": "palindrome-number",
-    "number palindrome": "palindrome-number",
-    "power of two": "power-of-two",
-    "power 2": "power-of-two",
-    "single number": "single-number",
-    "missing number": "missing-number",
-    "counting bits": "counting-bits",
-    "bit counting": "counting-bits"
-}
-
 # Initialize session state
 def init_session_state():
     if "quiz" not in st.session_state:
@@ -403,55 +226,63 @@ def init_session_state():
             "done": False,
             "generated": False,
             "start_time": None,
-            "raw_response": None
+            "raw_response": None,
+            "stream": None,
+            "stream_metrics": None,
+            "quiz_ref": None
         }
     
     # Initialize category state to ensure proper page switching
     if "current_category" not in st.session_state:
         st.session_state.current_category = None
 
+def quiz_questions(quiz) -> Sequence[QuizQuestion]:
+    """
+    Questions of the current aptitude quiz.
+
+    While a stream is running these are the questions received so far; once
+    it completes they move to the shared quiz store like any other quiz.
+    """
+    stream = quiz.get("stream")
+    if stream is not None:
+        if not stream.complete:
+            return stream.questions
+        quiz["stream_metrics"] = stream.metrics()
+        quiz["stream"] = None
+        _store_quiz(quiz, stream.questions)
+    ref = quiz.get("quiz_ref")
+    if ref is None:
+        return quiz["questions"]
+    return get_quiz_store().get(ref.quiz_id) or ()
+
+def _store_quiz(quiz, questions: Sequence[QuizQuestion]):
+    """Keep the questions once in the process-wide store; the session holds only a reference"""
+    quiz["quiz_ref"] = get_quiz_store().put(questions)
+    quiz["questions"] = []
+
 # Helper function to clean and parse JSON
 def parse_quiz_response(response: str):
     try:
-        # Try direct JSON parsing first
-        return json.loads(response)
-    except json.JSONDecodeError:
-        try:
-            # Look for JSON in code blocks
-            json_match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group(1))
-            
-            # Look for JSON array pattern
-            json_match = re.search(r'\[\s*{.*?}\s*\]', response, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group(0))
-            
-            # Clean common formatting issues
-            cleaned = response.strip()
-            cleaned = re.sub(r'^[^[{]*', '', cleaned)  # Remove text before JSON
-            cleaned = re.sub(r'[^}\]]*$', '', cleaned)  # Remove text after JSON
-            
-            return json.loads(cleaned)
-        except Exception as e:
-            st.error(f"Failed to parse response: {str(e)}")
-            return None
+        return vqar_questions(response)
+    except Exception as e:
+        st.error(f"Failed to parse response: {str(e)}")
+        return None
 
-def handle_answer(selected: str, question: Dict):
+def handle_answer(selected: str, question: QuizQuestion):
     quiz = st.session_state.quiz
-    is_correct = (selected == question["answer"])
-    
-    quiz["answers"].append({
-        "question": question["question"],
-        "selected": selected,
-        "correct": question["answer"],
-        "result": is_correct
-    })
+    answer = QuizAnswer.for_question(quiz["current"], question, selected)
+    quiz["answers"].append(answer)
     
-    if is_correct:
+    if answer.correct:
         quiz["score"] += 1
     
-    if quiz["current"] + 1 < len(quiz["questions"]):
+    # Questions may still be streaming in; wait for the next one if it is due
+    stream = quiz.get("stream")
+    if stream is not None and quiz["current"] + 1 < stream.total:
+        with st.spinner("⏳ Loading next question..."):
+            stream.wait_for(quiz["current"] + 2, timeout=120)
+    
+    if quiz["current"] + 1 < len(quiz_questions(quiz)):
         quiz["current"] += 1
     else:
         quiz["done"] = True
@@ -460,9 +291,10 @@ def handle_answer(selected: str, question: Dict):
 
 def show_results():
     quiz = st.session_state.quiz
+    questions = quiz_questions(quiz)
     time_taken = int(time.time() - quiz["start_time"])
     
-    score_percentage = round(quiz['score']/len(quiz['questions'])*100)
+    score_percentage = round(quiz['score']/len(questions)*100)
     
     # Performance analysis
     if score_percentage >= 80:
@@ -481,7 +313,7 @@ def show_results():
         <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin: 20px 0;">
             <div class="metric-card">
                 <h3 style="color: {color}; margin: 0;">Score</h3>
-                <p style="font-size: 1.5em; font-weight: bold; margin: 10px 0; color: #2c3e50;">{quiz['score']}/{len(quiz['questions'])}</p>
+                <p style="font-size: 1.5em; font-weight: bold; margin: 10px 0; color: #2c3e50;">{quiz['score']}/{len(questions)}</p>
                 <p style="color: #6c757d; margin: 0;">({score_percentage}%)</p>
             </div>
             <div class="metric-card">
@@ -499,19 +331,20 @@ def show_results():
     st.markdown("### 📊 Detailed Review")
     
     for i, ans in enumerate(quiz["answers"]):
-        with st.expander(f"Q{i+1}: {ans['question'][:80]}{'...' if len(ans['question']) > 80 else ''}", expanded=False):
+        question = questions[ans.index]
+        with st.expander(f"Q{i+1}: {question.question[:80]}{'...' if len(question.question) > 80 else ''}", expanded=False):
             st.markdown(f"""
             <div class="answer-review">
-                <h4 style="color: #2c3e50; margin-bottom: 15px;">{ans['question']}</h4>
+                <h4 style="color: #2c3e50; margin-bottom: 15px;">{question.question}</h4>
                 <div style="margin: 10px 0;">
                     <strong>Your answer:</strong> 
-                    <span style="color: {'#28a745' if ans['result'] else '#dc3545'}; font-weight: 500;">
-                        {ans['selected']} {'✅' if ans['result'] else '❌'}
+                    <span style="color: {'#28a745' if ans.correct else '#dc3545'}; font-weight: 500;">
+                        {question.options[ans.choice]} {'✅' if ans.correct else '❌'}
                     </span>
                 </div>
                 <div style="margin: 10px 0;">
                     <strong>Correct answer:</strong> 
-                    <span style="color: #28a745; font-weight: 500;">{ans['correct']} ✅</span>
+                    <span style="color: #28a745; font-weight: 500;">{question.answer} ✅</span>
                 </div>
             </div>
             """, unsafe_allow_html=True)
@@ -531,39 +364,42 @@ def show_results():
 
 def render_aptitude_quiz():
     quiz = st.session_state.quiz
+    questions = quiz_questions(quiz)
     
-    if not quiz["questions"]:
+    if not questions:
         st.warning("No questions available. Please generate questions first.")
         return
     
     if not quiz["done"]:
-        current_q = quiz["questions"][quiz["current"]]
+        current_q = questions[quiz["current"]]
+        stream = quiz.get("stream")
+        total = stream.total if stream is not None else len(questions)
         
         # Progress bar at top
-        progress = (quiz["current"] + 1) / len(quiz["questions"])
-        st.progress(progress, text=f"Question {quiz['current'] + 1} of {len(quiz['questions'])}")
+        progress = (quiz["current"] + 1) / total
+        st.progress(progress, text=f"Question {quiz['current'] + 1} of {total}")
         
         col1, col2 = st.columns([3, 1])
         
         with col1:
             st.markdown(f"""
             <div class="question-card">
-                <h3>Question {quiz['current'] + 1} of {len(quiz['questions'])}</h3>
-                <h4>{current_q['question']}</h4>
+                <h3>Question {quiz['current'] + 1} of {total}</h3>
+                <h4>{current_q.question}</h4>
             </div>
             """, unsafe_allow_html=True)
             
             # Options as radio buttons
             selected = st.radio(
                 "**Select your answer:**",
-                current_q["options"],
+                current_q.options,
                 key=f"q_{quiz['current']}",
                 index=None
             )
             
             col3, col4 = st.columns([1, 3])
             with col3:
-                if st.button("Submit Answer", disabled=selected is None, use_container_width=True, type="primary"):
+                if st.button("Submit Answer", disabled=selected is None, use_container_width=True, type="primary") and selected is not None:
                     handle_answer(selected, current_q)
         
         with col2:
@@ -579,114 +415,19 @@ def render_aptitude_quiz():
             
             # Question navigation
             answered = len(quiz["answers"])
-            st.metric("✅ Answered", f"{answered}/{len(quiz['questions'])}")
-            st.metric("🎯 Remaining", f"{len(quiz['questions']) - answered}")
+            st.metric("✅ Answered", f"{answered}/{total}")
+            st.metric("🎯 Remaining", f"{total - answered}")
+            
+            if stream is not None:
+                st.caption(f"⏳ {len(questions)} of {total} questions ready")
+            stream_metrics = stream.metrics() if stream is not None else quiz.get("stream_metrics")
+            if stream_metrics and st.session_state.get('debug_mode', False):
+                total_time = stream_metrics["total_time"]
+                st.caption(f"First question in {stream_metrics['time_to_first_question']}s · "
+                           f"all questions in {total_time if total_time is not None else '…'}s")
     else:
         show_results()
 
-def find_leetcode_problem(problem_text):
-    """Find the most relevant LeetCode problem based on the problem text"""
-    problem_text_lower = problem_text.lower()
-    
-    # Check for exact matches first with enhanced scoring
-    best_match = None
-    best_score = 0
-    
-    for keyword, leetcode_slug in LEETCODE_PROBLEM_MAP.items():
-        if keyword in problem_text_lower:
-            # Score based on keyword length and position
-            score = len(keyword)
-            if problem_text_lower.startswith(keyword):
-                score += 10  # Bonus for starting with keyword
-            if score > best_score:
-                best_score = score
-                best_match = leetcode_slug
-    
-    if best_match:
-        return f"https://leetcode.com/problems/{best_match}/"
-    
-    # Enhanced fallback patterns for common problem types
-    if any(word in problem_text_lower for word in ["array", "sum", "two"]):
-        return "https://leetcode.com/problems/two-sum/"
-    elif any(word in problem_text_lower for word in ["linked", "list", "node"]):
-        return "https://leetcode.com/problems/reverse-linked-list/"
-    elif any(word in problem_text_lower for word in ["tree", "binary", "traversal"]):
-        return "https://leetcode.com/problems/binary-tree-inorder-traversal/"
-    elif any(word in problem_text_lower for word in ["sort", "merge", "quick", "heap"]):
-        return "https://leetcode.com/problems/sort-an-array/"
-    elif any(word in problem_text_lower for word in ["search", "binary", "find"]):
-        return "https://leetcode.com/problems/binary-search/"
-    elif any(word in problem_text_lower for word in ["string", "substring", "character"]):
-        return "https://leetcode.com/problems/longest-substring-without-repeating-characters/"
-    elif any(word in problem_text_lower for word in ["palindrome", "palindromic"]):
-        return "https://leetcode.com/problems/valid-palindrome/"
-    elif any(word in problem_text_lower for word in ["parenthes", "bracket", "valid"]):
-        return "https://leetcode.com/problems/valid-parentheses/"
-    elif any(word in problem_text_lower for word in ["graph", "island", "connected"]):
-        return "https://leetcode.com/problems/number-of-islands/"
-    elif any(word in problem_text_lower for word in ["dynamic", "dp", "fibonacci", "stairs"]):
-        return "https://leetcode.com/problems/climbing-stairs/"
-    elif any(word in problem_text_lower for word in ["stack", "queue", "push", "pop"]):
-        return "https://leetcode.com/problems/min-stack/"
-    elif any(word in problem_text_lower for word in ["hash", "map", "frequency"]):
-        return "https://leetcode.com/problems/two-sum/"
-    
-    # Default fallback
-    return "https://leetcode.com/problemset/algorithms/"
-
-def extract_problem_concepts(question_text):
-    """Extract key concepts from the problem text with enhanced detection"""
-    concepts = []
-    question_lower = question_text.lower()
-    
-    concept_map = {
-        "Array": ["array", "list", "element", "index", "subarray", "sum", "product"],
-        "String": ["string", "character", "substring", "palindrome", "anagram", "text"],
-        "Linked List": ["linked list", "node", "pointer", "next", "cycle", "reverse"],
-        "Binary Tree": ["tree", "binary", "root", "leaf", "traversal", "inorder", "preorder", "postorder"],
-        "Graph": ["graph", "vertex", "edge", "connected", "path", "island", "bfs", "dfs"],
-        "Dynamic Programming": ["dynamic", "dp", "optimal", "subproblem", "fibonacci", "stairs", "coin"],
-        "Sorting": ["sort", "merge", "quick", "heap", "bubble", "selection", "insertion"],
-        "Binary Search": ["search", "binary search", "find", "locate", "target", "rotated"],
-        "Stack": ["stack", "push", "pop", "lifo", "parentheses", "bracket"],
-        "Queue": ["queue", "enqueue", "dequeue", "fifo", "level order"],
-        "Hash Table": ["hash", "map", "dictionary", "key-value", "frequency", "count"],
-        "Two Pointers": ["two pointer", "left", "right", "meet", "fast", "slow"],
-        "Sliding Window": ["window", "substring", "subarray", "sliding", "maximum", "minimum"],
-        "Recursion": ["recursive", "recursion", "base case", "divide", "conquer"],
-        "Backtracking": ["backtrack", "permutation", "combination", "generate", "all possible"],
-        "Greedy": ["greedy", "optimal", "local", "global", "activity", "interval"],
-        "Bit Manipulation": ["bit", "xor", "and", "or", "shift", "binary", "power of 2"]
-    }
-    
-    for concept, keywords in concept_map.items():
-        if any(keyword in question_lower for keyword in keywords):
-            concepts.append(concept)
-    
-    return concepts if concepts else ["General Algorithm"]
-
-def get_difficulty_from_text(question_text):
-    """Determine difficulty based on problem complexity indicators"""
-    question_lower = question_text.lower()
-    
-    # Hard indicators
-    hard_indicators = ["complex", "advanced", "optimize", "minimum time", "maximum efficiency", 
-                      "hard", "challenging", "difficult", "expert", "o(log n)", "divide and conquer"]
-    
-    # Easy indicators  
-    easy_indicators = ["simple", "basic", "easy", "straightforward", "beginner", "introduction",
-                      "find", "check", "validate", "single pass"]
-    
-    hard_score = sum(1 for indicator in hard_indicators if indicator in question_lower)
-    easy_score = sum(1 for indicator in easy_indicators if indicator in question_lower)
-    
-    if hard_score > easy_score and hard_score > 0:
-        return "Hard"
-    elif easy_score > 0:
-        return "Easy"
-    else:
-        return "Medium"
-
 def render_coding_questions():
     import json
     # Try to get the raw response (could be dict or string)
@@ -728,11 +469,36 @@ def render_coding_questions():
         st.markdown(f"🔹 **Problem {i}: [{q['title']}]({q['url']})**")
     st.markdown("---")
 
+def render_problem_search():
+    catalog = get_problem_catalog()
+    facets = catalog.facets()
+    st.markdown("### 🔎 Search the Problem Catalog")
+    # Start from the sidebar company, and again whenever it changes
+    if st.session_state.get("problem_search_company") != st.session_state.company:
+        st.session_state.problem_search_company = st.session_state.company
+        st.session_state.problem_search_companies = [st.session_state.company]
+    col1, col2 = st.columns(2)
+    with col1:
+        companies = st.multiselect("Asked at", facets["companies"], key="problem_search_companies")
+        concepts = st.multiselect("Concepts", facets["concepts"], key="problem_search_concepts")
+    with col2:
+        difficulties = st.multiselect("Difficulty", facets["difficulties"], key="problem_search_difficulty")
+        text = st.text_input("Title contains", key="problem_search_text")
+    results = catalog.search(concepts=concepts, difficulty=difficulties, companies=companies, text=text)
+    if not results:
+        st.info("No problems match these filters.")
+        return
+    st.caption(f"{len(results)} of {len(catalog.problems)} problems")
+    for i, problem in enumerate(results, 1):
+        st.markdown(f"🔹 **Problem {i}: [{problem.title}]({problem.url})** · {problem.difficulty} · "
+                    f"{', '.join(problem.concepts)}")
+    st.markdown("---")
+
 def handle_generate_questions():
     logging.info(f"handle_generate_questions called: company={st.session_state.company}, category={st.session_state.category}, experience={st.session_state.experience}")
-    # Persist controller in session state
+    # Sessions of the same company share one controller
     if 'controller' not in st.session_state or st.session_state.controller.company != st.session_state.company:
-        st.session_state.controller = QuestionController(company=st.session_state.company)
+        st.session_state.controller = get_controller(st.session_state.company)
     controller = st.session_state.controller
     
     # Determine category from UI selection
@@ -748,12 +514,19 @@ def handle_generate_questions():
             "done": False,
             "generated": False,
             "start_time": None,
-            "raw_response": None
+            "raw_response": None,
+            "stream": None,
+            "stream_metrics": None,
+            "quiz_ref": None
         }
         st.session_state.current_category = category
     
+    # Warn when requests are queued behind the shared provider rate limit
+    expected_wait = controller.expected_wait(category)
+    queue_note = f" High demand right now, expected wait ~{expected_wait:.0f}s." if expected_wait >= 1 else ""
+    
     # Show loading spinner while generating
-    with st.spinner(f"🔄 Generating {st.session_state.category} questions for {st.session_state.company}..."):
+    with st.spinner(f"🔄 Generating {st.session_state.category} questions for {st.session_state.company}...{queue_note}"):
         try:
             # Map UI experience levels to backend values
             exp_mapping = {
@@ -763,22 +536,31 @@ def handle_generate_questions():
             }
             experience = exp_mapping.get(st.session_state.experience, "fresher")
             
+            # Stream aptitude questions so the quiz starts as soon as question 1 is ready
+            if category == "VQAR" and st.session_state.get('stream_questions', True):
+                if _start_vqar_stream(controller, experience):
+                    st.rerun()
+                logging.warning("VQAR stream produced no questions, falling back to batch generation")
+            
             # Generate questions using our controller
             result = controller.generate_questions(
                 company=st.session_state.company,
                 experience=experience,
-                category=category
+                category=category,
+                force_refresh=st.session_state.get('force_refresh', False)
             )
             
             logging.info(f"Questions generated result: status={result.get('status', 'unknown')}, num_questions={len(result.get('questions', [])) if isinstance(result, dict) and 'questions' in result else 'N/A'}")
+            if isinstance(result, dict) and 'path' in result:
+                logging.info(f"VQAR generation path={result['path']}, elapsed={result.get('elapsed')}s")
             
             # Handle API key errors specifically
             if isinstance(result, str) and ("API key" in result or "provide" in result):
                 st.error(result)
                 return
             
-            # Store raw response for debugging
-            st.session_state.quiz["raw_response"] = result
+            # Keep the result's metadata for debugging; its questions are stored as records
+            st.session_state.quiz["raw_response"] = result_summary(result)
             
             # Process based on question type
             if category == "VQAR":
@@ -793,14 +575,46 @@ def handle_generate_questions():
                 with st.expander("🐛 Error Details"):
                     st.exception(e)
 
+def _start_vqar_stream(controller: QuestionController, experience: str) -> bool:
+    """Start streaming VQAR questions and wait only for the first one"""
+    stream = QuizStream(
+        iter_records(controller.stream_vqar_questions(
+            company=st.session_state.company,
+            experience=experience,
+            force_refresh=st.session_state.get('force_refresh', False)
+        )),
+        limit=st.session_state.get('num_questions', 15)
+    )
+    # The generator reads API keys from session state, so it needs this session's context
+    add_script_run_ctx(stream.thread)
+    stream.start()
+    
+    if not stream.wait_for(1, timeout=120):
+        if stream.error is not None:
+            logging.error(f"VQAR stream failed: {str(stream.error)}")
+        return False
+    
+    logging.info(f"VQAR stream started: time_to_first_question={stream.time_to_first_question}s")
+    st.session_state.quiz.update({
+        "questions": [],
+        "generated": True,
+        "start_time": time.time(),
+        "current": 0,
+        "score": 0,
+        "answers": [],
+        "done": False,
+        "stream": stream,
+        "stream_metrics": None,
+        "quiz_ref": None,
+        "raw_response": {'status': 'success', 'source': 'stream'}
+    })
+    return True
+
+@traced("process_vqar_questions")
 def _process_vqar_questions(result):
     """Process and validate VQAR questions for Streamlit UI"""
     try:
-        # If result is a dict with 'questions', use it directly
-        if isinstance(result, dict) and 'questions' in result:
-            questions = result['questions']
-        else:
-            questions = parse_quiz_response(result)
+        questions = parse_quiz_response(result)
         
         logging.info(f"Processed VQAR questions: valid={len(questions)}")
         
@@ -813,14 +627,7 @@ def _process_vqar_questions(result):
             return
         
         # Validate question structure
-        valid_questions = []
-        for q in questions:
-            if (isinstance(q, dict) and 
-                'question' in q and q['question'].strip() and
-                'options' in q and isinstance(q['options'], list) and
-                len(q['options']) == 4 and all(isinstance(o, str) for o in q['options']) and
-                'answer' in q and q['answer'] in q['options']):
-                valid_questions.append(q)
+        valid_questions = valid_vqar_questions(questions)
         
         logging.info(f"Processed VQAR questions: valid={len(valid_questions)}")
         
@@ -831,18 +638,20 @@ def _process_vqar_questions(result):
         
         # Apply question limit from UI slider
         num_questions = min(st.session_state.get('num_questions', 15), len(valid_questions))
-        final_questions = valid_questions[:num_questions]
+        final_questions = to_records(valid_questions[:num_questions])
         
-        # Update session state
+        # Update session state; the questions themselves go to the shared quiz store
         st.session_state.quiz.update({
-            "questions": final_questions,
             "generated": True,
             "start_time": time.time(),
             "current": 0,
             "score": 0,
             "answers": [],
-            "done": False
+            "done": False,
+            "stream": None,
+            "stream_metrics": None
         })
+        _store_quiz(st.session_state.quiz, final_questions)
         
         st.success(f"✅ Generated {len(final_questions)} valid aptitude questions!")
         st.rerun()
@@ -853,28 +662,26 @@ def _process_vqar_questions(result):
         if st.session_state.debug_mode:
             st.exception(e)
 
+@traced("process_coding_questions")
 def _process_coding_questions(result: str):
     """Process and validate coding questions for Streamlit UI"""
     try:
-        # Handle different response formats
-        if isinstance(result, str):
-            # Split by problem markers
-            problem_split = re.split(r'\n---+\n|\n\*\*\*+\n', result)
-            questions = [p.strip() for p in problem_split if p.strip()]
-            
-            # Fallback splitting if no markers found
-            if len(questions) <= 1:
-                questions = re.split(r'\n(?=Problem \d+|\d+\.)', result)
-                questions = [q.strip() for q in questions if q.strip()]
-        else:
-            questions = [str(result)]
-        
-        # Filter and validate questions
-        valid_questions = []
-        for q in questions:
-            if (isinstance(q, str) and len(q) >= 100 and 
-                any(keyword in q.lower() for keyword in ["problem", "description", "input", "output"])):
-                valid_questions.append(q)
+        problems = coding_problem_links(result)
+        if problems:
+            logging.info(f"Processed coding questions: valid={len(problems)}")
+            st.session_state.quiz.update({
+                "questions": problems,
+                "generated": True,
+                "start_time": time.time(),
+                "current": 0,
+                "score": 0,
+                "answers": [],
+                "done": False
+            })
+            st.success(f"✅ Generated {len(problems)} coding problems!")
+            st.rerun()
+        # Split the text response into problems and keep the ones that look complete
+        valid_questions = valid_coding_questions(result)
         
         logging.info(f"Processed coding questions: valid={len(valid_questions)}")
         
@@ -978,6 +785,8 @@ with st.sidebar:
             st.session_state.quiz["current"] = 0
             st.session_state.quiz["score"] = 0
             st.session_state.quiz["done"] = False
+            st.session_state.quiz["stream"] = None
+            st.session_state.quiz["quiz_ref"] = None
         st.session_state.generate_questions_clicked = False  # Reset flag on category change
     
     st.session_state.category = current_category
@@ -994,8 +803,37 @@ with st.sidebar:
     
     st.markdown("---")
     st.markdown("### ⚙️ Advanced Options")
+    if st.session_state.category == "VQAR (Aptitude)":
+        st.session_state.stream_questions = st.checkbox("⚡ Stream Questions", value=True, help="Start the quiz as soon as the first question is ready")
+    st.session_state.force_refresh = st.checkbox("♻️ Force Fresh Questions", help="Skip the shared question cache and generate a new set")
     st.session_state.debug_mode = st.checkbox("🐛 Debug Mode", help="Show detailed error information")
     
+    if st.session_state.debug_mode and 'controller' in st.session_state:
+        with st.expander("🗄️ Cache Stats"):
+            st.json(st.session_state.controller.cache_stats())
+        with st.expander("🔥 Warm Pool"):
+            st.json(st.session_state.controller.warm_pool_stats())
+        with st.expander("🔀 Request Coalescing"):
+            st.json(QuestionController.coalescing_stats())
+        with st.expander("⏱️ Hedged Requests"):
+            st.json(QuestionController.hedging_stats())
+        with st.expander("🔌 Gemini Client Pool"):
+            st.json(get_client_pool_stats())
+        with st.expander("🌐 Tavily Latency"):
+            st.json(get_tavily_latency_stats())
+        with st.expander("🚦 Rate Limits"):
+            st.json(QuestionController.rate_limit_stats())
+        with st.expander("💰 Token Usage"):
+            st.json(QuestionController.usage_stats())
+        with st.expander("🔁 Question Bank"):
+            st.json(QuestionController.question_bank_stats())
+        with st.expander("🗃️ Quiz Store"):
+            st.json(QuestionController.quiz_store_stats())
+        with st.expander("📈 Metrics"):
+            st.json(stage_summary())
+            st.json(recent_spans(20))
+            st.code(render_prometheus(), language="text")
+    
     st.markdown("---")
     
     if st.button("🚀 Generate Questions", use_container_width=True, type="primary"):
@@ -1065,6 +903,7 @@ else:
         render_aptitude_quiz()
     else:
         render_coding_questions()
+        render_problem_search()
 
 # Footer
 st.markdown("---")
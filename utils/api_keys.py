@@ -0,0 +1,39 @@
+import os
+from contextvars import ContextVar
+from typing import Awaitable, Dict, Optional, TypeVar
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+T = TypeVar("T")
+
+# provider -> (environment variable, Streamlit session_state key)
+API_KEY_SOURCES = {
+    "gemini": ("GOOGLE_API_KEY", "gemini_api_key"),
+    "tavily": ("TAVILY_API_KEY", "tavily_api_key")
+}
+
+# Keys captured from a Streamlit session for work running outside its script thread
+_bound_keys: ContextVar[Dict[str, Optional[str]]] = ContextVar("bound_api_keys", default={})
+
+def _session_state_key(name: str) -> Optional[str]:
+    if get_script_run_ctx(suppress_warning=True) is None:
+        # Not a Streamlit script thread, so there is no session to read
+        return None
+    return st.session_state.get(name)
+
+def get_api_key(provider: str) -> Optional[str]:
+    """Resolve an API key from the environment, keys bound to this context, or session state"""
+    env_name, state_name = API_KEY_SOURCES[provider]
+    return os.getenv(env_name) or _bound_keys.get().get(provider) or _session_state_key(state_name)
+
+def capture_api_keys() -> Dict[str, Optional[str]]:
+    """Snapshot every provider key visible from the calling (script) thread"""
+    return {provider: get_api_key(provider) for provider in API_KEY_SOURCES}
+
+async def with_api_keys(keys: Dict[str, Optional[str]], awaitable: Awaitable[T]) -> T:
+    """Await `awaitable` with `keys` bound, so it can resolve them from any thread"""
+    token = _bound_keys.set(keys)
+    try:
+        return await awaitable
+    finally:
+        _bound_keys.reset(token)
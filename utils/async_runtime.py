@@ -0,0 +1,63 @@
+import asyncio
+import atexit
+import logging
+import threading
+from typing import Awaitable, Callable, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+_shutdown_hooks: List[Callable[[], Awaitable[None]]] = []
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the process-wide event loop, running on a daemon thread.
+
+    Sync entry points submit coroutines here instead of calling asyncio.run,
+    so loop-bound resources (HTTP sessions, async model clients) survive
+    between calls.
+    """
+    global _loop, _thread
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_loop.run_forever, name="async-runtime", daemon=True)
+            _thread.start()
+        return _loop
+
+def run_sync(awaitable: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """Block the calling thread until `awaitable` completes on the shared loop"""
+    loop = get_loop()
+    if threading.current_thread() is _thread:
+        raise RuntimeError("run_sync cannot be called from the async runtime thread; await instead")
+    future = asyncio.run_coroutine_threadsafe(_as_coroutine(awaitable), loop)
+    try:
+        return future.result(timeout)
+    except BaseException:
+        # Timeout or interruption of the caller cancels the work on the loop as well
+        future.cancel()
+        raise
+
+async def _as_coroutine(awaitable: Awaitable[T]) -> T:
+    return await awaitable
+
+def add_shutdown_hook(hook: Callable[[], Awaitable[None]]):
+    """Register a coroutine function to run on the shared loop at interpreter exit (e.g. closing sessions)"""
+    _shutdown_hooks.append(hook)
+
+@atexit.register
+def shutdown(timeout: float = 5.0):
+    """Run shutdown hooks and stop the shared loop, if it was started"""
+    loop = _loop
+    if loop is None or not loop.is_running():
+        return
+    for hook in _shutdown_hooks:
+        try:
+            run_sync(hook(), timeout)
+        except Exception as e:
+            logger.warning(f"Async runtime shutdown hook failed: {str(e)}")
+    loop.call_soon_threadsafe(loop.stop)
@@ -1,23 +1,172 @@
+import asyncio
+import concurrent.futures
+import hashlib
 import os
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
+from utils.api_keys import get_api_key
+from utils.async_runtime import get_loop
+from utils.rate_limiter import RateLimiter, get_rate_limiter
+from utils.usage import get_usage_tracker
+
+# google-generativeai and LangChain take over a second to import; they are
+# imported on the first model call, so pages that never call Gemini don't pay for them
+if TYPE_CHECKING:
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_google_genai import ChatGoogleGenerativeAI
 
 load_dotenv()
 
-def get_gemini_model():
-    # Get API key from environment or session state
-    api_key = os.getenv("GOOGLE_API_KEY") or st.session_state.get("gemini_api_key")
-    
+class GeminiClientPool:
+    """
+    Thread-safe pool of ChatGoogleGenerativeAI clients keyed by API key and model settings.
+
+    Building a client sets up the google-generativeai transport and auth, so
+    clients are reused across calls and sessions and only rebuilt after sitting
+    idle for `idle_ttl` seconds. Each client gets its own transport bound to its
+    key: google-generativeai otherwise binds a model to whatever key was last
+    passed to its process-global `configure` when the model is first called.
+    """
+
+    def __init__(self, idle_ttl: float = 15 * 60, max_size: int = 32):
+        self.idle_ttl = idle_ttl
+        self.max_size = max_size
+        self._clients: Dict[Tuple, Tuple["ChatGoogleGenerativeAI", float]] = {}
+        self._usage_callback = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, api_key: str, model: str, temperature: float) -> "ChatGoogleGenerativeAI":
+        """Return a pooled client, creating one on first use"""
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        from utils.usage_callback import UsageCallback
+
+        key = (hashlib.sha256(api_key.encode("utf-8")).hexdigest(), model, temperature)
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._clients.get(key)
+            if entry is not None:
+                self._hits += 1
+                client = entry[0]
+            else:
+                self._misses += 1
+                if len(self._clients) >= self.max_size:
+                    oldest = min(self._clients, key=lambda k: self._clients[k][1])
+                    del self._clients[oldest]
+                    self._evictions += 1
+                if self._usage_callback is None:
+                    self._usage_callback = UsageCallback(get_usage_tracker())
+                client = ChatGoogleGenerativeAI(
+                    model=model,
+                    google_api_key=api_key,
+                    convert_system_message_to_human=True,
+                    temperature=temperature,
+                    # Token and cost accounting for every call through this client
+                    callbacks=[self._usage_callback]
+                )
+                _bind_transport(client, api_key)
+            self._clients[key] = (client, now)
+            return client
+
+    def evict_idle(self) -> int:
+        """Drop clients idle for longer than idle_ttl; returns how many were dropped"""
+        with self._lock:
+            return self._evict_idle(time.monotonic())
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._clients),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions
+            }
+
+    def _evict_idle(self, now: float) -> int:
+        idle = [k for k, (_, last_used) in self._clients.items() if now - last_used > self.idle_ttl]
+        for k in idle:
+            del self._clients[k]
+        self._evictions += len(idle)
+        return len(idle)
+
+def _bind_transport(client: "ChatGoogleGenerativeAI", api_key: str):
+    """Give the client's GenerativeModel sync and async transports of its own for `api_key`"""
+    from google.generativeai.client import _ClientManager
+
+    manager = _ClientManager()
+    manager.configure(api_key=api_key)
+    client.client._client = manager.make_client("generative")
+    client.client._async_client = _on_runtime_loop(lambda: manager.make_client("generative_async"))
+
+def _on_runtime_loop(build):
+    """
+    Call `build` on a helper thread whose event loop is the shared runtime loop.
+
+    grpc.aio channels belong to the loop current when they are created, and
+    async model calls run on the shared loop. A helper thread is used rather
+    than the loop itself, which may be blocked waiting for the pool lock.
+    """
+    result = concurrent.futures.Future()
+
+    def target():
+        asyncio.set_event_loop(get_loop())
+        try:
+            result.set_result(build())
+        except BaseException as e:
+            result.set_exception(e)
+
+    threading.Thread(target=target, name="gemini-transport").start()
+    return result.result()
+
+_client_pool = GeminiClientPool(
+    idle_ttl=float(os.getenv("GEMINI_POOL_IDLE_TTL", 15 * 60)),
+    max_size=int(os.getenv("GEMINI_POOL_MAX_SIZE", 32))
+)
+
+def get_gemini_model(api_key: Optional[str] = None,
+                     model: str = "gemini-2.5-flash",
+                     temperature: float = 0.7):
+    # Get API key from environment, the bound request context or session state
+    api_key = api_key or get_api_key("gemini")
+
     if not api_key:
         raise ValueError("Gemini API key not found. Please provide one in the sidebar.")
-    
-    return ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash",
-        google_api_key=api_key,
-        convert_system_message_to_human=True,
-        temperature=0.7
-    )
-
-def get_prompt(template: str):
-    return ChatPromptTemplate.from_template(template)
\ No newline at end of file
+
+    return _client_pool.get(api_key, model, temperature)
+
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", 120))
+
+def get_gemini_limiter(api_key: Optional[str] = None) -> Optional[RateLimiter]:
+    """Shared request/token budget for the Gemini key in use (None without a key)"""
+    api_key = api_key or get_api_key("gemini")
+    return get_rate_limiter("gemini", api_key) if api_key else None
+
+def estimate_tokens(prompt_chars: int, output_questions: int = 0) -> int:
+    """Rough prompt + completion token count for budgeting (about 4 characters per token)"""
+    return prompt_chars // 4 + 90 * output_questions
+
+def acquire_gemini(tokens: int):
+    """Wait for the Gemini budget before a blocking model call"""
+    limiter = get_gemini_limiter()
+    if limiter is not None:
+        limiter.acquire(tokens, timeout=RATE_LIMIT_MAX_WAIT)
+
+async def aacquire_gemini(tokens: int):
+    """Wait for the Gemini budget before an async model call"""
+    limiter = get_gemini_limiter()
+    if limiter is not None:
+        await limiter.aacquire(tokens, timeout=RATE_LIMIT_MAX_WAIT)
+
+def get_client_pool_stats() -> Dict[str, int]:
+    """Expose Gemini client pool counters"""
+    return _client_pool.stats()
+
+def get_prompt(template: str) -> "ChatPromptTemplate":
+    from langchain_core.prompts import ChatPromptTemplate
+
+    return ChatPromptTemplate.from_template(template)
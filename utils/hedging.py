@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+
+class Hedger:
+    """
+    Hedged async calls to cut tail latency.
+
+    If a call has not finished after the `percentile` latency of recent calls
+    of the same kind, a duplicate is started; the first successful result wins
+    and the other call is cancelled. Hedges are capped at `max_rate` of calls,
+    and are not attempted until `min_samples` latencies have been seen.
+    """
+
+    def __init__(self,
+                 percentile: float = 0.95,
+                 max_rate: float = 0.1,
+                 min_samples: int = 20,
+                 min_delay: float = 1.0,
+                 window: int = 200):
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "hedged": 0, "hedge_wins": 0, "suppressed": 0}
+
+    async def run(self, kind: str, fn: Callable[[], Awaitable[Any]], hedge: bool = True) -> Any:
+        """Await fn(), hedging it with a second fn() when it runs long"""
+        with self._lock:
+            self._stats["calls"] += 1
+        delay = self.hedge_delay(kind) if hedge else None
+        primary = asyncio.ensure_future(self._timed(kind, fn))
+        if delay is None:
+            return await primary
+
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and self._allow_hedge():
+                tasks.add(asyncio.ensure_future(self._timed(kind, fn)))
+            while True:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((t for t in done if not t.cancelled() and t.exception() is None), None)
+                if winner is not None:
+                    break
+                if len(done) == len(tasks):
+                    # Every call failed; surface the last failure, which counts as nobody's win
+                    return next(iter(done)).result()
+                # The first to finish failed; wait for the other one
+                tasks -= done
+            if winner is not primary:
+                with self._lock:
+                    self._stats["hedge_wins"] += 1
+            return winner.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # Mark a losing call's failure as seen
+                    task.exception()
+
+    def hedge_delay(self, kind: str) -> Optional[float]:
+        """Seconds to wait before hedging a call of this kind, or None if there is too little history"""
+        with self._lock:
+            samples = sorted(self._latencies.get(kind, ()))
+        if len(samples) < self.min_samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * self.percentile))
+        return max(self.min_delay, samples[index])
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            kinds = list(self._latencies)
+        stats["hedge_rate"] = round(stats["hedged"] / stats["calls"], 3) if stats["calls"] else 0.0
+        stats["delays"] = {kind: round(delay, 3) if delay is not None else None
+                           for kind, delay in ((k, self.hedge_delay(k)) for k in kinds)}
+        return stats
+
+    def _allow_hedge(self) -> bool:
+        with self._lock:
+            if self._stats["hedged"] + 1 > self.max_rate * self._stats["calls"]:
+                self._stats["suppressed"] += 1
+                return False
+            self._stats["hedged"] += 1
+            return True
+
+    async def _timed(self, kind: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        start = time.monotonic()
+        result = await fn()
+        # Only completed calls feed the latency window; cancelled losers would bias it low
+        with self._lock:
+            self._latencies.setdefault(kind, deque(maxlen=self.window)).append(time.monotonic() - start)
+        return result
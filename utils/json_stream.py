@@ -0,0 +1,169 @@
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional
+
+_STRUCTURAL_RE = re.compile(r'[\[\]{}",]')
+_STRING_RE = re.compile(r'["\\]')
+_NON_SPACE_RE = re.compile(r'\S')
+
+
+class JsonArrayStreamParser:
+    """
+    Incremental parser for a JSON array arriving in chunks (e.g. streamed LLM output).
+
+    Text before the opening '[' (prose, markdown fences) is ignored. Each array
+    element is decoded as soon as it closes; elements that fail to decode are
+    skipped and described in `errors` instead of failing the whole array.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._start: Optional[int] = None  # Offset of the element being scanned
+        self._stack: List[str] = []  # Open brackets of the current element
+        self._in_string = False
+        self.started = False
+        self.finished = False
+        self.count = 0
+        self.errors: List[str] = []
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume a chunk and return the elements completed by it"""
+        if self.finished:
+            return []
+        self._text += chunk
+        items = []
+        text, pos = self._text, self._pos
+
+        while pos < len(text) and not self.finished:
+            if not self.started:
+                pos = text.find('[', pos)
+                if pos < 0:
+                    pos = len(text)
+                    break
+                self.started = True
+                pos += 1
+                continue
+
+            if self._in_string:
+                match = _STRING_RE.search(text, pos)
+                if not match:
+                    pos = len(text)
+                    break
+                if match.group() == '\\':
+                    if match.end() >= len(text):
+                        # Wait for the escaped character
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                pos = match.end()
+                continue
+
+            if self._start is None:
+                match = _NON_SPACE_RE.search(text, pos)
+                if not match:
+                    pos = len(text)
+                    break
+                char = match.group()
+                pos = match.end()
+                if char == ',':
+                    continue
+                if char == ']':
+                    self.finished = True
+                    break
+                self._start = match.start()
+                self._stack = [char] if char in '[{' else []
+                self._in_string = char == '"'
+                continue
+
+            match = _STRUCTURAL_RE.search(text, pos)
+            if not match:
+                pos = len(text)
+                break
+            char = match.group()
+            pos = match.end()
+            if char == '"':
+                self._in_string = True
+            elif char in '[{':
+                self._stack.append(char)
+            elif char in ']}':
+                if self._stack:
+                    opener = self._stack.pop()
+                    if opener + char not in ('[]', '{}'):
+                        # Mismatched bracket: give up on this element so the next one can still parse
+                        self._emit(text[self._start:pos], items)
+                    elif not self._stack:
+                        self._emit(text[self._start:pos], items)
+                elif char == ']':
+                    # End of the array right after a scalar element
+                    self._emit(text[self._start:match.start()], items)
+                    self.finished = True
+            elif not self._stack:
+                self._emit(text[self._start:match.start()], items)
+
+        # Drop consumed text, keeping any element still in progress
+        keep = self._start if self._start is not None else pos
+        self._text = text[keep:]
+        self._pos = pos - keep
+        if self._start is not None:
+            self._start = 0
+        return items
+
+    def close(self) -> List[Any]:
+        """Signal the end of input; a trailing unterminated element is reported as an error"""
+        items = []
+        if self._start is not None and not self.finished:
+            if not self._stack and not self._in_string:
+                self._emit(self._text, items)
+            else:
+                self.errors.append(f"element {self.count}: truncated")
+                self.count += 1
+                self._start = None
+        self.finished = True
+        return items
+
+    def _emit(self, raw: str, items: List[Any]):
+        try:
+            items.append(json.loads(raw))
+        except json.JSONDecodeError as e:
+            self.errors.append(f"element {self.count}: {str(e)}")
+        self.count += 1
+        self._start = None
+        self._stack = []
+
+
+def iter_json_array(chunks: Iterable[str], errors: Optional[List[str]] = None) -> Iterator[Any]:
+    """Yield each well-formed element of a streamed JSON array as it closes"""
+    parser = JsonArrayStreamParser()
+    try:
+        for chunk in chunks:
+            yield from parser.feed(chunk)
+        yield from parser.close()
+    finally:
+        if errors is not None:
+            errors.extend(parser.errors)
+    if not parser.started:
+        raise ValueError("No JSON array found in response")
+
+
+async def aiter_json_array(chunks: AsyncIterable[str], errors: Optional[List[str]] = None) -> AsyncIterator[Any]:
+    """Async iter_json_array for chunks from an async stream"""
+    parser = JsonArrayStreamParser()
+    try:
+        async for chunk in chunks:
+            for item in parser.feed(chunk):
+                yield item
+        for item in parser.close():
+            yield item
+    finally:
+        if errors is not None:
+            errors.extend(parser.errors)
+    if not parser.started:
+        raise ValueError("No JSON array found in response")
+
+
+def parse_json_array(text: str, errors: Optional[List[str]] = None) -> List[Any]:
+    """Parse a complete response containing a JSON array, skipping malformed elements"""
+    return list(iter_json_array([text], errors))
@@ -0,0 +1,285 @@
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(names: Sequence[str], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def values(self) -> Dict[Tuple, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_label_text(self.labels, key)} {value}" for key, value in sorted(self.values().items())]
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram with optional labels"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            else:
+                series[len(self.buckets)] += 1
+            series[-1] += value
+
+    def series(self) -> Dict[Tuple, List[float]]:
+        with self._lock:
+            return {key: list(series) for key, series in self._series.items()}
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, series in sorted(self.series().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_label_text(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.labels, key)} {round(series[-1], 6)}")
+            lines.append(f"{self.name}_count{_label_text(self.labels, key)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Value computed at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str], collect: Callable[[], Dict[Tuple, float]]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_label_text(self.labels, key)} {value}" for key, value in sorted(self.collect().items())]
+
+
+class MetricsRegistry:
+    """Process-wide set of metrics rendered in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "quiz_stage_duration_seconds", "Time spent in each question pipeline stage", ("stage",)))
+STAGE_ERRORS = REGISTRY.register(Counter(
+    "quiz_stage_errors_total", "Pipeline stages that raised, by stage", ("stage",)))
+REQUESTS = REGISTRY.register(Counter(
+    "quiz_requests_total", "Question requests by category and the source that served them", ("category", "source")))
+
+
+def _fallback_ratio() -> Dict[Tuple, float]:
+    totals: Dict[str, float] = {}
+    fallbacks: Dict[str, float] = {}
+    for (category, source), count in REQUESTS.values().items():
+        totals[category] = totals.get(category, 0) + count
+        if source == "fallback":
+            fallbacks[category] = fallbacks.get(category, 0) + count
+    return {(category,): round(fallbacks.get(category, 0) / total, 4) for category, total in totals.items() if total}
+
+
+REGISTRY.register(Gauge(
+    "quiz_fallback_ratio", "Share of requests answered with fallback questions", ("category",), _fallback_ratio))
+
+_current_span: ContextVar[Optional[str]] = ContextVar("current_span", default=None)
+_recent_spans = deque(maxlen=int(os.getenv("TRACE_RECENT_SPANS", 200)))
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time a pipeline stage; nested spans record their parent path for the debug view"""
+    parent = _current_span.get()
+    path = f"{parent}/{stage}" if parent else stage
+    token = _current_span.set(path)
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except asyncio.CancelledError:
+        status = "cancelled"
+        raise
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        _current_span.reset(token)
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        if status == "error":
+            STAGE_ERRORS.inc(stage=stage)
+        _recent_spans.append({"path": path, "ms": round(elapsed * 1000, 2), "status": status})
+
+
+def traced(stage: str):
+    """Decorator form of span for plain and async functions"""
+
+    def decorator(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def current_span() -> Optional[str]:
+    """Path of the innermost open span in this context, if any"""
+    return _current_span.get()
+
+
+def record_request(category: str, source: str):
+    REQUESTS.inc(category=category, source=source)
+
+
+def recent_spans(limit: int = 50) -> List[Dict]:
+    """Most recent finished spans, newest first"""
+    return list(_recent_spans)[-limit:][::-1]
+
+
+def stage_summary() -> Dict[str, Dict]:
+    """Calls, mean and total time per stage, for the debug view"""
+    errors = {key[0]: count for key, count in STAGE_ERRORS.values().items()}
+    summary = {}
+    for (stage,), series in sorted(STAGE_SECONDS.series().items()):
+        count = sum(series[:-1])
+        summary[stage] = {
+            "calls": count,
+            "mean_ms": round(series[-1] / count * 1000, 2) if count else 0.0,
+            "total_s": round(series[-1], 3),
+            "errors": errors.get(stage, 0)
+        }
+    return summary
+
+
+def render_prometheus() -> str:
+    return REGISTRY.render()
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_failed = False
+_server_lock = threading.Lock()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_metrics_server(port: Optional[int] = None, host: Optional[str] = None) -> Optional[int]:
+    """
+    Serve /metrics on a local port once per process (METRICS_PORT, 0 disables).
+
+    Returns the bound port, or None when disabled or the port is taken.
+    """
+    global _server, _server_failed
+    with _server_lock:
+        if _server is not None:
+            return _server.server_address[1]
+        port = int(os.getenv("METRICS_PORT", 9464)) if port is None else port
+        if port <= 0 or _server_failed:
+            return None
+        host = host or os.getenv("METRICS_HOST", "127.0.0.1")
+        try:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            # Usually another app process already serves this port; don't retry on every rerun
+            _server_failed = True
+            logger.warning(f"Metrics endpoint not started on port {port}: {str(e)}")
+            return None
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        logger.info(f"Serving Prometheus metrics on http://{host}:{_server.server_address[1]}/metrics")
+        return _server.server_address[1]
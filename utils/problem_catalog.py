@@ -0,0 +1,324 @@
+import bisect
+import re
+import sys
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+# slug, title, difficulty, concepts; every problem is listed once
+_PROBLEMS = [
+    ("two-sum", "Two Sum", "Easy", ("Array", "Hash Table")),
+    ("longest-substring-without-repeating-characters", "Longest Substring Without Repeating Characters", "Medium", ("String", "Hash Table", "Sliding Window")),
+    ("median-of-two-sorted-arrays", "Median of Two Sorted Arrays", "Hard", ("Array", "Binary Search")),
+    ("merge-intervals", "Merge Intervals", "Medium", ("Array", "Sorting")),
+    ("valid-parentheses", "Valid Parentheses", "Easy", ("String", "Stack")),
+    ("search-in-rotated-sorted-array", "Search in Rotated Sorted Array", "Medium", ("Array", "Binary Search")),
+    ("trapping-rain-water", "Trapping Rain Water", "Hard", ("Array", "Two Pointers", "Stack", "Dynamic Programming")),
+    ("word-ladder", "Word Ladder", "Hard", ("String", "Graph", "Hash Table")),
+    ("minimum-window-substring", "Minimum Window Substring", "Hard", ("String", "Hash Table", "Sliding Window")),
+    ("lru-cache", "LRU Cache", "Medium", ("Hash Table", "Linked List", "Design")),
+    ("course-schedule", "Course Schedule", "Medium", ("Graph",)),
+    ("clone-graph", "Clone Graph", "Medium", ("Graph", "Hash Table")),
+    ("number-of-islands", "Number of Islands", "Medium", ("Graph", "Matrix")),
+    ("kth-largest-element-in-an-array", "Kth Largest Element in an Array", "Medium", ("Array", "Heap", "Sorting")),
+    ("product-of-array-except-self", "Product of Array Except Self", "Medium", ("Array",)),
+    ("find-minimum-in-rotated-sorted-array", "Find Minimum in Rotated Sorted Array", "Medium", ("Array", "Binary Search")),
+    ("maximum-subarray", "Maximum Subarray", "Medium", ("Array", "Dynamic Programming")),
+    ("binary-tree-maximum-path-sum", "Binary Tree Maximum Path Sum", "Hard", ("Binary Tree", "Recursion", "Dynamic Programming")),
+    ("serialize-and-deserialize-binary-tree", "Serialize and Deserialize Binary Tree", "Hard", ("Binary Tree", "Design", "String")),
+    ("subsets", "Subsets", "Medium", ("Array", "Backtracking", "Bit Manipulation")),
+    ("add-two-numbers", "Add Two Numbers", "Medium", ("Linked List", "Math")),
+    ("word-search", "Word Search", "Medium", ("Matrix", "Backtracking")),
+    ("longest-palindromic-substring", "Longest Palindromic Substring", "Medium", ("String", "Dynamic Programming", "Two Pointers")),
+    ("regular-expression-matching", "Regular Expression Matching", "Hard", ("String", "Dynamic Programming", "Recursion")),
+    ("jump-game", "Jump Game", "Medium", ("Array", "Greedy", "Dynamic Programming")),
+    ("insert-interval", "Insert Interval", "Medium", ("Array",)),
+    ("word-break", "Word Break", "Medium", ("String", "Dynamic Programming", "Hash Table")),
+    ("find-median-from-data-stream", "Find Median from Data Stream", "Hard", ("Heap", "Design", "Sorting")),
+    ("alien-dictionary", "Alien Dictionary", "Hard", ("Graph", "String")),
+    ("course-schedule-ii", "Course Schedule II", "Medium", ("Graph",)),
+    ("meeting-rooms-ii", "Meeting Rooms II", "Medium", ("Array", "Sorting", "Heap", "Greedy")),
+    ("sliding-window-maximum", "Sliding Window Maximum", "Hard", ("Array", "Sliding Window", "Queue", "Heap")),
+    ("find-all-anagrams-in-a-string", "Find All Anagrams in a String", "Medium", ("String", "Hash Table", "Sliding Window")),
+    ("longest-consecutive-sequence", "Longest Consecutive Sequence", "Medium", ("Array", "Hash Table")),
+    ("merge-k-sorted-lists", "Merge k Sorted Lists", "Hard", ("Linked List", "Heap", "Sorting")),
+    ("binary-tree-right-side-view", "Binary Tree Right Side View", "Medium", ("Binary Tree", "Queue")),
+    ("unique-paths", "Unique Paths", "Medium", ("Dynamic Programming", "Math")),
+    ("search-a-2d-matrix", "Search a 2D Matrix", "Medium", ("Matrix", "Binary Search")),
+    ("set-matrix-zeroes", "Set Matrix Zeroes", "Medium", ("Matrix", "Hash Table")),
+    ("spiral-matrix", "Spiral Matrix", "Medium", ("Matrix",)),
+    ("rotate-image", "Rotate Image", "Medium", ("Matrix", "Math")),
+    ("group-anagrams", "Group Anagrams", "Medium", ("String", "Hash Table", "Sorting")),
+    ("powx-n", "Pow(x, n)", "Medium", ("Math", "Recursion")),
+    ("search-a-2d-matrix-ii", "Search a 2D Matrix II", "Medium", ("Matrix", "Binary Search")),
+    ("word-ladder-ii", "Word Ladder II", "Hard", ("String", "Graph", "Backtracking")),
+    ("binary-tree-level-order-traversal", "Binary Tree Level Order Traversal", "Medium", ("Binary Tree", "Queue")),
+    ("validate-binary-search-tree", "Validate Binary Search Tree", "Medium", ("Binary Tree", "Recursion")),
+    ("lowest-common-ancestor-of-a-binary-tree", "Lowest Common Ancestor of a Binary Tree", "Medium", ("Binary Tree", "Recursion")),
+    ("house-robber", "House Robber", "Medium", ("Array", "Dynamic Programming")),
+    ("house-robber-ii", "House Robber II", "Medium", ("Array", "Dynamic Programming")),
+    ("reverse-linked-list", "Reverse Linked List", "Easy", ("Linked List", "Recursion")),
+    ("merge-two-sorted-lists", "Merge Two Sorted Lists", "Easy", ("Linked List", "Recursion")),
+    ("intersection-of-two-linked-lists", "Intersection of Two Linked Lists", "Easy", ("Linked List", "Two Pointers", "Hash Table")),
+    ("linked-list-cycle", "Linked List Cycle", "Easy", ("Linked List", "Two Pointers")),
+    ("copy-list-with-random-pointer", "Copy List with Random Pointer", "Medium", ("Linked List", "Hash Table")),
+    ("remove-duplicates-from-sorted-array", "Remove Duplicates from Sorted Array", "Easy", ("Array", "Two Pointers")),
+    ("best-time-to-buy-and-sell-stock", "Best Time to Buy and Sell Stock", "Easy", ("Array", "Dynamic Programming")),
+    ("valid-anagram", "Valid Anagram", "Easy", ("String", "Hash Table", "Sorting")),
+    ("intersection-of-two-arrays-ii", "Intersection of Two Arrays II", "Easy", ("Array", "Hash Table", "Two Pointers")),
+    ("majority-element", "Majority Element", "Easy", ("Array", "Hash Table")),
+    ("move-zeroes", "Move Zeroes", "Easy", ("Array", "Two Pointers")),
+    ("contains-duplicate", "Contains Duplicate", "Easy", ("Array", "Hash Table")),
+    ("single-number", "Single Number", "Easy", ("Array", "Bit Manipulation")),
+    ("merge-sorted-array", "Merge Sorted Array", "Easy", ("Array", "Two Pointers", "Sorting")),
+    ("reverse-string", "Reverse String", "Easy", ("String", "Two Pointers")),
+    ("first-unique-character-in-a-string", "First Unique Character in a String", "Easy", ("String", "Hash Table", "Queue")),
+    ("valid-palindrome", "Valid Palindrome", "Easy", ("String", "Two Pointers")),
+    ("palindrome-number", "Palindrome Number", "Easy", ("Math",)),
+    ("roman-to-integer", "Roman to Integer", "Easy", ("String", "Hash Table", "Math")),
+    ("implement-strstr", "Implement strStr()", "Easy", ("String", "Two Pointers")),
+    ("count-and-say", "Count and Say", "Medium", ("String",)),
+    ("maximum-depth-of-binary-tree", "Maximum Depth of Binary Tree", "Easy", ("Binary Tree", "Recursion")),
+    ("symmetric-tree", "Symmetric Tree", "Easy", ("Binary Tree", "Recursion")),
+    ("path-sum", "Path Sum", "Easy", ("Binary Tree", "Recursion")),
+    ("remove-nth-node-from-end-of-list", "Remove Nth Node From End of List", "Medium", ("Linked List", "Two Pointers")),
+    ("palindrome-linked-list", "Palindrome Linked List", "Easy", ("Linked List", "Two Pointers", "Stack")),
+    ("remove-duplicates-from-sorted-list", "Remove Duplicates from Sorted List", "Easy", ("Linked List",)),
+    ("find-peak-element", "Find Peak Element", "Medium", ("Array", "Binary Search")),
+    ("binary-tree-inorder-traversal", "Binary Tree Inorder Traversal", "Easy", ("Binary Tree", "Stack", "Recursion")),
+    ("same-tree", "Same Tree", "Easy", ("Binary Tree", "Recursion")),
+    ("invert-binary-tree", "Invert Binary Tree", "Easy", ("Binary Tree", "Recursion")),
+    ("minimum-depth-of-binary-tree", "Minimum Depth of Binary Tree", "Easy", ("Binary Tree", "Queue")),
+    ("balanced-binary-tree", "Balanced Binary Tree", "Easy", ("Binary Tree", "Recursion")),
+    ("convert-sorted-array-to-binary-search-tree", "Convert Sorted Array to Binary Search Tree", "Easy", ("Binary Tree", "Recursion")),
+    ("pascals-triangle", "Pascal’s Triangle", "Easy", ("Array", "Dynamic Programming")),
+    ("pascals-triangle-ii", "Pascal’s Triangle II", "Easy", ("Array", "Dynamic Programming"))
+]
+
+_EASY_SERVICE_SET = (
+    "remove-duplicates-from-sorted-array", "best-time-to-buy-and-sell-stock", "valid-anagram",
+    "intersection-of-two-arrays-ii", "majority-element", "move-zeroes", "contains-duplicate", "single-number",
+    "maximum-subarray", "merge-sorted-array", "reverse-string", "first-unique-character-in-a-string",
+    "valid-palindrome", "palindrome-number", "roman-to-integer", "implement-strstr", "count-and-say",
+    "maximum-depth-of-binary-tree"
+)
+
+# Company -> slugs, most frequently asked first
+_COMPANY_PROBLEMS = {
+    "Amazon": (
+        "two-sum", "longest-substring-without-repeating-characters", "median-of-two-sorted-arrays",
+        "merge-intervals", "valid-parentheses", "search-in-rotated-sorted-array", "trapping-rain-water",
+        "word-ladder", "minimum-window-substring", "lru-cache", "course-schedule", "clone-graph",
+        "number-of-islands", "kth-largest-element-in-an-array", "product-of-array-except-self",
+        "find-minimum-in-rotated-sorted-array", "maximum-subarray", "binary-tree-maximum-path-sum",
+        "serialize-and-deserialize-binary-tree", "subsets"
+    ),
+    "Google": (
+        "add-two-numbers", "word-search", "longest-palindromic-substring", "regular-expression-matching",
+        "jump-game", "insert-interval", "minimum-window-substring", "word-break", "find-median-from-data-stream",
+        "alien-dictionary", "course-schedule-ii", "meeting-rooms-ii", "sliding-window-maximum",
+        "find-all-anagrams-in-a-string", "longest-consecutive-sequence", "merge-k-sorted-lists",
+        "median-of-two-sorted-arrays", "binary-tree-right-side-view", "unique-paths", "search-a-2d-matrix"
+    ),
+    "Microsoft": (
+        "set-matrix-zeroes", "spiral-matrix", "rotate-image", "group-anagrams", "powx-n", "search-a-2d-matrix-ii",
+        "word-ladder-ii", "binary-tree-level-order-traversal", "validate-binary-search-tree",
+        "lowest-common-ancestor-of-a-binary-tree", "house-robber", "house-robber-ii", "number-of-islands",
+        "reverse-linked-list", "merge-two-sorted-lists", "intersection-of-two-linked-lists", "linked-list-cycle",
+        "copy-list-with-random-pointer", "lru-cache", "find-minimum-in-rotated-sorted-array"
+    ),
+    "TCS": (
+        "remove-duplicates-from-sorted-array", "best-time-to-buy-and-sell-stock", "valid-anagram",
+        "intersection-of-two-arrays-ii", "majority-element", "move-zeroes", "contains-duplicate", "single-number",
+        "maximum-subarray", "merge-sorted-array", "reverse-string", "first-unique-character-in-a-string",
+        "valid-palindrome", "palindrome-number", "roman-to-integer", "implement-strstr", "count-and-say",
+        "maximum-depth-of-binary-tree", "symmetric-tree", "path-sum"
+    ),
+    "Infosys": (
+        "reverse-linked-list", "merge-two-sorted-lists", "remove-nth-node-from-end-of-list", "linked-list-cycle",
+        "intersection-of-two-linked-lists", "palindrome-linked-list", "add-two-numbers",
+        "remove-duplicates-from-sorted-list", "reverse-string", "valid-parentheses", "valid-palindrome",
+        "best-time-to-buy-and-sell-stock", "maximum-subarray", "contains-duplicate", "single-number",
+        "majority-element", "move-zeroes", "intersection-of-two-arrays-ii", "first-unique-character-in-a-string",
+        "roman-to-integer"
+    ),
+    # The sidebar list and the coding fallback used to disagree for Wipro; the catalog keeps both
+    "Wipro": ("valid-parentheses", "merge-two-sorted-lists") + _EASY_SERVICE_SET + (
+        "find-peak-element", "reverse-linked-list", "intersection-of-two-linked-lists",
+        "remove-nth-node-from-end-of-list", "linked-list-cycle", "binary-tree-inorder-traversal",
+        "validate-binary-search-tree", "symmetric-tree", "same-tree", "invert-binary-tree", "path-sum",
+        "group-anagrams", "minimum-depth-of-binary-tree", "balanced-binary-tree",
+        "convert-sorted-array-to-binary-search-tree", "pascals-triangle", "pascals-triangle-ii"
+    ),
+    "Accenture": ("valid-parentheses", "merge-two-sorted-lists") + _EASY_SERVICE_SET,
+    "Cognizant": ("valid-parentheses", "merge-two-sorted-lists") + _EASY_SERVICE_SET
+}
+
+DEFAULT_COMPANY = "Amazon"
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def _title_tokens(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower().replace("’", "").replace("'", ""))
+
+
+class Problem:
+    """One catalog problem, shared by every company list that includes it"""
+
+    __slots__ = ("id", "slug", "title", "difficulty", "concepts", "companies")
+
+    def __init__(self, id: int, slug: str, title: str, difficulty: str, concepts: Tuple[str, ...]):
+        self.id = id
+        self.slug = sys.intern(slug)
+        self.title = title
+        self.difficulty = sys.intern(difficulty)
+        self.concepts = tuple(sys.intern(c) for c in concepts)
+        self.companies: Tuple[str, ...] = ()
+
+    @property
+    def url(self) -> str:
+        return f"https://leetcode.com/problems/{self.slug}/"
+
+    def as_dict(self) -> Dict[str, str]:
+        """The {"title", "url"} shape used by the coding question lists"""
+        return {"title": self.title, "url": self.url}
+
+    def __repr__(self) -> str:
+        return f"Problem({self.slug!r}, {self.difficulty})"
+
+
+class ProblemCatalog:
+    """
+    Company LeetCode lists with each problem stored once.
+
+    Indexed by slug, company, concept and difficulty; index values are
+    tuples of the shared Problem records in catalog order (company lists
+    keep their own order).
+    """
+
+    def __init__(self, problems=_PROBLEMS, company_problems=_COMPANY_PROBLEMS):
+        self.problems: Tuple[Problem, ...] = tuple(
+            Problem(i, slug, title, difficulty, concepts)
+            for i, (slug, title, difficulty, concepts) in enumerate(problems)
+        )
+        self.by_slug: Dict[str, Problem] = {p.slug: p for p in self.problems}
+        if len(self.by_slug) != len(self.problems):
+            raise ValueError("Duplicate slug in problem catalog")
+
+        self.by_company: Dict[str, Tuple[Problem, ...]] = {}
+        companies: Dict[int, List[str]] = {}
+        for company, slugs in company_problems.items():
+            unknown = [s for s in slugs if s not in self.by_slug]
+            if unknown:
+                raise ValueError(f"Unknown slugs for {company}: {unknown}")
+            # Keep the first mention when a list repeats a problem
+            ordered = tuple(self.by_slug[s] for s in dict.fromkeys(slugs))
+            self.by_company[company] = ordered
+            for problem in ordered:
+                companies.setdefault(problem.id, []).append(company)
+        for problem in self.problems:
+            problem.companies = tuple(companies.get(problem.id, ()))
+
+        by_concept: Dict[str, List[Problem]] = {}
+        by_difficulty: Dict[str, List[Problem]] = {}
+        for problem in self.problems:
+            for concept in problem.concepts:
+                by_concept.setdefault(concept, []).append(problem)
+            by_difficulty.setdefault(problem.difficulty, []).append(problem)
+        self.by_concept: Dict[str, Tuple[Problem, ...]] = {k: tuple(v) for k, v in by_concept.items()}
+        self.by_difficulty: Dict[str, Tuple[Problem, ...]] = {k: tuple(v) for k, v in by_difficulty.items()}
+
+        # Inverted index: (field, term) -> ids of the problems carrying it
+        postings: Dict[Tuple[str, str], set] = {}
+        for problem in self.problems:
+            terms = [("difficulty", problem.difficulty.lower())]
+            terms += [("concept", c.lower()) for c in problem.concepts]
+            terms += [("company", c.lower()) for c in problem.companies]
+            terms += [("title", t) for t in _title_tokens(problem.title)]
+            for term in terms:
+                postings.setdefault(term, set()).add(problem.id)
+        self._postings: Dict[Tuple[str, str], FrozenSet[int]] = {k: frozenset(v) for k, v in postings.items()}
+        self._title_terms: List[str] = sorted(term for field, term in self._postings if field == "title")
+
+    def get(self, slug: str) -> Optional[Problem]:
+        return self.by_slug.get(slug)
+
+    def company_problems(self, company: str) -> Tuple[Problem, ...]:
+        return self.by_company.get(company, ())
+
+    def company_questions(self, company: str, default: Optional[str] = None) -> List[Dict[str, str]]:
+        """A company's problems as title/url dicts, or the `default` company's when it has none"""
+        problems = self.by_company.get(company) or self.by_company.get(default, ())
+        return [problem.as_dict() for problem in problems]
+
+    def _field_postings(self, field: str, values: Iterable[str]) -> List[FrozenSet[int]]:
+        return [self._postings.get((field, v.lower()), frozenset()) for v in values]
+
+    def _title_postings(self, text: str) -> List[FrozenSet[int]]:
+        """One posting per query word, covering every title word it prefixes ("pascal" -> "pascals")"""
+        result = []
+        for token in _title_tokens(text):
+            start = bisect.bisect_left(self._title_terms, token)
+            end = bisect.bisect_left(self._title_terms, token + "\x7f", start)
+            terms = self._title_terms[start:end]
+            if len(terms) == 1:
+                result.append(self._postings[("title", terms[0])])
+            else:
+                result.append(frozenset().union(*(self._postings[("title", t)] for t in terms)))
+        return result
+
+    def search(self, concepts: Iterable[str] = (), difficulty: Union[str, Iterable[str], None] = None,
+               companies: Iterable[str] = (), text: str = "") -> List[Problem]:
+        """
+        Problems matching every filter, in catalog order.
+
+        Concepts, companies and title words (as prefixes) must all match;
+        several difficulties match any of them. Filters are intersected through
+        the posting lists, smallest first, so the cost follows the size
+        of the narrowest filter rather than the catalog.
+        """
+        required = self._field_postings("concept", concepts)
+        required += self._field_postings("company", companies)
+        required += self._title_postings(text)
+        if difficulty:
+            levels = [difficulty] if isinstance(difficulty, str) else list(difficulty)
+            required.append(frozenset().union(*self._field_postings("difficulty", levels)))
+        if not required:
+            return list(self.problems)
+
+        required.sort(key=len)
+        smallest, rest = required[0], required[1:]
+        ids = [i for i in smallest if all(i in posting for posting in rest)]
+        ids.sort()
+        return [self.problems[i] for i in ids]
+
+    def facets(self) -> Dict[str, List[str]]:
+        """Filter values for the search UI"""
+        return {
+            "concepts": sorted(self.by_concept),
+            "difficulties": [d for d in ("Easy", "Medium", "Hard") if d in self.by_difficulty],
+            "companies": list(self.by_company)
+        }
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "problems": len(self.problems),
+            "company_entries": sum(len(v) for v in self.by_company.values()),
+            "companies": len(self.by_company),
+            "concepts": len(self.by_concept),
+            "postings": len(self._postings)
+        }
+
+
+_catalog: Optional[ProblemCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_problem_catalog() -> ProblemCatalog:
+    """Process-wide catalog, built on first use"""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = ProblemCatalog()
+    return _catalog
@@ -0,0 +1,423 @@
+from collections import deque
+from typing import Dict, Iterable, List, Sequence, Set, Tuple, Union
+
+# Enhanced LeetCode problem mappings with more specific problems
+LEETCODE_PROBLEM_MAP = {
+    # Array and String Problems
+    "two sum": "two-sum",
+    "array sum": "two-sum",
+    "pair sum": "two-sum",
+    "add two numbers": "add-two-numbers",
+    "longest substring": "longest-substring-without-repeating-characters",
+    "substring": "longest-substring-without-repeating-characters",
+    "median two sorted arrays": "median-of-two-sorted-arrays",
+    "median": "median-of-two-sorted-arrays",
+    "reverse string": "reverse-string",
+    "string reverse": "reverse-string",
+    "palindrome": "valid-palindrome",
+    "palindromic": "valid-palindrome",
+    "anagram": "valid-anagram",
+    "anagrams": "group-anagrams",
+    "group anagrams": "group-anagrams",
+    "maximum subarray": "maximum-subarray",
+    "max subarray": "maximum-subarray",
+    "kadane": "maximum-subarray",
+    "product except self": "product-of-array-except-self",
+    "product array": "product-of-array-except-self",
+    "container water": "container-with-most-water",
+    "water container": "container-with-most-water",
+    "3sum": "3sum",
+    "three sum": "3sum",
+    "trapping rain water": "trapping-rain-water",
+    "rain water": "trapping-rain-water",
+    
+    # Linked List Problems
+    "reverse linked list": "reverse-linked-list",
+    "linked list reverse": "reverse-linked-list",
+    "merge two sorted lists": "merge-two-sorted-lists",
+    "merge sorted": "merge-two-sorted-lists",
+    "linked list cycle": "linked-list-cycle",
+    "cycle detection": "linked-list-cycle",
+    "remove nth node": "remove-nth-node-from-end-of-list",
+    "nth node": "remove-nth-node-from-end-of-list",
+    "intersection two linked lists": "intersection-of-two-linked-lists",
+    "linked list intersection": "intersection-of-two-linked-lists",
+    
+    # Tree Problems
+    "binary tree inorder": "binary-tree-inorder-traversal",
+    "inorder traversal": "binary-tree-inorder-traversal",
+    "binary tree preorder": "binary-tree-preorder-traversal",
+    "preorder traversal": "binary-tree-preorder-traversal",
+    "binary tree postorder": "binary-tree-postorder-traversal",
+    "postorder traversal": "binary-tree-postorder-traversal",
+    "maximum depth": "maximum-depth-of-binary-tree",
+    "tree depth": "maximum-depth-of-binary-tree",
+    "validate bst": "validate-binary-search-tree",
+    "binary search tree": "validate-binary-search-tree",
+    "symmetric tree": "symmetric-tree",
+    "tree symmetric": "symmetric-tree",
+    "binary tree level order": "binary-tree-level-order-traversal",
+    "level order": "binary-tree-level-order-traversal",
+    "path sum": "path-sum",
+    "tree path": "path-sum",
+    "lowest common ancestor": "lowest-common-ancestor-of-a-binary-tree",
+    "lca": "lowest-common-ancestor-of-a-binary-tree",
+    
+    # Dynamic Programming
+    "climbing stairs": "climbing-stairs",
+    "stairs": "climbing-stairs",
+    "fibonacci": "fibonacci-number",
+    "fib": "fibonacci-number",
+    "coin change": "coin-change",
+    "coins": "coin-change",
+    "longest increasing subsequence": "longest-increasing-subsequence",
+    "lis": "longest-increasing-subsequence",
+    "edit distance": "edit-distance",
+    "levenshtein": "edit-distance",
+    "house robber": "house-robber",
+    "robber": "house-robber",
+    "knapsack": "partition-equal-subset-sum",
+    "0/1 knapsack": "partition-equal-subset-sum",
+    "subset sum": "partition-equal-subset-sum",
+    
+    # Graph Problems
+    "number of islands": "number-of-islands",
+    "islands": "number-of-islands",
+    "course schedule": "course-schedule",
+    "topological sort": "course-schedule",
+    "clone graph": "clone-graph",
+    "graph clone": "clone-graph",
+    "word ladder": "word-ladder",
+    "ladder": "word-ladder",
+    "network delay time": "network-delay-time",
+    "shortest path": "network-delay-time",
+    
+    # Sorting and Searching
+    "merge sort": "sort-an-array",
+    "mergesort": "sort-an-array",
+    "quick sort": "sort-an-array",
+    "quicksort": "sort-an-array",
+    "heap sort": "sort-an-array",
+    "binary search": "binary-search",
+    "search": "binary-search",
+    "search rotated array": "search-in-rotated-sorted-array",
+    "rotated array": "search-in-rotated-sorted-array",
+    "find peak element": "find-peak-element",
+    "peak element": "find-peak-element",
+    "search 2d matrix": "search-a-2d-matrix",
+    "2d matrix": "search-a-2d-matrix",
+    
+    # Stack and Queue
+    "valid parentheses": "valid-parentheses",
+    "parentheses": "valid-parentheses",
+    "brackets": "valid-parentheses",
+    "implement queue using stacks": "implement-queue-using-stacks",
+    "queue using stacks": "implement-queue-using-stacks",
+    "implement stack using queues": "implement-stack-using-queues",
+    "stack using queues": "implement-stack-using-queues",
+    "min stack": "min-stack",
+    "minimum stack": "min-stack",
+    "evaluate reverse polish": "evaluate-reverse-polish-notation",
+    "reverse polish": "evaluate-reverse-polish-notation",
+    "rpn": "evaluate-reverse-polish-notation",
+    
+    # Hash Table
+    "group anagrams": "group-anagrams",
+    "top k frequent": "top-k-frequent-elements",
+    "k frequent": "top-k-frequent-elements",
+    "longest consecutive": "longest-consecutive-sequence",
+    "consecutive sequence": "longest-consecutive-sequence",
+    
+    # Math and Bit Manipulation
+    "reverse integer": "reverse-integer",
+    "integer reverse": "reverse-integer",
+    "palindrome number": "palindrome-number",
+    "number palindrome": "palindrome-number",
+    "power of two": "power-of-two",
+    "power 2": "power-of-two",
+    "single number": "single-number",
+    "missing number": "missing-number",
+    "counting bits": "counting-bits",
+    "bit counting": "counting-bits"
+}
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed keyword list.
+
+    Built once; find_all reports every keyword occurring anywhere in a text,
+    overlapping ones included, in a single pass over its characters. Matching
+    is plain substring matching, the same as `keyword in text`.
+    """
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = list(keywords)
+        # Trie of the keywords; state 0 is the root
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[int, ...]] = [()]
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = goto[state][ch] = len(goto)
+                    goto.append({})
+                    outputs.append(())
+                state = nxt
+            outputs[state] += (index,)
+
+        # Breadth-first, fold failure links into a full transition table so
+        # matching never follows a failure chain
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{}] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            link = fail[state]
+            outputs[state] += outputs[link]
+            delta[state] = {**delta[link], **goto[state]}
+            for ch, child in goto[state].items():
+                fail[child] = delta[link].get(ch, 0)
+                queue.append(child)
+
+        # Each transition holds (next state's transitions, keywords ending there),
+        # so a step is one dict lookup; absent characters go back to the root
+        tables: List[Dict[str, Tuple]] = [{} for _ in goto]
+        entries = list(zip(tables, outputs))
+        for table, transitions in zip(tables, delta):
+            table.update((ch, entries[target]) for ch, target in transitions.items())
+        self._root = entries[0]
+
+    def find_all(self, text: str) -> Set[int]:
+        """Indices of every keyword that occurs in text"""
+        root = self._root
+        table = root[0]
+        found: Set[int] = set()
+        for ch in text:
+            table, matched = table.get(ch, root)
+            if matched:
+                found.update(matched)
+        return found
+
+
+# Generic words tried in order when no specific keyword matches
+_FALLBACK_PROBLEMS = [
+    (["array", "sum", "two"], "two-sum"),
+    (["linked", "list", "node"], "reverse-linked-list"),
+    (["tree", "binary", "traversal"], "binary-tree-inorder-traversal"),
+    (["sort", "merge", "quick", "heap"], "sort-an-array"),
+    (["search", "binary", "find"], "binary-search"),
+    (["string", "substring", "character"], "longest-substring-without-repeating-characters"),
+    (["palindrome", "palindromic"], "valid-palindrome"),
+    (["parenthes", "bracket", "valid"], "valid-parentheses"),
+    (["graph", "island", "connected"], "number-of-islands"),
+    (["dynamic", "dp", "fibonacci", "stairs"], "climbing-stairs"),
+    (["stack", "queue", "push", "pop"], "min-stack"),
+    (["hash", "map", "frequency"], "two-sum")
+]
+
+_PROBLEM_KEYWORDS = list(LEETCODE_PROBLEM_MAP)
+_FALLBACK_WORDS = list(dict.fromkeys(word for words, _ in _FALLBACK_PROBLEMS for word in words))
+_FALLBACK_GROUPS = [
+    (frozenset(len(_PROBLEM_KEYWORDS) + _FALLBACK_WORDS.index(word) for word in words), slug)
+    for words, slug in _FALLBACK_PROBLEMS
+]
+_problem_automaton = KeywordAutomaton(_PROBLEM_KEYWORDS + _FALLBACK_WORDS)
+
+def find_leetcode_problem(problem_text):
+    """Find the most relevant LeetCode problem based on the problem text"""
+    problem_text_lower = problem_text.lower()
+    found = _problem_automaton.find_all(problem_text_lower)
+    
+    # Longest keyword wins, with a bonus for starting the text; ties go to the
+    # earlier LEETCODE_PROBLEM_MAP entry
+    best_match = None
+    best_score = 0
+    for index in sorted(i for i in found if i < len(_PROBLEM_KEYWORDS)):
+        keyword = _PROBLEM_KEYWORDS[index]
+        score = len(keyword)
+        if problem_text_lower.startswith(keyword):
+            score += 10  # Bonus for starting with keyword
+        if score > best_score:
+            best_score = score
+            best_match = LEETCODE_PROBLEM_MAP[keyword]
+    
+    if best_match:
+        return f"https://leetcode.com/problems/{best_match}/"
+    
+    # Enhanced fallback patterns for common problem types
+    for indices, slug in _FALLBACK_GROUPS:
+        if not indices.isdisjoint(found):
+            return f"https://leetcode.com/problems/{slug}/"
+    
+    # Default fallback
+    return "https://leetcode.com/problemset/algorithms/"
+
+def find_leetcode_problems(problem_texts: Iterable[str]) -> List[str]:
+    """
+    find_leetcode_problem over a whole problem list.
+
+    A convenience wrapper, not a faster batch path: each distinct text is
+    matched on its own, and repeated texts reuse the first result.
+    """
+    matched: Dict[str, str] = {}
+    urls = []
+    for text in problem_texts:
+        url = matched.get(text)
+        if url is None:
+            url = matched[text] = find_leetcode_problem(text)
+        urls.append(url)
+    return urls
+
+# Concept -> keywords; matched as whole words or phrases (plus common suffixes), so
+# e.g. "bit" no longer fires inside "orbit" nor "sum" inside "summary"
+CONCEPT_KEYWORDS = {
+    "Array": ["array", "list", "element", "index", "subarray", "sum", "product"],
+    "String": ["string", "character", "substring", "palindrome", "anagram", "text"],
+    "Linked List": ["linked list", "node", "pointer", "next", "cycle", "reverse"],
+    "Binary Tree": ["tree", "binary", "root", "leaf", "traversal", "inorder", "preorder", "postorder"],
+    "Graph": ["graph", "vertex", "edge", "connected", "path", "island", "bfs", "dfs"],
+    "Dynamic Programming": ["dynamic", "dp", "optimal", "subproblem", "fibonacci", "stairs", "coin"],
+    "Sorting": ["sort", "merge", "quick", "heap", "bubble", "selection", "insertion"],
+    "Binary Search": ["search", "binary search", "find", "locate", "target", "rotated"],
+    "Stack": ["stack", "push", "pop", "lifo", "parentheses", "bracket"],
+    "Queue": ["queue", "enqueue", "dequeue", "fifo", "level order"],
+    "Hash Table": ["hash", "map", "dictionary", "key-value", "frequency", "count"],
+    "Two Pointers": ["two pointer", "left", "right", "meet", "fast", "slow"],
+    "Sliding Window": ["window", "substring", "subarray", "sliding", "maximum", "minimum"],
+    "Recursion": ["recursive", "recursion", "base case", "divide", "conquer"],
+    "Backtracking": ["backtrack", "permutation", "combination", "generate", "all possible"],
+    "Greedy": ["greedy", "optimal", "local", "global", "activity", "interval"],
+    # "and"/"or" used to match nearly every sentence; only explicit bitwise wording counts now
+    "Bit Manipulation": ["bit", "xor", "bitwise", "bitmask", "mask", "shift", "binary", "power of 2",
+                         "power of two", "hamming", "parity", "lsb", "msb"]
+}
+
+HARD_INDICATORS = ["complex", "advanced", "optimize", "minimum time", "maximum efficiency",
+                   "hard", "challenging", "difficult", "expert", "o(log n)", "divide and conquer"]
+EASY_INDICATORS = ["simple", "basic", "easy", "straightforward", "beginner", "introduction",
+                   "find", "check", "validate", "single pass"]
+
+_TAG_SUFFIXES = ("", "s", "es", "d", "ed", "ing")
+# Lower-cases and turns ASCII punctuation into word breaks; the record separator splits a batch
+_BATCH_SEPARATOR = "\x1e"
+_NORMALIZE = str.maketrans({chr(c): " " for c in range(128)
+                            if not chr(c).isalnum() and chr(c) != _BATCH_SEPARATOR})
+
+class ProblemTagger:
+    """
+    Concept and difficulty tagger compiled once from keyword tables.
+
+    Every keyword (concept or difficulty indicator) owns a bit; a text is
+    normalised to words, its words are intersected with the keyword set in
+    one C-level operation, and multi-word phrases are only checked when
+    their first word is present. Results are memoised per bit pattern, so
+    tagging cost is dominated by splitting the text.
+    """
+
+    def __init__(self, concepts: Dict[str, List[str]], hard: List[str], easy: List[str]):
+        self._concept_bits: List[Tuple[int, str]] = []
+        self._hard_mask = 0
+        self._easy_mask = 0
+        self._words: Dict[str, int] = {}
+        # First word -> [(" phrase", (" phrase<suffix> ", ...), bit)]
+        self._phrases: Dict[str, List[Tuple[str, Tuple[str, ...], int]]] = {}
+        bit = 1
+        for concept, keywords in concepts.items():
+            for keyword in keywords:
+                self._add(keyword, bit)
+            self._concept_bits.append((bit, concept))
+            bit <<= 1
+        self._concept_mask = bit - 1
+        for indicators, is_hard in ((hard, True), (easy, False)):
+            for indicator in indicators:
+                # One bit per indicator: difficulty counts distinct indicators
+                self._add(indicator, bit)
+                if is_hard:
+                    self._hard_mask |= bit
+                else:
+                    self._easy_mask |= bit
+                bit <<= 1
+        self._keys = frozenset(self._words)
+        self._phrase_starts = frozenset(self._phrases)
+        self._results: Dict[int, Tuple[Tuple[str, ...], str]] = {}
+
+    def _add(self, keyword: str, bit: int):
+        words = keyword.lower().translate(_NORMALIZE).split()
+        if len(words) == 1:
+            for suffix in _TAG_SUFFIXES:
+                self._words[words[0] + suffix] = self._words.get(words[0] + suffix, 0) | bit
+            return
+        phrase = " ".join(words)
+        variants = tuple(f" {phrase}{suffix} " for suffix in _TAG_SUFFIXES)
+        self._phrases.setdefault(words[0], []).append((f" {phrase}", variants, bit))
+        # Phrase starters must survive the word intersection
+        self._words.setdefault(words[0], 0)
+
+    def _mask(self, normalized: str) -> int:
+        hits = self._keys.intersection(normalized.split())
+        mask = 0
+        for word in hits:
+            mask |= self._words[word]
+        starters = self._phrase_starts.intersection(hits)
+        if starters:
+            # Punctuation is already spaces, so "key-value" and "o(log n)" read as words
+            padded = f" {normalized} "
+            for word in starters:
+                for prefix, variants, bit in self._phrases[word]:
+                    if prefix in padded and any(variant in padded for variant in variants):
+                        mask |= bit
+        return mask
+
+    def _result(self, mask: int) -> Dict[str, Union[List[str], str]]:
+        cached = self._results.get(mask)
+        if cached is None:
+            concepts = tuple(name for bit, name in self._concept_bits if mask & bit) or ("General Algorithm",)
+            hard_score = bin(mask & self._hard_mask).count("1")
+            easy_score = bin(mask & self._easy_mask).count("1")
+            if hard_score > easy_score and hard_score > 0:
+                difficulty = "Hard"
+            elif easy_score > 0:
+                difficulty = "Easy"
+            else:
+                difficulty = "Medium"
+            cached = self._results[mask] = (concepts, difficulty)
+        return {"concepts": list(cached[0]), "difficulty": cached[1]}
+
+    def tag(self, text: str) -> Dict[str, Union[List[str], str]]:
+        """Concepts (or ["General Algorithm"]) and Easy/Medium/Hard difficulty of one problem"""
+        return self._result(self._mask(text.lower().translate(_NORMALIZE).replace(_BATCH_SEPARATOR, " ")))
+
+    def tag_many(self, texts: Sequence[str]) -> List[Dict[str, Union[List[str], str]]]:
+        """Tag a batch; the whole batch is lower-cased and normalised in one pass"""
+        lines = _BATCH_SEPARATOR.join(texts).lower().translate(_NORMALIZE).split(_BATCH_SEPARATOR)
+        if len(lines) != len(texts):
+            # A text contained the separator itself
+            return [self.tag(text) for text in texts]
+        masks: Dict[str, int] = {}
+        results = []
+        for line in lines:
+            # Repeated problems are only scanned once
+            mask = masks.get(line)
+            if mask is None:
+                mask = masks[line] = self._mask(line)
+            results.append(self._result(mask))
+        return results
+
+_problem_tagger = ProblemTagger(CONCEPT_KEYWORDS, HARD_INDICATORS, EASY_INDICATORS)
+
+def tag_problem(question_text: str) -> Dict[str, Union[List[str], str]]:
+    """Concepts and difficulty of a problem: {"concepts": [...], "difficulty": "Easy" | "Medium" | "Hard"}"""
+    return _problem_tagger.tag(question_text)
+
+def tag_problems(question_texts: Sequence[str]) -> List[Dict[str, Union[List[str], str]]]:
+    """tag_problem for a whole problem list in one pass"""
+    return _problem_tagger.tag_many(list(question_texts))
+
+def extract_problem_concepts(question_text):
+    """Extract key concepts from the problem text with enhanced detection"""
+    return tag_problem(question_text)["concepts"]
+
+def get_difficulty_from_text(question_text):
+    """Determine difficulty based on problem complexity indicators"""
+    return tag_problem(question_text)["difficulty"]
@@ -0,0 +1,72 @@
+import json
+import logging
+import re
+from typing import Any, Dict, List
+
+from utils.json_stream import parse_json_array
+
+logger = logging.getLogger(__name__)
+
+# Markers between problems in a plain-text coding response
+_PROBLEM_SEPARATOR = re.compile(r'\n---+\n|\n\*\*\*+\n')
+_NUMBERED_PROBLEM = re.compile(r'\n(?=Problem \d+|\d+\.)')
+_CODING_KEYWORDS = ("problem", "description", "input", "output")
+
+
+def parse_quiz_response(response: str) -> List[Any]:
+    """Questions from a model response; raises if it holds no JSON array"""
+    try:
+        # Try direct JSON parsing first
+        return json.loads(response)
+    except json.JSONDecodeError:
+        # Salvage every well-formed element instead of failing on the first bad one
+        errors = []
+        questions = parse_json_array(response, errors)
+        if errors:
+            logger.warning(f"Skipped {len(errors)} malformed quiz elements")
+            logger.debug(f"Malformed quiz elements: {errors}")
+        return questions
+
+
+def vqar_questions(result) -> List[Any]:
+    """Questions of a VQAR generation result, parsing the response text when needed"""
+    if isinstance(result, dict) and 'questions' in result:
+        return result['questions']
+    return parse_quiz_response(result)
+
+
+def valid_vqar_questions(questions: List[Any]) -> List[Dict]:
+    """Questions with a stem, four string options and an answer among them"""
+    return [q for q in questions
+            if (isinstance(q, dict) and
+                'question' in q and q['question'].strip() and
+                'options' in q and isinstance(q['options'], list) and
+                len(q['options']) == 4 and all(isinstance(o, str) for o in q['options']) and
+                'answer' in q and q['answer'] in q['options'])]
+
+
+def coding_problem_links(result) -> List[Dict]:
+    """Problem links (title/url) of a coding result, kept as they are rather than flattened to text"""
+    if isinstance(result, dict) and isinstance(result.get('questions'), list):
+        return [q for q in result['questions'] if isinstance(q, dict) and q.get('title') and q.get('url')]
+    return []
+
+
+def valid_coding_questions(result) -> List[str]:
+    """Problem statements split out of a plain-text coding result"""
+    if isinstance(result, dict):
+        result = result.get('questions', '')
+
+    # Handle different response formats
+    if isinstance(result, str):
+        # Split by problem markers
+        questions = [p.strip() for p in _PROBLEM_SEPARATOR.split(result) if p.strip()]
+
+        # Fallback splitting if no markers found
+        if len(questions) <= 1:
+            questions = [q.strip() for q in _NUMBERED_PROBLEM.split(result) if q.strip()]
+    else:
+        questions = [str(result)]
+
+    return [q for q in questions
+            if isinstance(q, str) and len(q) >= 100 and any(keyword in q.lower() for keyword in _CODING_KEYWORDS)]
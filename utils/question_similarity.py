@@ -0,0 +1,249 @@
+import functools
+import hashlib
+import os
+import re
+import threading
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from utils.metrics import REGISTRY, Counter
+
+DEFAULT_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", 0.6))
+DEFAULT_PERMUTATIONS = 120
+
+_WORD = re.compile(r"[a-z]+|\d+(?:\.\d+)?")
+# Lines with fewer words than this keep their numbers: in "What is 25% of 80?" or an
+# option list like "8 / 7 / 6 / 9" the numbers are what tells two questions apart
+MIN_WORDS_TO_MASK = int(os.getenv("NEAR_DUP_MIN_WORDS_TO_MASK", 6))
+
+NEAR_DUPLICATES = REGISTRY.register(Counter(
+    "quiz_near_duplicates_dropped_total", "Generated aptitude questions dropped as near-duplicates of another in the quiz"))
+
+
+def question_text(question: Union[Dict, str]) -> str:
+    """
+    Text a question is compared on: the stem plus its options, so template
+    items with different choices stay apart. Stem and each option are on
+    lines of their own, since normalize decides per line whether to mask numbers.
+    """
+    if isinstance(question, str):
+        return question
+    return "\n".join([str(question.get("question", ""))] + [str(o) for o in question.get("options") or []])
+
+
+def normalize(text: str) -> List[str]:
+    """
+    Lowercase words, with numbers replaced by '#' on lines that have at
+    least MIN_WORDS_TO_MASK words, so a long '240 m in 12 s' stem matches
+    '180 m in 9 s' while short numeric stems and options keep their numbers.
+    """
+    words = []
+    for line in text.lower().split("\n"):
+        tokens = _WORD.findall(line)
+        if sum(1 for t in tokens if not t[0].isdigit()) >= MIN_WORDS_TO_MASK:
+            tokens = ["#" if t[0].isdigit() else t for t in tokens]
+        words.extend(tokens)
+    return words
+
+
+@functools.lru_cache(maxsize=None)
+def _permutations(num_perm: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Fixed multiply-shift hash parameters, identical in every process"""
+    rng = np.random.default_rng(20240601)
+    a = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+    return a[:, None], b[:, None]
+
+
+@functools.lru_cache(maxsize=4096)
+def signature(text: str, num_perm: int = DEFAULT_PERMUTATIONS) -> Optional[np.ndarray]:
+    """
+    MinHash signature of the text's word bigrams, or None for text without words.
+
+    Each bigram is hashed once, then all `num_perm` hash functions are
+    applied in one vectorised step; the share of equal positions in two
+    signatures estimates the Jaccard similarity of their bigram sets.
+    """
+    words = normalize(text)
+    if not words:
+        return None
+    shingles = {" ".join(words[i:i + 2]) for i in range(max(1, len(words) - 1))}
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in shingles),
+        dtype=np.uint64, count=len(shingles))
+    a, b = _permutations(num_perm)
+    # uint64 arithmetic wraps, which is what multiply-shift hashing needs
+    sig = ((a * hashes + b) >> np.uint64(32)).min(axis=1).astype(np.uint32)
+    sig.flags.writeable = False
+    return sig
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return np.count_nonzero(a == b) / len(a)
+
+
+class MinHashIndex:
+    """
+    LSH index of MinHash signatures for near-duplicate lookup.
+
+    Signatures are split into `bands` bands; texts sharing any band are
+    candidates, and candidates at or above `threshold` estimated similarity
+    are matches. Lookups touch only the matching buckets, so their cost
+    follows the number of similar texts rather than the size of the index.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = DEFAULT_PERMUTATIONS, bands: int = 20):
+        if not 0 < bands <= num_perm:
+            raise ValueError("bands must be between 1 and num_perm")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        # 20 bands of 6 rows: texts at 0.6 similarity are candidates ~60% of the time, at 0.8 almost always
+        self.rows = num_perm // bands
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._signatures
+
+    def _band_keys(self, sig: np.ndarray) -> List[bytes]:
+        return [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, key: Hashable, text: str) -> bool:
+        """Index text under key (replacing any previous text); False for text without words"""
+        sig = signature(text, self.num_perm)
+        if sig is None:
+            return False
+        self.remove(key)
+        self._signatures[key] = sig
+        for buckets, band in zip(self._buckets, self._band_keys(sig)):
+            buckets.setdefault(band, []).append(key)
+        return True
+
+    def remove(self, key: Hashable):
+        sig = self._signatures.pop(key, None)
+        if sig is None:
+            return
+        for buckets, band in zip(self._buckets, self._band_keys(sig)):
+            keys = buckets.get(band)
+            if keys is not None:
+                keys.remove(key)
+                if not keys:
+                    del buckets[band]
+
+    def query(self, text: str, threshold: Optional[float] = None) -> List[Tuple[Hashable, float]]:
+        """Indexed keys similar to text, most similar first"""
+        sig = signature(text, self.num_perm)
+        if sig is None:
+            return []
+        threshold = self.threshold if threshold is None else threshold
+        candidates = set()
+        for buckets, band in zip(self._buckets, self._band_keys(sig)):
+            candidates.update(buckets.get(band, ()))
+        matches = [(key, similarity(sig, self._signatures[key])) for key in candidates]
+        return sorted((m for m in matches if m[1] >= threshold), key=lambda m: -m[1])
+
+    def find(self, text: str) -> Optional[Hashable]:
+        """Key of the most similar indexed text, or None"""
+        matches = self.query(text)
+        return matches[0][0] if matches else None
+
+
+def dedupe_questions(questions: List, threshold: float = DEFAULT_THRESHOLD) -> List:
+    """Drop questions that are near-duplicates of an earlier one in the same list"""
+    index = MinHashIndex(threshold)
+    kept = []
+    for question in questions:
+        text = question_text(question)
+        if index.find(text) is not None:
+            continue
+        index.add(len(kept), text)
+        kept.append(question)
+    if len(kept) < len(questions):
+        NEAR_DUPLICATES.inc(len(questions) - len(kept))
+    return kept
+
+
+class QuestionBank:
+    """
+    Process-wide record of served aptitude questions, grouped into
+    near-duplicate clusters with a count of how often each was served.
+
+    Used to prefer the least-seen questions when a quiz has more candidates
+    than the user asked for. Holds at most `max_entries` clusters, dropping
+    the oldest first.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._index = MinHashIndex(threshold)
+        self._seen: Dict[int, int] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _cluster(self, text: str) -> Optional[int]:
+        """Cluster id for text, creating one if no similar question is known"""
+        cluster = self._index.find(text)
+        if cluster is not None:
+            return cluster
+        cluster = self._next_id
+        if not self._index.add(cluster, text):
+            return None
+        self._next_id += 1
+        self._seen[cluster] = 0
+        while len(self._seen) > self.max_entries:
+            oldest = next(iter(self._seen))
+            del self._seen[oldest]
+            self._index.remove(oldest)
+        return cluster
+
+    def record(self, questions: List):
+        """Register questions without counting them as served"""
+        with self._lock:
+            for question in questions:
+                self._cluster(question_text(question))
+
+    def seen_count(self, question) -> int:
+        with self._lock:
+            cluster = self._index.find(question_text(question))
+            return self._seen.get(cluster, 0) if cluster is not None else 0
+
+    def pick_least_seen(self, questions: List, count: int) -> List:
+        """
+        Choose `count` questions, least served first (earlier ones on ties),
+        count them as served and return them in their original order.
+        """
+        with self._lock:
+            clusters = [self._cluster(question_text(q)) for q in questions]
+            ranked = sorted(range(len(questions)), key=lambda i: (self._seen.get(clusters[i], 0), i))
+            chosen = sorted(ranked[:count])
+            for i in chosen:
+                if clusters[i] in self._seen:
+                    self._seen[clusters[i]] += 1
+            return [questions[i] for i in chosen]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "clusters": len(self._seen),
+                "served": sum(self._seen.values()),
+                "repeated": sum(1 for count in self._seen.values() if count > 1)
+            }
+
+
+_question_bank: Optional[QuestionBank] = None
+_question_bank_lock = threading.Lock()
+
+
+def get_question_bank() -> QuestionBank:
+    """Return the process-wide question bank, configured from environment variables"""
+    global _question_bank
+    with _question_bank_lock:
+        if _question_bank is None:
+            _question_bank = QuestionBank(max_entries=int(os.getenv("QUESTION_BANK_MAX_ENTRIES", 50000)))
+        return _question_bank
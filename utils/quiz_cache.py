@@ -0,0 +1,226 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+DEFAULT_CACHE_PATH = os.path.join(CACHE_DIR, "quiz_cache.sqlite3")
+SEARCH_CACHE_PATH = os.path.join(CACHE_DIR, "search_cache.sqlite3")
+
+
+class QuizCache:
+    """
+    Disk-backed cache for generated question sets.
+
+    Entries live in a SQLite file so they survive Streamlit restarts and are
+    shared by every session (and every worker process) pointing at the same path.
+    """
+
+    def __init__(self,
+                 path: str = DEFAULT_CACHE_PATH,
+                 ttl_seconds: int = 6 * 60 * 60,
+                 max_entries: int = 500,
+                 max_bytes: int = 50 * 1024 * 1024,
+                 policy: str = "lru"):
+        if policy not in ("lru", "lfu"):
+            raise ValueError("Invalid eviction policy. Must be one of: ['lru', 'lfu']")
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self._lock = threading.Lock()
+        self._init_db()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection, committing on success"""
+        with self._lock:
+            conn = sqlite3.connect(self.path, timeout=10)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                yield conn
+                conn.commit()
+            finally:
+                conn.close()
+
+    def _init_db(self):
+        """Create the cache tables if they do not exist yet"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+
+    @staticmethod
+    def make_key(company: str, experience: str, category: str) -> str:
+        """Build the cache key for a generation request"""
+        return f"{category}:{company}:{experience}".lower()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on miss or expiry"""
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, age in seconds) for key, or None on miss or expiry"""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self._bump(conn, "expired")
+                self._bump(conn, "misses")
+                return None
+            conn.execute(
+                "UPDATE entries SET last_access = ?, hits = hits + 1 WHERE key = ?",
+                (now, key)
+            )
+            self._bump(conn, "hits")
+        try:
+            return json.loads(row[0]), now - row[1]
+        except json.JSONDecodeError:
+            logger.warning(f"Dropping unreadable cache entry: {key}")
+            self.delete(key)
+            return None
+
+    def set(self, key: str, value: Any):
+        """Store value under key and evict entries beyond the size limits"""
+        payload = json.dumps(value)
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            logger.warning(f"Not caching {key}: {size} bytes exceeds cache limit")
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, last_access, hits) "
+                "VALUES (?, ?, ?, ?, ?, 0)",
+                (key, payload, size, now, now)
+            )
+            self._evict(conn, now)
+
+    def delete(self, key: str):
+        """Remove a single entry"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        """Remove all entries and reset counters"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM counters")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry count, total size and hit/miss/eviction counters"""
+        with self._connect() as conn:
+            entries, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        lookups = hits + misses
+        return {
+            "entries": entries,
+            "bytes": total,
+            "hits": hits,
+            "misses": misses,
+            "expired": counters.get("expired", 0),
+            "evictions": counters.get("evictions", 0),
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "policy": self.policy
+        }
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Drop expired entries, then the least recently/frequently used ones over limits"""
+        expired = conn.execute(
+            "DELETE FROM entries WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        if expired:
+            self._bump(conn, "expired", expired)
+
+        order = "last_access ASC" if self.policy == "lru" else "hits ASC, last_access ASC"
+        entries, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        if entries <= self.max_entries and total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for key, size in conn.execute(f"SELECT key, size FROM entries ORDER BY {order}").fetchall():
+            if entries <= self.max_entries and total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            entries -= 1
+            total -= size
+            evicted += 1
+        if evicted:
+            self._bump(conn, "evictions", evicted)
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, name: str, amount: int = 1):
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount)
+        )
+
+
+_shared_cache: Optional[QuizCache] = None
+_search_cache: Optional[QuizCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_quiz_cache() -> QuizCache:
+    """Return the process-wide cache, configured from environment variables"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = QuizCache(
+                path=os.getenv("QUIZ_CACHE_PATH", DEFAULT_CACHE_PATH),
+                ttl_seconds=int(os.getenv("QUIZ_CACHE_TTL", 6 * 60 * 60)),
+                max_entries=int(os.getenv("QUIZ_CACHE_MAX_ENTRIES", 500)),
+                max_bytes=int(os.getenv("QUIZ_CACHE_MAX_BYTES", 50 * 1024 * 1024)),
+                policy=os.getenv("QUIZ_CACHE_POLICY", "lru")
+            )
+        return _shared_cache
+
+
+def get_search_cache() -> QuizCache:
+    """Return the process-wide cache of web search responses"""
+    global _search_cache
+    with _shared_lock:
+        if _search_cache is None:
+            _search_cache = QuizCache(
+                path=os.getenv("SEARCH_CACHE_PATH", SEARCH_CACHE_PATH),
+                ttl_seconds=int(os.getenv("SEARCH_CACHE_TTL", 7 * 24 * 60 * 60)),
+                max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", 200)),
+                max_bytes=int(os.getenv("SEARCH_CACHE_MAX_BYTES", 20 * 1024 * 1024)),
+                policy="lru"
+            )
+        return _search_cache
@@ -0,0 +1,63 @@
+import sys
+from typing import Dict, Iterable, Iterator, List
+
+
+class QuizQuestion:
+    """
+    One aptitude question held in session state.
+
+    Options are interned, so the many sessions showing "60 km/h" or
+    "None of these" share one string; the answer is the interned option itself.
+    """
+
+    __slots__ = ("question", "options", "answer")
+
+    def __init__(self, question: str, options: Iterable[str], answer: str):
+        self.question = question
+        self.options = tuple(sys.intern(option) for option in options)
+        self.answer = sys.intern(answer)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "QuizQuestion":
+        return cls(data["question"], data["options"], data["answer"])
+
+    def as_dict(self) -> Dict:
+        return {"question": self.question, "options": list(self.options), "answer": self.answer}
+
+    def __repr__(self) -> str:
+        return f"QuizQuestion({self.question[:40]!r})"
+
+
+class QuizAnswer:
+    """A submitted answer: the question's index in the quiz and the chosen option's index"""
+
+    __slots__ = ("index", "choice", "correct")
+
+    def __init__(self, index: int, choice: int, correct: bool):
+        self.index = index
+        self.choice = choice
+        self.correct = correct
+
+    @classmethod
+    def for_question(cls, index: int, question: QuizQuestion, selected: str) -> "QuizAnswer":
+        return cls(index, question.options.index(selected), selected == question.answer)
+
+    def __repr__(self) -> str:
+        return f"QuizAnswer({self.index}, {self.choice}, {self.correct})"
+
+
+def to_records(questions: Iterable[Dict]) -> List[QuizQuestion]:
+    return [QuizQuestion.from_dict(q) for q in questions]
+
+
+def iter_records(questions: Iterable[Dict]) -> Iterator[QuizQuestion]:
+    """Convert questions as they arrive, e.g. from a stream"""
+    for question in questions:
+        yield QuizQuestion.from_dict(question)
+
+
+def result_summary(result) -> Dict:
+    """A controller result without its questions, which the session already holds as records"""
+    if not isinstance(result, dict):
+        return result
+    return {key: value for key, value in result.items() if key != "questions"}
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import weakref
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from utils.metrics import REGISTRY, Gauge
+from utils.quiz_records import QuizQuestion
+
+
+class QuizRef:
+    """A session's handle on a stored quiz; the quiz stays referenced while the handle is alive"""
+
+    __slots__ = ("quiz_id", "__weakref__")
+
+    def __init__(self, quiz_id: str):
+        self.quiz_id = quiz_id
+
+    def __repr__(self) -> str:
+        return f"QuizRef({self.quiz_id!r})"
+
+
+class _Entry:
+    __slots__ = ("questions", "refs", "released_at")
+
+    def __init__(self, questions: Tuple[QuizQuestion, ...]):
+        self.questions = questions
+        self.refs = 0
+        self.released_at = 0.0
+
+
+class QuizStore:
+    """
+    Process-wide, content-addressed store of immutable quizzes.
+
+    Each quiz is kept once under the hash of its content, however many
+    sessions take it; sessions hold a QuizRef plus their own progress.
+    References are counted per QuizRef and released when the ref is
+    garbage collected with its session state. A quiz nobody references is
+    kept for `ttl` seconds, so a quiz served again soon is reused, then evicted.
+    """
+
+    def __init__(self, ttl: float = 15 * 60):
+        self.ttl = ttl
+        self._entries: Dict[str, _Entry] = {}
+        self._counters = {"stored": 0, "shared": 0, "evicted": 0}
+        # Reentrant: a ref can be collected, and released, while this thread holds the lock
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def quiz_id(questions: Sequence[Union[QuizQuestion, Dict]]) -> str:
+        """Content hash of a quiz: same questions, options and answers in the same order give the same id"""
+        canonical = [q.as_dict() if isinstance(q, QuizQuestion) else q for q in questions]
+        payload = json.dumps(canonical, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def put(self, questions: Sequence[Union[QuizQuestion, Dict]]) -> QuizRef:
+        """Store a quiz (or find the identical stored one) and return a new reference to it"""
+        quiz_id = self.quiz_id(questions)
+        with self._lock:
+            self._sweep(time.monotonic())
+            entry = self._entries.get(quiz_id)
+            if entry is None:
+                records = tuple(q if isinstance(q, QuizQuestion) else QuizQuestion.from_dict(q) for q in questions)
+                entry = self._entries[quiz_id] = _Entry(records)
+                self._counters["stored"] += 1
+            else:
+                self._counters["shared"] += 1
+            entry.refs += 1
+        ref = QuizRef(quiz_id)
+        weakref.finalize(ref, self._release, quiz_id)
+        return ref
+
+    def get(self, quiz_id: str) -> Optional[Tuple[QuizQuestion, ...]]:
+        with self._lock:
+            entry = self._entries.get(quiz_id)
+            return entry.questions if entry is not None else None
+
+    def _release(self, quiz_id: str):
+        with self._lock:
+            entry = self._entries.get(quiz_id)
+            if entry is not None:
+                entry.refs -= 1
+                if entry.refs <= 0:
+                    entry.released_at = time.monotonic()
+
+    def _sweep(self, now: float):
+        expired = [quiz_id for quiz_id, entry in self._entries.items()
+                   if entry.refs <= 0 and now - entry.released_at > self.ttl]
+        for quiz_id in expired:
+            del self._entries[quiz_id]
+        self._counters["evicted"] += len(expired)
+
+    def sweep(self):
+        """Evict unreferenced quizzes older than the TTL"""
+        with self._lock:
+            self._sweep(time.monotonic())
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            referenced = sum(1 for entry in self._entries.values() if entry.refs > 0)
+            return {"referenced": referenced, "idle": len(self._entries) - referenced}
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "quizzes": len(self._entries),
+                "references": sum(max(entry.refs, 0) for entry in self._entries.values()),
+                "questions": sum(len(entry.questions) for entry in self._entries.values()),
+                **self._counters
+            }
+
+
+_quiz_store: Optional[QuizStore] = None
+_quiz_store_lock = threading.Lock()
+
+
+def get_quiz_store() -> QuizStore:
+    """Return the process-wide quiz store (QUIZ_STORE_TTL seconds for unreferenced quizzes)"""
+    global _quiz_store
+    with _quiz_store_lock:
+        if _quiz_store is None:
+            _quiz_store = QuizStore(ttl=float(os.getenv("QUIZ_STORE_TTL", 15 * 60)))
+        return _quiz_store
+
+
+def _store_counts() -> Dict[Tuple, float]:
+    if _quiz_store is None:
+        return {}
+    return {(state,): count for state, count in _quiz_store.counts().items()}
+
+
+REGISTRY.register(Gauge(
+    "quiz_store_quizzes", "Quizzes held in the shared quiz store, by whether a session references them",
+    ("state",), _store_counts))
@@ -0,0 +1,83 @@
+import logging
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QuizStream:
+    """
+    Consume a question iterator on a background thread.
+
+    Questions become visible in `questions` as soon as they are produced, so a
+    quiz can start on the first one while the rest are still being generated.
+    The iterator is drained to the end even after `limit` questions so that the
+    producer can finish its own work (e.g. caching the full set).
+    """
+
+    def __init__(self, source: Iterator[Dict], limit: int):
+        self.source = source
+        self.limit = limit
+        self.questions: List[Dict] = []
+        self.complete = False  # All quiz questions are available (limit reached or source exhausted)
+        self.done = False      # Source exhausted
+        self.error: Optional[BaseException] = None
+        self.started_at: Optional[float] = None
+        self.time_to_first_question: Optional[float] = None
+        self.total_time: Optional[float] = None
+        self._condition = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name="quiz-stream", daemon=True)
+
+    def start(self) -> "QuizStream":
+        self.started_at = time.perf_counter()
+        self.thread.start()
+        return self
+
+    @property
+    def total(self) -> int:
+        """Number of questions the quiz will have, as far as is known now"""
+        return len(self.questions) if self.complete else self.limit
+
+    def wait_for(self, count: int, timeout: Optional[float] = None) -> bool:
+        """Block until at least `count` questions are available or the stream is complete"""
+        with self._condition:
+            self._condition.wait_for(
+                lambda: len(self.questions) >= count or self.complete, timeout=timeout
+            )
+            return len(self.questions) >= count
+
+    def metrics(self) -> Dict[str, Optional[float]]:
+        return {
+            "time_to_first_question": self.time_to_first_question,
+            "total_time": self.total_time,
+            "questions": len(self.questions)
+        }
+
+    def _run(self):
+        try:
+            for question in self.source:
+                if len(self.questions) >= self.limit:
+                    continue
+                with self._condition:
+                    self.questions.append(question)
+                    if self.time_to_first_question is None:
+                        self.time_to_first_question = round(time.perf_counter() - self.started_at, 3)
+                        logger.info(f"Quiz stream time_to_first_question={self.time_to_first_question}s")
+                    if len(self.questions) >= self.limit:
+                        self._mark_complete()
+                    self._condition.notify_all()
+        except Exception as e:
+            logger.error(f"Quiz stream failed: {str(e)}")
+            self.error = e
+        finally:
+            with self._condition:
+                self.done = True
+                if not self.complete:
+                    self._mark_complete()
+                self._condition.notify_all()
+
+    def _mark_complete(self):
+        self.complete = True
+        self.total_time = round(time.perf_counter() - self.started_at, 3)
+        logger.info(f"Quiz stream total_time={self.total_time}s questions={len(self.questions)}")
@@ -0,0 +1,248 @@
+import asyncio
+import hashlib
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Awaitable, Dict, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Lower runs first; FIFO within a priority
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+_priority: ContextVar[int] = ContextVar("rate_limit_priority", default=PRIORITY_INTERACTIVE)
+
+
+class RateLimitTimeout(Exception):
+    """A request could not be admitted within its wait budget"""
+
+
+class TokenBucket:
+    """Refills `rate` units per second up to `capacity`; a non-positive rate disables the bucket"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def refill(self, now: float):
+        if self.enabled:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until `amount` units are available (after refill)"""
+        if not self.enabled:
+            return 0.0
+        # A request larger than the bucket is admitted once the bucket is full
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.level) / self.rate)
+
+    def consume(self, amount: float):
+        if self.enabled:
+            self.level -= min(amount, self.capacity)
+
+
+class _Waiter:
+    """A queued request; wakes a blocked thread or a suspended task"""
+
+    def __init__(self, priority: int, seq: int, tokens: float):
+        self.key = (priority, seq)
+        self.tokens = tokens
+        self._event = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._future: Optional[asyncio.Future] = None
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return self.key < other.key
+
+    def wake(self):
+        self._event.set()
+        if self._future is not None:
+            future = self._future
+            self._loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+    def wait(self, timeout: Optional[float]):
+        self._event.wait(timeout)
+        self._event.clear()
+
+    async def async_wait(self, timeout: Optional[float]):
+        self._loop = asyncio.get_running_loop()
+        self._future = self._loop.create_future()
+        if self._event.is_set():
+            self._future.set_result(None)
+        try:
+            await asyncio.wait_for(self._future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._future = None
+            self._event.clear()
+
+
+class RateLimiter:
+    """
+    Client-side request and token budget for one provider API key.
+
+    Requests queue in priority order (FIFO within a priority) and only the
+    head of the queue may draw from the buckets, so a burst of background
+    work cannot starve interactive requests and large requests are not
+    overtaken forever by small ones. Sync and async callers share one queue.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float = 0, burst_seconds: float = 10):
+        self.requests = TokenBucket(requests_per_minute / 60.0, max(1.0, requests_per_minute / 60.0 * burst_seconds))
+        self.tokens = TokenBucket(tokens_per_minute / 60.0, max(1.0, tokens_per_minute / 60.0 * burst_seconds))
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._stats = {"admitted": 0, "queued": 0, "timeouts": 0, "wait_seconds": 0.0, "max_wait": 0.0}
+
+    def acquire(self, tokens: float = 0, priority: Optional[int] = None, timeout: Optional[float] = None) -> float:
+        """Block until the request is admitted; returns the seconds spent waiting"""
+        waiter, start = self._enqueue(tokens, priority)
+        try:
+            while True:
+                admitted, delay = self._try_admit(waiter, start, timeout)
+                if admitted:
+                    return time.monotonic() - start
+                waiter.wait(delay)
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+    async def aacquire(self, tokens: float = 0, priority: Optional[int] = None, timeout: Optional[float] = None) -> float:
+        """Async acquire; cancelling the awaiting task removes it from the queue"""
+        waiter, start = self._enqueue(tokens, priority)
+        try:
+            while True:
+                admitted, delay = self._try_admit(waiter, start, timeout)
+                if admitted:
+                    return time.monotonic() - start
+                await waiter.async_wait(delay)
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+    def expected_wait(self, tokens: float = 0, priority: Optional[int] = None) -> float:
+        """Estimate how long a request submitted now would wait, given the requests queued ahead of it"""
+        priority = _priority.get() if priority is None else priority
+        with self._lock:
+            now = time.monotonic()
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            ahead = [w for w in self._queue if w.key[0] <= priority]
+            needed_requests = len(ahead) + 1
+            needed_tokens = sum(w.tokens for w in ahead) + tokens
+            return round(max(self.requests.time_until(needed_requests), self.tokens.time_until(needed_tokens)), 2)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats, waiting=len(self._queue))
+        stats["wait_seconds"] = round(stats["wait_seconds"], 2)
+        stats["max_wait"] = round(stats["max_wait"], 2)
+        stats["expected_wait"] = self.expected_wait()
+        return stats
+
+    def _enqueue(self, tokens: float, priority: Optional[int]) -> Tuple[_Waiter, float]:
+        priority = _priority.get() if priority is None else priority
+        waiter = _Waiter(priority, next(self._seq), tokens)
+        with self._lock:
+            # A displaced head notices on its next timed re-check and then waits to be woken
+            heapq.heappush(self._queue, waiter)
+        return waiter, time.monotonic()
+
+    def _try_admit(self, waiter: _Waiter, start: float, timeout: Optional[float]) -> Tuple[bool, Optional[float]]:
+        """
+        Admit the waiter if it is at the head and the buckets allow.
+
+        Returns (admitted, delay) where delay is how long to sleep before
+        re-checking, or None to sleep until woken.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._queue[0] is waiter:
+                self.requests.refill(now)
+                self.tokens.refill(now)
+                delay = max(self.requests.time_until(1), self.tokens.time_until(waiter.tokens))
+                if delay <= 0:
+                    self.requests.consume(1)
+                    self.tokens.consume(waiter.tokens)
+                    heapq.heappop(self._queue)
+                    waited = now - start
+                    self._stats["admitted"] += 1
+                    self._stats["queued"] += waited > 0.001
+                    self._stats["wait_seconds"] += waited
+                    self._stats["max_wait"] = max(self._stats["max_wait"], waited)
+                    if self._queue:
+                        self._queue[0].wake()
+                    return True, None
+            else:
+                # Woken when the waiter ahead is admitted or leaves
+                delay = None
+        if timeout is not None:
+            remaining = start + timeout - now
+            if remaining <= 0 or (delay is not None and delay > remaining):
+                with self._lock:
+                    self._stats["timeouts"] += 1
+                raise RateLimitTimeout(f"Rate limit wait would exceed {timeout:.1f}s")
+            delay = remaining if delay is None else delay
+        return False, delay
+
+    def _abandon(self, waiter: _Waiter):
+        with self._lock:
+            if waiter in self._queue:
+                was_head = self._queue[0] is waiter
+                self._queue.remove(waiter)
+                heapq.heapify(self._queue)
+                if was_head and self._queue:
+                    self._queue[0].wake()
+
+
+async def with_priority(priority: int, awaitable: Awaitable[T]) -> T:
+    """Await `awaitable` with rate limiter requests queued at `priority`"""
+    token = _priority.set(priority)
+    try:
+        return await awaitable
+    finally:
+        _priority.reset(token)
+
+
+# provider -> (requests per minute, tokens per minute); 0 disables that budget
+_PROVIDER_LIMITS = {
+    "gemini": ("GEMINI_RPM", 60, "GEMINI_TPM", 250_000),
+    "tavily": ("TAVILY_RPM", 100, "TAVILY_CREDITS_PER_MINUTE", 0)
+}
+_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str, api_key: str) -> RateLimiter:
+    """Process-wide limiter for one provider API key, shared by every session using that key"""
+    key = (provider, hashlib.sha256(api_key.encode("utf-8")).hexdigest())
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            rpm_env, rpm_default, tpm_env, tpm_default = _PROVIDER_LIMITS[provider]
+            limiter = RateLimiter(
+                requests_per_minute=float(os.getenv(rpm_env, rpm_default)),
+                tokens_per_minute=float(os.getenv(tpm_env, tpm_default))
+            )
+            _limiters[key] = limiter
+        return limiter
+
+
+def get_rate_limit_stats() -> Dict[str, Dict]:
+    """Stats of every limiter, labelled by provider and a short key fingerprint"""
+    with _limiters_lock:
+        limiters = list(_limiters.items())
+    return {f"{provider}:{digest[:8]}": limiter.stats() for (provider, digest), limiter in limiters}
@@ -0,0 +1,256 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from utils.async_runtime import get_loop
+
+
+class FlightCancelled(Exception):
+    """The in-flight call was stopped before producing a result"""
+
+
+class Flight:
+    """One in-flight computation that any number of callers can wait on"""
+
+    def __init__(self, key: Hashable):
+        self.key = key
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.cancelled = False
+        # Callers currently waiting on (or, for join/finish users, leading) this flight
+        self.waiters = 0
+        # The shared work, when the flight runs it rather than a leading caller
+        self.future: Optional[concurrent.futures.Future] = None
+
+    def resolve(self, result: Any):
+        self.result = result
+        self._set_done()
+
+    def fail(self, error: BaseException):
+        if isinstance(error, Exception):
+            self.error = error
+        else:
+            # Work was stopped (rerun, generator closed, interrupt, cancelled); waiters should retry
+            self.cancelled = True
+        self._set_done()
+
+    def settle(self, future: concurrent.futures.Future):
+        """Publish the outcome of the flight's own work"""
+        if future.cancelled():
+            self.fail(asyncio.CancelledError())
+        elif future.exception() is not None:
+            self.fail(future.exception())
+        else:
+            self.resolve(future.result())
+
+    def wait(self, timeout: Optional[float] = None) -> Any:
+        """Wait for the outcome; a timeout only abandons this caller's wait"""
+        if not self._done.wait(timeout):
+            raise TimeoutError("Timed out waiting for in-flight request")
+        return self._outcome()
+
+    async def async_wait(self, timeout: Optional[float] = None) -> Any:
+        """Like wait, but suspends the calling task instead of blocking its thread"""
+        loop = asyncio.get_running_loop()
+        woken = loop.create_future()
+
+        def wake():
+            # May run on the leader's thread
+            loop.call_soon_threadsafe(lambda: woken.done() or woken.set_result(None))
+
+        with self._lock:
+            pending = not self._done.is_set()
+            if pending:
+                self._callbacks.append(wake)
+        if pending:
+            try:
+                await asyncio.wait_for(woken, timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError("Timed out waiting for in-flight request")
+            finally:
+                with self._lock:
+                    if wake in self._callbacks:
+                        self._callbacks.remove(wake)
+        return self._outcome()
+
+    def _set_done(self):
+        with self._lock:
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def _outcome(self) -> Any:
+        if self.cancelled:
+            raise FlightCancelled()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    """
+    Process-wide request coalescing.
+
+    Concurrent calls with the same key share one execution. The work belongs
+    to the flight, not to the caller that started it: every caller, the first
+    one included, only waits on it, so a caller's timeout or cancellation ends
+    its own wait. The work is cancelled once nobody is waiting for it.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, Flight] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "leaders": 0,
+            "coalesced": 0,
+            "wait_timeouts": 0,
+            "abandoned": 0,
+            "leader_cancellations": 0
+        }
+
+    def join(self, key: Hashable) -> Tuple[Flight, bool]:
+        """Return the flight for key and whether the caller is its leader"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                return flight, False
+            flight = self._flights[key] = Flight(key)
+            flight.waiters = 1
+            self._stats["leaders"] += 1
+            return flight, True
+
+    def finish(self, key: Hashable, flight: Flight, error: Optional[BaseException] = None):
+        """Leader-only, for flights run by their leader: publish the outcome (if not resolved yet) and retire the flight"""
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            if error is not None and not isinstance(error, Exception):
+                self._stats["leader_cancellations"] += 1
+        if error is not None:
+            flight.fail(error)
+
+    def wait(self, flight: Flight, timeout: Optional[float] = None) -> Any:
+        """Follower-only: wait for the flight's result, recording the outcome"""
+        return self._wait(flight, timeout, shared=True)
+
+    async def async_wait(self, flight: Flight, timeout: Optional[float] = None) -> Any:
+        """Follower-only: async wait for the flight's result, recording the outcome"""
+        return await self._async_wait(flight, timeout, shared=True)
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        Run fn once for all concurrent callers with this key.
+
+        fn runs on a thread of its own, in the first caller's context; every
+        caller waits up to `timeout` for it. A thread cannot be interrupted, so
+        work nobody waits for any more runs to completion and is discarded.
+
+        Returns (result, shared) where shared is True for callers that reused
+        another caller's execution. Followers retry if the work was cancelled.
+        """
+        while True:
+            flight, leader = self.join(key)
+            if leader:
+                self._start(flight, self._in_thread(fn))
+            try:
+                return self._wait(flight, timeout, shared=not leader), not leader
+            except FlightCancelled:
+                if leader:
+                    raise
+
+    async def async_do(self, key: Hashable, fn: Callable[[], Awaitable[Any]],
+                       timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        Async do: await fn() once for all concurrent callers with this key.
+
+        fn() runs as a task on the async runtime loop, in the first caller's
+        context. Sync and async callers share the same flights.
+        """
+        while True:
+            flight, leader = self.join(key)
+            if leader:
+                self._start(flight, asyncio.run_coroutine_threadsafe(fn(), get_loop()))
+            try:
+                return await self._async_wait(flight, timeout, shared=not leader), not leader
+            except FlightCancelled:
+                if leader:
+                    raise
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._flights))
+
+    @staticmethod
+    def _in_thread(fn: Callable[[], Any]) -> concurrent.futures.Future:
+        future = concurrent.futures.Future()
+        context = contextvars.copy_context()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(context.run(fn))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name="single-flight", daemon=True).start()
+        return future
+
+    def _start(self, flight: Flight, future: concurrent.futures.Future):
+        flight.future = future
+        future.add_done_callback(lambda f: self._settle(flight, f))
+
+    def _settle(self, flight: Flight, future: concurrent.futures.Future):
+        with self._lock:
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+        flight.settle(future)
+
+    def _leave(self, flight: Flight):
+        """A caller stopped waiting; cancel the flight's work once nobody is waiting for it"""
+        with self._lock:
+            flight.waiters -= 1
+            abandon = flight.waiters <= 0 and flight.future is not None and not flight.future.done()
+            if abandon:
+                # Retire it now so that new callers start fresh work instead of joining this one
+                if self._flights.get(flight.key) is flight:
+                    del self._flights[flight.key]
+                self._stats["abandoned"] += 1
+        if abandon:
+            flight.future.cancel()
+
+    def _record(self, shared: bool, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self._stats["wait_timeouts"] += 1
+            elif shared:
+                self._stats["coalesced"] += 1
+
+    def _wait(self, flight: Flight, timeout: Optional[float], shared: bool) -> Any:
+        try:
+            result = flight.wait(timeout)
+        except TimeoutError:
+            self._record(shared, timed_out=True)
+            raise
+        finally:
+            self._leave(flight)
+        self._record(shared)
+        return result
+
+    async def _async_wait(self, flight: Flight, timeout: Optional[float], shared: bool) -> Any:
+        try:
+            result = await flight.async_wait(timeout)
+        except TimeoutError:
+            self._record(shared, timed_out=True)
+            raise
+        finally:
+            self._leave(flight)
+        self._record(shared)
+        return result
@@ -0,0 +1,315 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Any, Awaitable, Dict, Iterator, List, Optional, Tuple, TypeVar
+from uuid import UUID
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from utils.metrics import REGISTRY, Counter, Histogram, current_span
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# USD per million (input, output) tokens; GEMINI_PRICE_INPUT / GEMINI_PRICE_OUTPUT override
+MODEL_PRICES = {
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-pro": (1.25, 10.00),
+    "gemini-2.0-flash": (0.10, 0.40)
+}
+
+LLM_TOKENS = REGISTRY.register(Counter(
+    "llm_tokens_total", "Model tokens by model, direction (input/output) and category", ("model", "direction", "category")))
+LLM_COST = REGISTRY.register(Counter(
+    "llm_cost_usd_total", "Estimated model spend in USD by model and category", ("model", "category")))
+LLM_CALL_SECONDS = REGISTRY.register(Histogram(
+    "llm_call_duration_seconds", "Latency of individual model calls", ("model",)))
+
+_session: ContextVar[Optional[str]] = ContextVar("usage_session", default=None)
+_request: ContextVar[Optional["RequestUsage"]] = ContextVar("request_usage", default=None)
+
+
+def _price(model: str) -> Tuple[float, float]:
+    default_in, default_out = MODEL_PRICES.get(model, MODEL_PRICES["gemini-2.5-flash"])
+    return (float(os.getenv("GEMINI_PRICE_INPUT", default_in)),
+            float(os.getenv("GEMINI_PRICE_OUTPUT", default_out)))
+
+
+def call_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """Estimated USD cost of one call at the configured per-million-token prices"""
+    price_in, price_out = _price(model)
+    return (input_tokens * price_in + output_tokens * price_out) / 1_000_000
+
+
+def current_session_id() -> Optional[str]:
+    """Session bound to this context, else the Streamlit session of the calling script thread"""
+    session = _session.get()
+    if session is not None:
+        return session
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+
+async def with_session(session_id: Optional[str], awaitable: Awaitable[T]) -> T:
+    """Await `awaitable` with model calls attributed to `session_id`"""
+    token = _session.set(session_id)
+    try:
+        return await awaitable
+    finally:
+        _session.reset(token)
+
+
+class _Totals:
+    """Running call/token/cost sums"""
+
+    def __init__(self):
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cost_usd = 0.0
+        self.model_seconds = 0.0
+        self.estimated = 0
+
+    def add(self, call: Dict):
+        self.calls += 1
+        self.input_tokens += call["input_tokens"]
+        self.output_tokens += call["output_tokens"]
+        self.cost_usd += call["cost_usd"]
+        self.model_seconds += call["seconds"]
+        self.estimated += call["estimated"]
+
+    def merge(self, other: "_Totals"):
+        self.calls += other.calls
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cost_usd += other.cost_usd
+        self.model_seconds += other.model_seconds
+        self.estimated += other.estimated
+
+    def as_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "model_seconds": round(self.model_seconds, 3),
+            "estimated_calls": self.estimated
+        }
+
+
+class RequestUsage:
+    """
+    Model usage of one question request.
+
+    Calls made while the request is bound (with_request_usage or
+    iter_with_usage), including calls in tasks it spawns, are added here.
+    A request served from the cache or by joining another request's
+    generation finishes with no calls of its own.
+    """
+
+    def __init__(self, company: str, category: str, session: Optional[str] = None):
+        self.company = company
+        self.category = category
+        self.session = session or current_session_id() or "-"
+        self.source: Optional[str] = None
+        self._totals = _Totals()
+        self._lock = threading.Lock()
+
+    def add(self, call: Dict):
+        with self._lock:
+            self._totals.add(call)
+
+    def summary(self) -> Dict:
+        with self._lock:
+            summary = self._totals.as_dict()
+        summary.update(session=self.session, company=self.company, category=self.category)
+        if self.source is not None:
+            summary["source"] = self.source
+        return summary
+
+    def finish(self, source: str) -> Dict:
+        """Record the finished request under the source that served it"""
+        self.source = source
+        summary = self.summary()
+        with self._lock:
+            _tracker.add_request(self.category, source, self._totals, summary)
+        logger.info(f"Usage category={self.category} company={self.company} source={source} "
+                    f"calls={summary['calls']} input_tokens={summary['input_tokens']} "
+                    f"output_tokens={summary['output_tokens']} cost_usd={summary['cost_usd']}")
+        return summary
+
+
+async def with_request_usage(usage: RequestUsage, awaitable: Awaitable[T]) -> T:
+    """Await `awaitable` with its model calls added to `usage`"""
+    token = _request.set(usage)
+    try:
+        return await awaitable
+    finally:
+        _request.reset(token)
+
+
+def iter_with_usage(usage: RequestUsage, iterator: Iterator[T]) -> Iterator[T]:
+    """Drive `iterator` with its model calls added to `usage`"""
+    iterator = iter(iterator)
+    while True:
+        # Bind only around each step; a generator must not leave a context variable set across yields
+        token = _request.set(usage)
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _request.reset(token)
+        yield item
+
+
+class UsageTracker:
+    """
+    Records tokens, model and latency of every model call.
+
+    Fed by the LangChain callback in utils.usage_callback, which is only
+    imported with the model clients. Provider token counts are used when the
+    client reports them; otherwise tokens are estimated at about 4 characters
+    each and the call is counted as estimated. Calls are attributed to the
+    request, stage (innermost metrics span), company, category and session
+    active when they started.
+    """
+
+    def __init__(self, recent: int = 200, max_sessions: int = 500):
+        self._runs: Dict[UUID, Dict] = {}
+        self._lock = threading.Lock()
+        self._overall = _Totals()
+        self._by_key: Dict[Tuple[str, str, str, str], _Totals] = {}
+        self._by_session: "OrderedDict[str, _Totals]" = OrderedDict()
+        self._by_source: Dict[Tuple[str, str], _Totals] = {}
+        self._requests_by_source: Dict[Tuple[str, str], int] = {}
+        self._max_sessions = max_sessions
+        self._recent_calls = deque(maxlen=recent)
+        self._recent_requests = deque(maxlen=recent)
+
+    def start_call(self, run_id: UUID, serialized: Dict[str, Any], kwargs: Dict[str, Any], prompt_chars: int):
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or (serialized or {}).get("kwargs", {}).get("model") or "unknown"
+        request = _request.get()
+        run = {
+            "model": str(model).split("/")[-1],
+            "stage": (current_span() or "-").rsplit("/", 1)[-1],
+            "request": request,
+            "session": request.session if request is not None else (current_session_id() or "-"),
+            "company": request.company if request is not None else "-",
+            "category": request.category if request is not None else "-",
+            "prompt_chars": prompt_chars,
+            "estimated": 0,
+            "start": time.perf_counter()
+        }
+        with self._lock:
+            self._runs[run_id] = run
+
+    def end_call(self, run_id: UUID, reported: Optional[Tuple[int, int]], output_chars: int):
+        """Record a finished call; without provider token counts both sides are estimated from characters"""
+        run = self._pop(run_id)
+        if run is None:
+            return
+        if reported is None:
+            reported = (run["prompt_chars"] // 4, output_chars // 4)
+            run["estimated"] = 1
+        self._record(run, *reported, status="ok")
+
+    def fail_call(self, run_id: UUID, error: BaseException):
+        run = self._pop(run_id)
+        if run is None:
+            return
+        # The prompt was sent (and may be billed) even though no completion came back
+        run["estimated"] = 1
+        self._record(run, run["prompt_chars"] // 4, 0, status="cancelled" if "Cancelled" in type(error).__name__ else "error")
+
+    def _pop(self, run_id: UUID) -> Optional[Dict]:
+        with self._lock:
+            return self._runs.pop(run_id, None)
+
+    def _record(self, run: Dict, input_tokens: int, output_tokens: int, status: str):
+        seconds = time.perf_counter() - run["start"]
+        call = {
+            "model": run["model"],
+            "stage": run["stage"],
+            "session": run["session"],
+            "company": run["company"],
+            "category": run["category"],
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cost_usd": call_cost(run["model"], input_tokens, output_tokens),
+            "seconds": seconds,
+            "estimated": run["estimated"],
+            "status": status
+        }
+        if run["request"] is not None:
+            run["request"].add(call)
+        LLM_TOKENS.inc(input_tokens, model=call["model"], direction="input", category=call["category"])
+        LLM_TOKENS.inc(output_tokens, model=call["model"], direction="output", category=call["category"])
+        LLM_COST.inc(call["cost_usd"], model=call["model"], category=call["category"])
+        LLM_CALL_SECONDS.observe(seconds, model=call["model"])
+        with self._lock:
+            self._overall.add(call)
+            key = (call["model"], call["stage"], call["category"], call["company"])
+            self._by_key.setdefault(key, _Totals()).add(call)
+            session = self._by_session.pop(call["session"], None) or _Totals()
+            session.add(call)
+            self._by_session[call["session"]] = session
+            if len(self._by_session) > self._max_sessions:
+                self._by_session.popitem(last=False)
+            self._recent_calls.append(dict(call, cost_usd=round(call["cost_usd"], 6), seconds=round(seconds, 3)))
+
+    def add_request(self, category: str, source: str, totals: _Totals, summary: Dict):
+        with self._lock:
+            key = (category, source)
+            self._requests_by_source[key] = self._requests_by_source.get(key, 0) + 1
+            self._by_source.setdefault(key, _Totals()).merge(totals)
+            self._recent_requests.append(summary)
+
+    def summary(self) -> Dict:
+        """Aggregate usage overall and broken down by stage, category, company, session and request source"""
+        with self._lock:
+            by_stage: Dict[str, _Totals] = {}
+            by_category: Dict[str, _Totals] = {}
+            by_company: Dict[str, _Totals] = {}
+            for (model, stage, category, company), totals in self._by_key.items():
+                for group, name in ((by_stage, f"{model}:{stage}"), (by_category, category), (by_company, company)):
+                    group.setdefault(name, _Totals()).merge(totals)
+            by_source = {}
+            for (category, source), totals in sorted(self._by_source.items()):
+                requests = self._requests_by_source[(category, source)]
+                entry = dict(totals.as_dict(), requests=requests)
+                entry["cost_per_request_usd"] = round(totals.cost_usd / requests, 6)
+                by_source[f"{category}:{source}"] = entry
+            return {
+                "overall": self._overall.as_dict(),
+                "by_stage": {k: v.as_dict() for k, v in sorted(by_stage.items())},
+                "by_category": {k: v.as_dict() for k, v in sorted(by_category.items())},
+                "by_company": {k: v.as_dict() for k, v in sorted(by_company.items())},
+                "by_session": {k: v.as_dict() for k, v in self._by_session.items()},
+                "by_request_source": by_source
+            }
+
+    def recent_calls(self, limit: int = 50) -> List[Dict]:
+        with self._lock:
+            return list(self._recent_calls)[-limit:][::-1]
+
+    def recent_requests(self, limit: int = 50) -> List[Dict]:
+        with self._lock:
+            return list(self._recent_requests)[-limit:][::-1]
+
+
+_tracker = UsageTracker(recent=int(os.getenv("USAGE_RECENT_CALLS", 200)))
+
+
+def get_usage_tracker() -> UsageTracker:
+    """Process-wide usage tracker fed by every pooled model client"""
+    return _tracker
+
+
+def usage_summary() -> Dict:
+    return _tracker.summary()
@@ -0,0 +1,60 @@
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from utils.usage import UsageTracker
+
+
+def _message_chars(messages: List[List[Any]]) -> int:
+    return sum(len(m.content) if isinstance(m.content, str) else len(str(m.content))
+               for batch in messages for m in batch)
+
+
+def _reported_tokens(response: LLMResult) -> Optional[Tuple[int, int]]:
+    """Token counts reported by the provider, when the client surfaces them"""
+    usage = (response.llm_output or {}).get("usage_metadata") or (response.llm_output or {}).get("token_usage")
+    for generations in response.generations:
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            usage = usage or getattr(message, "usage_metadata", None) or (generation.generation_info or {}).get("usage_metadata")
+    if not usage:
+        return None
+    if not isinstance(usage, dict):
+        usage = {k: getattr(usage, k, 0) for k in ("prompt_token_count", "candidates_token_count")}
+    input_tokens = usage.get("input_tokens", usage.get("prompt_token_count", usage.get("prompt_tokens")))
+    output_tokens = usage.get("output_tokens", usage.get("candidates_token_count", usage.get("completion_tokens")))
+    if input_tokens is None or output_tokens is None:
+        return None
+    return int(input_tokens), int(output_tokens)
+
+
+class UsageCallback(BaseCallbackHandler):
+    """
+    LangChain callback that feeds every model call into a UsageTracker.
+
+    Kept apart from utils.usage so that LangChain is only imported together
+    with the model clients, not by everything that reports usage.
+    """
+
+    # Run in the caller's context so the request and span context variables are visible
+    run_inline = True
+
+    def __init__(self, tracker: UsageTracker):
+        self.tracker = tracker
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *,
+                            run_id: UUID, **kwargs: Any) -> None:
+        self.tracker.start_call(run_id, serialized, kwargs, _message_chars(messages))
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *,
+                     run_id: UUID, **kwargs: Any) -> None:
+        self.tracker.start_call(run_id, serialized, kwargs, sum(len(p) for p in prompts))
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        output_chars = sum(len(g.text) for generations in response.generations for g in generations)
+        self.tracker.end_call(run_id, _reported_tokens(response), output_chars)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self.tracker.fail_call(run_id, error)
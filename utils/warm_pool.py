@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Hashable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class QuizWarmPool:
+    """
+    Background pool of ready-to-serve quizzes per configuration key.
+
+    A worker thread keeps up to `target_depth` quizzes per key, refilling a key
+    once it falls below `low_water`. Refills are spaced to at most
+    `rate_per_minute` generations so the pool cannot exhaust API quota, and
+    quizzes older than `max_age` seconds are discarded instead of served.
+    """
+
+    def __init__(self,
+                 generate: Callable[..., Optional[List]],
+                 keys: Sequence[Hashable],
+                 target_depth: int = 2,
+                 low_water: int = 1,
+                 max_age: float = 6 * 60 * 60,
+                 rate_per_minute: float = 6):
+        self.generate = generate
+        self.keys = list(keys)
+        self.target_depth = target_depth
+        self.low_water = max(1, min(low_water, target_depth))
+        self.max_age = max_age
+        self.min_interval = 60.0 / rate_per_minute if rate_per_minute > 0 else 0.0
+        self._queues: Dict[Hashable, deque] = {key: deque() for key in self.keys}
+        self._refilling = set(self.keys)
+        self._counters = {key: {"served": 0, "misses": 0, "generated": 0, "failures": 0, "stale": 0}
+                          for key in self.keys}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._next_allowed = 0.0
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "QuizWarmPool":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="quiz-warm-pool", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def pop(self, key: Hashable) -> Optional[List]:
+        """Take a ready quiz for key, or None if none is available"""
+        now = time.time()
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue is None:
+                return None
+            quiz = None
+            while queue:
+                created_at, candidate = queue.popleft()
+                if now - created_at <= self.max_age:
+                    quiz = candidate
+                    break
+                self._counters[key]["stale"] += 1
+            self._counters[key]["served" if quiz is not None else "misses"] += 1
+            if len(queue) < self.low_water:
+                self._refilling.add(key)
+                self._wake.set()
+        return quiz
+
+    def drain(self, max_age: Optional[float] = None) -> int:
+        """Drop quizzes older than max_age (default: the pool's max_age); returns how many"""
+        cutoff = time.time() - (self.max_age if max_age is None else max_age)
+        dropped = 0
+        with self._lock:
+            for key, queue in self._queues.items():
+                fresh = deque(item for item in queue if item[0] >= cutoff)
+                stale = len(queue) - len(fresh)
+                if stale:
+                    self._queues[key] = fresh
+                    self._counters[key]["stale"] += stale
+                    dropped += stale
+                if len(fresh) < self.low_water:
+                    self._refilling.add(key)
+        if dropped:
+            self._wake.set()
+        return dropped
+
+    def metrics(self) -> Dict:
+        """Per-key depth and counters plus totals"""
+        with self._lock:
+            per_key = {
+                str(key): dict(self._counters[key], depth=len(self._queues[key]))
+                for key in self.keys
+            }
+            refilling = len(self._refilling)
+        totals = {name: sum(m[name] for m in per_key.values())
+                  for name in ("depth", "served", "misses", "generated", "failures", "stale")}
+        return dict(totals, refilling=refilling, target_depth=self.target_depth,
+                    low_water=self.low_water, keys=per_key)
+
+    def _next_key(self) -> Optional[Hashable]:
+        with self._lock:
+            for key in list(self._refilling):
+                if len(self._queues[key]) >= self.target_depth:
+                    self._refilling.discard(key)
+            if not self._refilling:
+                return None
+            return min(self._refilling, key=lambda k: len(self._queues[k]))
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.drain()
+            key = self._next_key()
+            if key is None:
+                self._wake.wait(timeout=60)
+                self._wake.clear()
+                continue
+
+            # Respect the refill rate budget
+            delay = self._next_allowed - time.monotonic()
+            if delay > 0 and self._stop.wait(delay):
+                break
+            self._next_allowed = time.monotonic() + self.min_interval
+
+            try:
+                quiz = self.generate(*key) if isinstance(key, tuple) else self.generate(key)
+            except Exception as e:
+                logger.warning(f"Warm pool generation failed for {key}: {str(e)}")
+                quiz = None
+            with self._lock:
+                if quiz:
+                    self._queues[key].append((time.time(), quiz))
+                    self._counters[key]["generated"] += 1
+                else:
+                    self._counters[key]["failures"] += 1